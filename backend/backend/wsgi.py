@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 application = get_wsgi_application()
+
+# replay check-in journals left by crashed workers before serving (CHECKIN_BUFFER)
+from core import checkin_buffer  # noqa: E402
+
+checkin_buffer.start()
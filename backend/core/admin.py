@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Church, Membership, Announcement, Event, Attendance
+from .models import User, Church, Membership, Announcement, Event, Attendance, EventAttendanceCounter, ChatMessage
+from .models import ChurchWeeklyAttendance, MemberMonthlyAttendance, CheckInLog
 
 class UserAdmin(BaseUserAdmin):
     model = User
@@ -31,3 +32,8 @@ admin.site.register(Membership)
 admin.site.register(Announcement)
 admin.site.register(Event)
 admin.site.register(Attendance)
+admin.site.register(EventAttendanceCounter)
+admin.site.register(ChurchWeeklyAttendance)
+admin.site.register(MemberMonthlyAttendance)
+admin.site.register(CheckInLog)
+admin.site.register(ChatMessage)
@@ -0,0 +1,292 @@
+from collections import Counter
+from datetime import timedelta
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DateField, F, Min
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import Attendance, Church, ChurchWeeklyAttendance, MemberMonthlyAttendance
+
+# Check-in time decides the buckets (for recurring events it is the only
+# per-occurrence date we have). Weeks start on Monday, like TruncWeek.
+
+
+def week_of(day):
+    return day - timedelta(days=day.weekday())
+
+
+def month_of(day):
+    return day.replace(day=1)
+
+
+def _buckets(timestamp):
+    day = timezone.localdate(timestamp)
+    return week_of(day), month_of(day)
+
+
+def _increment(model, key, **deltas):
+    """UPDATE ... SET f = f + delta on the rollup row, creating it the first time."""
+    changes = {field: F(field) + delta for field, delta in deltas.items()}
+    if model.objects.filter(**key).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**key, **deltas)
+    except IntegrityError:
+        # created by a concurrent check-in since the UPDATE
+        model.objects.filter(**key).update(**changes)
+
+
+# ======================================================
+# INCREMENTAL UPDATES (signals + bulk check-in)
+# ======================================================
+
+def record_check_ins(church_id, visits):
+    """
+    Add new Attendance rows, given as (user_id, timestamp), to the rollups.
+    One member-month UPDATE per distinct (month, count) and one church-week
+    UPDATE per week, whatever the number of visits.
+    """
+    if not visits:
+        return
+    if len(visits) == 1:
+        return _record_check_in(church_id, *visits[0])
+
+    user_ids = {user_id for user_id, _ in visits}
+    seen = set(
+        MemberMonthlyAttendance.objects.filter(church_id=church_id, user_id__in=user_ids)
+        .values_list("user_id", flat=True).distinct()
+    )
+
+    weeks = Counter()
+    first_timers = Counter()
+    months = Counter()
+    for user_id, timestamp in sorted(visits, key=lambda visit: visit[1]):
+        week, month = _buckets(timestamp)
+        weeks[week] += 1
+        months[user_id, month] += 1
+        if user_id not in seen:
+            first_timers[week] += 1
+            seen.add(user_id)
+
+    for week, check_ins in weeks.items():
+        _increment(
+            ChurchWeeklyAttendance, {"church_id": church_id, "week": week},
+            check_ins=check_ins, first_timers=first_timers[week],
+        )
+
+    groups = {}
+    for (user_id, month), check_ins in months.items():
+        groups.setdefault((month, check_ins), []).append(user_id)
+    for (month, check_ins), ids in groups.items():
+        _add_member_months(church_id, month, ids, check_ins)
+
+
+def _record_check_in(church_id, user_id, timestamp):
+    """
+    One visit (post_save): a member already seen this month costs two
+    UPDATEs; only a first visit in the month looks further back.
+    """
+    week, month = _buckets(timestamp)
+    member = MemberMonthlyAttendance.objects.filter(church_id=church_id, user_id=user_id)
+    first_timers = 0
+    if not member.filter(month=month).update(check_ins=F("check_ins") + 1):
+        first_timers = int(not member.exists())
+        try:
+            with transaction.atomic():
+                MemberMonthlyAttendance.objects.create(church_id=church_id, user_id=user_id, month=month, check_ins=1)
+        except IntegrityError:
+            # created by a concurrent check-in since the UPDATE
+            member.filter(month=month).update(check_ins=F("check_ins") + 1)
+
+    _increment(
+        ChurchWeeklyAttendance, {"church_id": church_id, "week": week},
+        check_ins=1, first_timers=first_timers,
+    )
+
+
+def _add_member_months(church_id, month, user_ids, check_ins):
+    rows = MemberMonthlyAttendance.objects.filter(church_id=church_id, month=month)
+    existing = set(rows.filter(user_id__in=user_ids).values_list("user_id", flat=True))
+    if existing:
+        rows.filter(user_id__in=existing).update(check_ins=F("check_ins") + check_ins)
+
+    missing = [user_id for user_id in user_ids if user_id not in existing]
+    try:
+        with transaction.atomic():
+            MemberMonthlyAttendance.objects.bulk_create([
+                MemberMonthlyAttendance(church_id=church_id, user_id=user_id, month=month, check_ins=check_ins)
+                for user_id in missing
+            ])
+    except IntegrityError:
+        for user_id in missing:
+            _increment(MemberMonthlyAttendance, {"church_id": church_id, "user_id": user_id, "month": month},
+                       check_ins=check_ins)
+
+
+def remove_check_in(church_id, user_id, timestamp):
+    """
+    Take a deleted Attendance row out of the rollups. Only UPDATEs/DELETEs:
+    during a cascading Church delete the rollup rows may already be gone.
+    """
+    week, month = _buckets(timestamp)
+    church_week = ChurchWeeklyAttendance.objects.filter(church_id=church_id, week=week)
+    church_week.update(check_ins=F("check_ins") - 1)
+
+    member_month = MemberMonthlyAttendance.objects.filter(church_id=church_id, user_id=user_id, month=month)
+    member_month.update(check_ins=F("check_ins") - 1)
+    member_month.filter(check_ins__lte=0).delete()
+
+    first = Attendance.objects.filter(user_id=user_id, event__church_id=church_id).aggregate(
+        first=Min("timestamp")
+    )["first"]
+    if first is None or first > timestamp:
+        # this was their first check-in here; the next one (if any) takes over
+        church_week.update(first_timers=F("first_timers") - 1)
+        if first is not None:
+            ChurchWeeklyAttendance.objects.filter(church_id=church_id, week=_buckets(first)[0]).update(
+                first_timers=F("first_timers") + 1
+            )
+
+    # like member months, weeks without check-ins have no row
+    church_week.filter(check_ins__lte=0).delete()
+
+
+# ======================================================
+# BACKFILL (backfill_analytics)
+# ======================================================
+
+def backfill_rollups(church_ids=None, batch_size=100):
+    """
+    Recompute both rollups from Attendance, `batch_size` churches at a
+    time. Aggregation runs in the database (GROUP BY over truncated
+    timestamps); Python only buckets one first-check-in per member.
+    Returns the number of churches processed.
+    """
+    if church_ids is None:
+        church_ids = Church.objects.order_by("pk").values_list("pk", flat=True).iterator()
+
+    church_ids = iter(church_ids)
+    done = 0
+    while batch := list(islice(church_ids, batch_size)):
+        _backfill(batch, batch_size=1000)
+        done += len(batch)
+    return done
+
+
+def _backfill(church_ids, batch_size):
+    attendance = Attendance.objects.filter(event__church_id__in=church_ids).order_by()
+    church = F("event__church_id")
+
+    # inside one transaction: SQLite's BEGIN IMMEDIATE holds off concurrent
+    # check-ins, so none is counted twice or lost between read and write
+    with transaction.atomic():
+        ChurchWeeklyAttendance.objects.filter(church_id__in=church_ids).delete()
+        MemberMonthlyAttendance.objects.filter(church_id__in=church_ids).delete()
+
+        first_timers = Counter()
+        for row in attendance.values("user_id", church=church).annotate(first=Min("timestamp")).iterator():
+            first_timers[row["church"], _buckets(row["first"])[0]] += 1
+
+        weekly = attendance.values(church=church, week=TruncWeek("timestamp", output_field=DateField()))
+        _insert(ChurchWeeklyAttendance, (
+            ChurchWeeklyAttendance(
+                church_id=row["church"], week=row["week"], check_ins=row["check_ins"],
+                first_timers=first_timers[row["church"], row["week"]],
+            )
+            for row in weekly.annotate(check_ins=Count("id")).iterator()
+        ), batch_size)
+
+        monthly = attendance.values("user_id", church=church, month=TruncMonth("timestamp", output_field=DateField()))
+        _insert(MemberMonthlyAttendance, (
+            MemberMonthlyAttendance(
+                church_id=row["church"], user_id=row["user_id"], month=row["month"], check_ins=row["check_ins"],
+            )
+            for row in monthly.annotate(check_ins=Count("id")).iterator()
+        ), batch_size)
+
+
+def _insert(model, rows, batch_size):
+    # bulk_create() lists its input; feed it slices so memory stays flat
+    while batch := list(islice(rows, batch_size)):
+        model.objects.bulk_create(batch)
+
+
+# ======================================================
+# READS (analytics API) — bounded by weeks / months asked for
+# ======================================================
+
+def weekly_trend(church_id, weeks):
+    """The last `weeks` weeks, oldest first, weeks without a row as zeros."""
+    current = week_of(timezone.localdate())
+    start = current - timedelta(weeks=weeks - 1)
+    rows = {
+        row.week: row
+        for row in ChurchWeeklyAttendance.objects.filter(church_id=church_id, week__gte=start, week__lte=current)
+    }
+
+    trend = []
+    for n in range(weeks):
+        week = start + timedelta(weeks=n)
+        row = rows.get(week)
+        trend.append({
+            "week": week,
+            "check_ins": row.check_ins if row else 0,
+            "first_timers": row.first_timers if row else 0,
+        })
+    return trend
+
+
+def _shift_month(month, n):
+    index = month.year * 12 + month.month - 1 + n
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def streak(counts):
+    """
+    Consecutive months with check-ins, ending with the newest. The current
+    month only breaks a streak once it is over.
+    """
+    counts = list(counts)
+    if counts and not counts[-1]:
+        counts.pop()
+
+    length = 0
+    for count in reversed(counts):
+        if not count:
+            break
+        length += 1
+    return length
+
+
+def member_activity(church_id, members, months):
+    """
+    Per member: check-ins in each of the last `months` months (oldest
+    first), total and streak. `members` is (user_id, email, full_name).
+    """
+    current = month_of(timezone.localdate())
+    window = [_shift_month(current, n - months + 1) for n in range(months)]
+
+    counts = {}
+    for user_id, month, check_ins in MemberMonthlyAttendance.objects.filter(
+        church_id=church_id, month__gte=window[0], month__lte=current
+    ).values_list("user_id", "month", "check_ins"):
+        counts.setdefault(user_id, {})[month] = check_ins
+
+    activity = []
+    for user_id, email, full_name in members:
+        by_month = counts.get(user_id, {})
+        series = [by_month.get(month, 0) for month in window]
+        activity.append({
+            "user_id": user_id,
+            "email": email,
+            "full_name": full_name,
+            "check_ins": series,
+            "total": sum(series),
+            "streak": streak(series),
+        })
+
+    activity.sort(key=lambda member: (-member["streak"], -member["total"], member["user_id"]))
+    return window, activity
@@ -0,0 +1,151 @@
+from functools import cached_property
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .membership import MembershipInfo, resolve_memberships
+from .models import ClaimsRevocation
+
+
+# ======================================================
+# MEMBERSHIP CLAIMS
+# ======================================================
+
+def set_membership_claims(token, user_id):
+    """
+    Stamp the user's primary church and role into the token (null if none).
+    Read from the database: a stale process cache would put an old role
+    into a token that passes the revocation check.
+    """
+    # before the read: a revocation committed after it is newer than the claims
+    token["claims_epoch"] = claims_epoch(user_id, cached=False)
+    memberships = resolve_memberships(user_id, cached=False)
+    primary = memberships[0] if memberships else None
+
+    token["membership_id"] = primary.id if primary else None
+    token["church_id"] = primary.church_id if primary else None
+    token["role"] = primary.role if primary else None
+    return token
+
+
+class ChurchRefreshToken(RefreshToken):
+    """
+    Every access token minted from this refresh token (login and /token/refresh/)
+    gets freshly resolved membership claims.
+    """
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        return set_membership_claims(access, self[api_settings.USER_ID_CLAIM])
+
+
+class ChurchTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = ChurchRefreshToken
+
+
+# ======================================================
+# REVOCATION — role changes invalidate outstanding access tokens
+# ======================================================
+
+def claims_epoch_key(user_id):
+    return f"claims-epoch:{user_id}"
+
+
+def claims_epoch(user_id, cached=True):
+    """
+    The user's revocation epoch: 0 until their claims are first revoked,
+    then one more per revocation. Served from the cache (shared with
+    REDIS_URL); a miss reads its row and keeps it CLAIMS_EPOCH_CACHE_TTL
+    seconds, so without a shared cache other workers notice a revocation
+    within that time.
+    """
+    key = claims_epoch_key(user_id)
+    epoch = cache.get(key) if cached else None
+    if epoch is None:
+        epoch = ClaimsRevocation.objects.filter(user_id=user_id).values_list("epoch", flat=True).first() or 0
+        cache.set(key, epoch, getattr(settings, "CLAIMS_EPOCH_CACHE_TTL", 60))
+    return epoch
+
+
+def revoke_claims(user_id):
+    """
+    Access tokens for `user_id` minted before now are rejected (401),
+    which makes the client refresh and pick up the new claims. The epoch
+    is bumped in the database, so every worker sees it, once the caller's
+    transaction commits: a refresh reading memberships before then still
+    sees the old role.
+    """
+    def revoke():
+        now = timezone.now()
+        revocations = ClaimsRevocation.objects.filter(user_id=user_id)
+        if not revocations.update(epoch=F("epoch") + 1, revoked_at=now):
+            try:
+                with transaction.atomic():
+                    ClaimsRevocation.objects.create(user_id=user_id, epoch=1, revoked_at=now)
+            except IntegrityError:
+                # another revocation created it first
+                revocations.update(epoch=F("epoch") + 1, revoked_at=now)
+        cache.delete(claims_epoch_key(user_id))
+
+    transaction.on_commit(revoke)
+
+
+def claims_revoked(token):
+    """A cache read; tokens minted before epochs existed count as epoch 0."""
+    return token.get("claims_epoch", 0) < claims_epoch(token[api_settings.USER_ID_CLAIM])
+
+
+# ======================================================
+# STATELESS AUTHENTICATION
+# ======================================================
+
+class ChurchTokenUser(TokenUser):
+    """
+    Token-backed user: no core_user query. Carries the membership claims
+    that core.membership.get_membership() serves from.
+    """
+
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def pk(self):
+        return self.id
+
+    @cached_property
+    def has_membership_claims(self):
+        return "church_id" in self.token
+
+    @cached_property
+    def membership_claim(self):
+        if not self.token.get("church_id"):
+            return None
+        return MembershipInfo(self.token["membership_id"], self.token["church_id"], self.token["role"])
+
+
+class ClaimsJWTAuthentication(JWTStatelessUserAuthentication):
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM in validated_token and claims_revoked(validated_token):
+            raise InvalidToken("Token claims are out of date, refresh the token")
+
+        return ChurchTokenUser(validated_token)
+
+
+def authenticate_raw_token(raw_token):
+    """
+    For plain (non-DRF) views such as SSE streams, where EventSource cannot
+    send headers and the token arrives as ?token=. Raises InvalidToken.
+    """
+    auth = ClaimsJWTAuthentication()
+    return auth.get_user(auth.get_validated_token(raw_token))
@@ -0,0 +1,20 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite with write transactions that take the write lock up front.
+
+    Django 4.2 opens transactions with a deferred BEGIN. A transaction that
+    reads and then writes (update_or_create, counter updates) must upgrade
+    its lock at the first write. If another connection committed in the
+    meantime, SQLite fails at once with "database is locked" and
+    busy_timeout does not help.
+
+    BEGIN IMMEDIATE waits for the lock at the start of the transaction, so
+    concurrent writers queue instead of failing. Django 5.1 offers this as
+    OPTIONS["transaction_mode"] = "IMMEDIATE".
+    """
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute("BEGIN IMMEDIATE")
@@ -0,0 +1,456 @@
+import asyncio
+import json
+import platform
+import statistics
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, NamedTuple, Optional
+
+import django
+from django.db import connection
+from django.test import Client
+from django.urls import URLPattern, URLResolver, resolve
+
+from .authentication import ChurchRefreshToken
+from .models import Announcement, Attendance, Church, Event, Membership, User
+
+API_PREFIX = "/api/"
+
+# rows created by write endpoints during a run (removed by cleanup())
+BENCH_DOMAIN = "bench.test"
+BENCH_CHURCH_PREFIX = "Bench Church "
+
+
+# ======================================================
+# ENDPOINTS
+# ======================================================
+
+class Endpoint(NamedTuple):
+    label: str
+    method: str
+    path: str
+    # called with the iteration number, so writes can use unique values
+    body: Optional[Callable[[int], dict]] = None
+    auth: Optional[str] = None  # "leader" | "member" | None
+    stream: bool = False  # SSE: time to first byte only
+
+
+class Fixture(NamedTuple):
+    church_id: int
+    event_id: int
+    announcement_id: Optional[int]
+    leader: User
+    member: User
+    member_emails: list
+
+
+def pick_fixture():
+    """
+    The largest church (by declared size) that has a pastor and a plain
+    member, and its most attended event: the worst case for list endpoints.
+    """
+    leader_membership = (
+        Membership.objects.filter(role="pastor", church__memberships__role="member")
+        .select_related("user")
+        .order_by("-church__size", "church_id")
+        .first()
+    )
+    if leader_membership is None:
+        return None
+
+    church_id = leader_membership.church_id
+    member_ids = list(
+        Membership.objects.filter(church_id=church_id, role="member")
+        .order_by("pk")
+        .values_list("user_id", flat=True)[:50]
+    )
+    event = (
+        Event.objects.filter(church_id=church_id)
+        .order_by("-attendance_counter__total", "pk")
+        .only("id")
+        .first()
+    )
+
+    return Fixture(
+        church_id=church_id,
+        event_id=event.id if event else 0,
+        announcement_id=Announcement.objects.filter(church_id=church_id).values_list("id", flat=True).first(),
+        leader=leader_membership.user,
+        member=User.objects.get(id=member_ids[0]),
+        member_emails=list(User.objects.filter(id__in=member_ids).values_list("email", flat=True)),
+    )
+
+
+def build_endpoints(fx, password):
+    e = fx.event_id
+    c = fx.church_id
+    a = fx.announcement_id or 0
+    emails = fx.member_emails
+
+    return [
+        Endpoint("api root", "GET", "", auth="member"),
+
+        # auth
+        Endpoint("login", "POST", "token/", body=lambda n: {"email": fx.member.email, "password": password}),
+        Endpoint("register church", "POST", "auth/register_church/", body=lambda n: {
+            "church_name": f"{BENCH_CHURCH_PREFIX}{n}", "full_name": "Bench Pastor",
+            "email": f"pastor{time.time_ns()}@{BENCH_DOMAIN}", "password": password,
+        }),
+        Endpoint("register member", "POST", "auth/register_member/", body=lambda n: {
+            "full_name": "Bench Member", "email": f"member{time.time_ns()}@{BENCH_DOMAIN}",
+            "password": password, "church_id": c,
+        }),
+        Endpoint("import members", "POST", "members/import/", auth="leader", body=lambda n: {
+            "members": [{"email": f"import{time.time_ns()}-{i}@{BENCH_DOMAIN}", "full_name": "Imported"}
+                        for i in range(10)],
+        }),
+
+        # directory
+        Endpoint("churches (anonymous)", "GET", "churches/"),
+        Endpoint("churches ?q=", "GET", "churches/?q=chu"),
+        Endpoint("churches (member)", "GET", "churches/", auth="member"),
+        Endpoint("church detail", "GET", f"churches/{c}/"),
+        Endpoint("church my_role", "GET", f"churches/{c}/my_role/", auth="member"),
+
+        # church content
+        Endpoint("dashboard", "GET", "dashboard/", auth="member"),
+        Endpoint("announcements", "GET", "announcements/", auth="member"),
+        Endpoint("announcements ?cursor=", "GET", "announcements/?cursor=", auth="member"),
+        Endpoint("announcement detail", "GET", f"announcements/{a}/", auth="member"),
+        Endpoint("announcement create", "POST", "announcements/", auth="leader",
+                 body=lambda n: {"title": f"Bench {n}", "body": "Benchmark announcement"}),
+        Endpoint("events", "GET", "events/", auth="member"),
+        Endpoint("events ?cursor=", "GET", "events/?cursor=", auth="member"),
+        Endpoint("events ?mine=1", "GET", "events/?mine=1", auth="leader"),
+        Endpoint("event detail", "GET", f"events/{e}/", auth="member"),
+        Endpoint("search", "GET", "search/?q=bible stud", auth="member"),
+
+        # attendance
+        Endpoint("attendance (leader)", "GET", f"events/{e}/attendance/", auth="leader"),
+        Endpoint("attendance (member)", "GET", f"events/{e}/attendance/", auth="member"),
+        Endpoint("check in", "POST", f"events/{e}/attendance/", auth="member",
+                 body=lambda n: {"event": e, "status": "in" if n % 2 else "out"}),
+        Endpoint("bulk check in", "POST", f"events/{e}/attendance/bulk/", auth="leader",
+                 body=lambda n: {"users": emails, "status": "in" if n % 2 else "out"}),
+        Endpoint("attendance export csv", "GET", f"events/{e}/attendance/export/?type=csv", auth="leader"),
+        Endpoint("church export ndjson", "GET", "attendance/export/?type=ndjson", auth="leader"),
+        Endpoint("analytics weekly", "GET", "analytics/attendance/?weeks=52", auth="leader"),
+        Endpoint("analytics members", "GET", "analytics/members/", auth="leader"),
+        Endpoint("attendance stream", "GET", f"events/{e}/attendance/stream/", auth="leader", stream=True),
+
+        # chat
+        Endpoint("chat history", "GET", "chat/messages/", auth="member"),
+        Endpoint("chat post", "POST", "chat/messages/", auth="member", body=lambda n: {"body": f"bench {n}"}),
+        Endpoint("chat stream", "GET", "chat/stream/", auth="member", stream=True),
+    ]
+
+
+def url_routes(patterns, prefix=""):
+    """Every concrete route under `patterns`, as ResolverMatch.route strings."""
+    for p in patterns:
+        route = prefix + str(p.pattern)
+        if isinstance(p, URLResolver):
+            yield from url_routes(p.url_patterns, route)
+        elif isinstance(p, URLPattern) and "format" not in route:
+            yield route
+
+
+def uncovered_routes(endpoints):
+    from . import urls
+
+    covered = {resolve("/" + ep.path.split("?")[0], urlconf=urls).route for ep in endpoints}
+    return sorted(set(url_routes(urls.urlpatterns)) - covered)
+
+
+# ======================================================
+# MEASUREMENT
+# ======================================================
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def percentile(sorted_values, p):
+    """Linear interpolation between closest ranks (numpy's default)."""
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * p / 100
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(endpoint, durations, statuses, elapsed, queries):
+    ms = sorted(d * 1000 for d in durations)
+    return {
+        "method": endpoint.method,
+        "path": endpoint.path,
+        "requests": len(ms),
+        "errors": sum(not 200 <= s < 400 for s in statuses),
+        "status": statistics.mode(statuses) if statuses else None,
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "rps": round(len(ms) / elapsed, 1) if elapsed else None,
+        "queries": queries,
+    }
+
+
+class ClientRunner:
+    """
+    In-process: Django test client against the configured database. Counts
+    SQL per request. Streaming (SSE) endpoints need a server — skipped.
+    """
+
+    mode = "client"
+
+    def __init__(self, tokens):
+        self.client = Client()
+        self.tokens = tokens
+
+    def request(self, endpoint, n):
+        headers = {}
+        if endpoint.auth:
+            headers["Authorization"] = f"Bearer {self.tokens[endpoint.auth]}"
+
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            if endpoint.method == "GET":
+                response = self.client.get(API_PREFIX + endpoint.path, headers=headers)
+            else:
+                response = self.client.generic(
+                    endpoint.method, API_PREFIX + endpoint.path,
+                    json.dumps(endpoint.body(n)), "application/json", headers=headers,
+                )
+            if response.streaming:
+                for _ in response.streaming_content:
+                    pass
+        return time.perf_counter() - start, response.status_code, counter.count
+
+    def run(self, endpoint, requests, warmup):
+        if endpoint.stream:
+            return {"method": endpoint.method, "path": endpoint.path, "skipped": "streaming; use --url"}
+
+        for n in range(warmup):
+            self.request(endpoint, n)
+
+        durations, statuses, queries = [], [], []
+        started = time.perf_counter()
+        for n in range(requests):
+            duration, status, count = self.request(endpoint, warmup + n)
+            durations.append(duration)
+            statuses.append(status)
+            queries.append(count)
+        elapsed = time.perf_counter() - started
+
+        return summarize(endpoint, durations, statuses, elapsed, max(queries))
+
+
+class HTTPRunner:
+    """
+    Against a running server (e.g. local gunicorn/uvicorn). Query counts are
+    not visible from here; streams report time to the first frame.
+    """
+
+    mode = "http"
+
+    def __init__(self, tokens, base_url, concurrency=1, timeout=30):
+        self.tokens = tokens
+        self.base_url = base_url.rstrip("/") + API_PREFIX
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    def request(self, endpoint, n):
+        data = json.dumps(endpoint.body(n)).encode() if endpoint.body else None
+        req = urllib.request.Request(self.base_url + endpoint.path, data=data, method=endpoint.method)
+        if data is not None:
+            req.add_header("Content-Type", "application/json")
+        if endpoint.auth:
+            req.add_header("Authorization", f"Bearer {self.tokens[endpoint.auth]}")
+
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                if endpoint.stream:
+                    response.readline()
+                else:
+                    response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        return time.perf_counter() - start, status
+
+    def run(self, endpoint, requests, warmup):
+        for n in range(warmup):
+            self.request(endpoint, n)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            results = list(pool.map(lambda n: self.request(endpoint, n), range(warmup, warmup + requests)))
+        elapsed = time.perf_counter() - started
+
+        return summarize(endpoint, [d for d, _ in results], [s for _, s in results], elapsed, None)
+
+
+class AsyncHTTPRunner:
+    """
+    Many concurrent keep-alive connections from one asyncio loop (stdlib
+    only), for load far past what a thread per client allows. A token
+    entry may be a list: request n then authenticates as entry n % len.
+    """
+
+    mode = "http-async"
+
+    def __init__(self, tokens, base_url, concurrency=500, timeout=60):
+        url = urllib.parse.urlsplit(base_url)
+        self.host, self.port = url.hostname, url.port or 80
+        self.prefix = url.path.rstrip("/") + API_PREFIX
+        self.tokens = tokens
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    def encode(self, endpoint, n):
+        headers = [f"{endpoint.method} {self.prefix}{endpoint.path} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        if endpoint.auth:
+            token = self.tokens[endpoint.auth]
+            if isinstance(token, list):
+                token = token[n % len(token)]
+            headers.append(f"Authorization: Bearer {token}")
+
+        body = json.dumps(endpoint.body(n)).encode() if endpoint.body else b""
+        if endpoint.body:
+            headers.append("Content-Type: application/json")
+        headers.append(f"Content-Length: {len(body)}")
+        return ("\r\n".join(headers) + "\r\n\r\n").encode() + body
+
+    async def read_response(self, reader):
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split()[1])
+        headers = {k.strip().lower(): v.strip() for k, _, v in (line.partition(":") for line in lines[1:] if line)}
+
+        if headers.get("transfer-encoding") == "chunked":
+            while size := int((await reader.readuntil(b"\r\n")).strip(), 16):
+                await reader.readexactly(size + 2)
+            await reader.readuntil(b"\r\n")
+        else:
+            await reader.readexactly(int(headers.get("content-length", 0)))
+        return status, headers.get("connection") == "close"
+
+    async def client(self, endpoint, jobs, results):
+        reader = writer = None
+        for n in jobs:
+            start = time.perf_counter()
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection(self.host, self.port)
+                writer.write(self.encode(endpoint, n))
+                status, close = await asyncio.wait_for(self.read_response(reader), self.timeout)
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError):
+                status, close = None, True
+            results.append((time.perf_counter() - start, status))
+            if close and writer is not None:
+                writer.close()
+                reader = writer = None
+        if writer is not None:
+            writer.close()
+
+    async def load(self, endpoint, first, requests):
+        jobs = iter(range(first, first + requests))
+        results = []
+        await asyncio.gather(*(self.client(endpoint, jobs, results) for _ in range(self.concurrency)))
+        return results
+
+    def run(self, endpoint, requests, warmup):
+        if endpoint.stream:
+            return {"method": endpoint.method, "path": endpoint.path, "skipped": "streaming"}
+
+        if warmup:
+            asyncio.run(self.load(endpoint, 0, warmup))
+
+        started = time.perf_counter()
+        results = asyncio.run(self.load(endpoint, warmup, requests))
+        elapsed = time.perf_counter() - started
+
+        statuses = [status or 0 for _, status in results]
+        return summarize(endpoint, [d for d, _ in results], statuses, elapsed, None)
+
+
+def run_benchmark(runner, endpoints, requests=50, warmup=3, log=None):
+    report = {}
+    for endpoint in endpoints:
+        report[endpoint.label] = runner.run(endpoint, requests, warmup)
+        if log:
+            log(endpoint.label, report[endpoint.label])
+    return report
+
+
+def dataset_size():
+    return {
+        "churches": Church.objects.count(),
+        "members": Membership.objects.count(),
+        "events": Event.objects.count(),
+        "announcements": Announcement.objects.count(),
+        "attendance": Attendance.objects.count(),
+    }
+
+
+def environment(runner, requests, warmup):
+    return {
+        "mode": runner.mode,
+        "requests": requests,
+        "warmup": warmup,
+        "concurrency": getattr(runner, "concurrency", 1),
+        "database": connection.vendor,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "dataset": dataset_size(),
+    }
+
+
+def tokens_for(fx):
+    return {
+        "leader": str(ChurchRefreshToken.for_user(fx.leader).access_token),
+        "member": str(ChurchRefreshToken.for_user(fx.member).access_token),
+    }
+
+
+def cleanup():
+    """Remove accounts and churches created by the write endpoints."""
+    Church.objects.filter(name__startswith=BENCH_CHURCH_PREFIX).delete()
+    User.objects.filter(email__endswith="@" + BENCH_DOMAIN).delete()
+
+
+# ======================================================
+# BASELINE COMPARISON
+# ======================================================
+
+def compare(report, baseline, tolerance=0.2, min_delta_ms=1.0):
+    """
+    Regressions vs. a saved report: p95 more than `tolerance` (and at least
+    `min_delta_ms`) slower, or more SQL queries per request.
+    """
+    regressions = []
+    for label, current in report["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(label)
+        if not before or "p95_ms" not in before or "p95_ms" not in current:
+            continue
+
+        slower = current["p95_ms"] - before["p95_ms"]
+        if slower > min_delta_ms and current["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{label}: p95 {before['p95_ms']}ms → {current['p95_ms']}ms")
+
+        if current.get("queries") is not None and before.get("queries") is not None:
+            if current["queries"] > before["queries"]:
+                regressions.append(f"{label}: queries {before['queries']} → {current['queries']}")
+
+    return regressions
@@ -0,0 +1,285 @@
+import atexit
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+from rest_framework import serializers
+
+from .live import get_fanout
+from .models import ChatMessage
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY = 2000
+
+# same representation as every DateTimeField in the API (local time zone)
+_datetime = serializers.DateTimeField()
+
+
+class MessageNotSaved(Exception):
+    """The message's row could not be written; it was never broadcast."""
+
+
+def chat_channel(church_id):
+    return f"chat:{church_id}"
+
+
+def message_dict(message_id, church_id, user_id, full_name, body, created_at):
+    return {
+        "id": message_id,
+        "church": church_id,
+        "user": {"id": user_id, "full_name": full_name},
+        "body": body,
+        "created_at": _datetime.to_representation(created_at),
+    }
+
+
+# ======================================================
+# BROADCASTER
+# ======================================================
+
+class Room:
+    def __init__(self, size):
+        self.recent = deque(maxlen=size)
+        self.warm = False
+
+    def add(self, message):
+        if not self.recent or message["id"] > self.recent[-1]["id"]:
+            self.recent.append(message)
+        elif all(m["id"] != message["id"] for m in self.recent):
+            # committed after a higher id (another worker's transaction)
+            self.recent = deque(sorted([*self.recent, message], key=lambda m: m["id"]), maxlen=self.recent.maxlen)
+
+
+class ChatBroadcaster:
+    """
+    Per-church ring buffer of recent messages (history for new joiners is
+    served from memory) and live fan-out to SSE subscribers, kept by one
+    background thread per process:
+
+    - writes: posts queue up and are INSERTed together (a group commit of
+      up to `batch_size` rows); each message is broadcast once its row, and
+      with it its id, exists.
+    - relay: every `poll_interval` seconds, rows other workers wrote for
+      the rooms this process serves go into its rings and fan-out. Rows
+      younger than `settle_seconds` are read again, so one whose
+      transaction commits after a higher id is not skipped.
+    """
+
+    def __init__(self, history_size=200, batch_size=100, poll_interval=0.5, settle_seconds=5.0):
+        self.history_size = history_size
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+
+        self._rooms = {}
+        self._pending = []
+        # relay position: every row at or below _floor has been seen; ids
+        # above it already in the rings/fan-out are in _seen
+        self._floor = None
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._worker = None
+
+    # ---------------- history ----------------
+
+    def _room(self, church_id):
+        room = self._rooms.get(church_id)
+        if room is None:
+            room = self._rooms[church_id] = Room(self.history_size)
+        return room
+
+    def warm(self, church_id):
+        """
+        First touch of a room after start-up: seed the ring from the DB once.
+        From then on the relay keeps it current with other workers' rows.
+        """
+        with self._lock:
+            if self._room(church_id).warm:
+                return
+
+        if self._floor is None:
+            floor = ChatMessage.objects.aggregate(last=Max("id"))["last"] or 0
+            with self._lock:
+                if self._floor is None:
+                    self._floor = floor
+
+        rows = list(
+            ChatMessage.objects.filter(church_id=church_id)
+            .order_by("-id")
+            .values_list("id", "church_id", "user_id", "user__full_name", "body", "created_at")
+            [: self.history_size]
+        )
+
+        with self._lock:
+            room = self._room(church_id)
+            if room.warm:
+                return
+
+            loaded = [message_dict(*row) for row in reversed(rows)]
+            known = {m["id"] for m in loaded}
+            newer = [m for m in room.recent if m["id"] not in known]
+
+            room.recent.clear()
+            room.recent.extend(loaded + newer)
+            room.warm = True
+
+        self._ensure_worker()
+
+    def history(self, church_id, before=None, limit=50):
+        """
+        Messages older than `before` (newest page if None), oldest first.
+        Memory when the ring covers the page, keyset query otherwise.
+        """
+        self.warm(church_id)
+
+        with self._lock:
+            recent = list(self._rooms[church_id].recent)
+
+        older = [m for m in recent if before is None or m["id"] < before]
+        ring_is_complete = len(recent) < self.history_size
+        if len(older) >= limit or ring_is_complete:
+            return older[-limit:]
+
+        # page reaches past the ring — keyset scan on (church, id)
+        qs = ChatMessage.objects.filter(church_id=church_id)
+        if before is not None:
+            qs = qs.filter(id__lt=before)
+        rows = qs.order_by("-id").values_list(
+            "id", "church_id", "user_id", "user__full_name", "body", "created_at"
+        )[:limit]
+        return [message_dict(*row) for row in reversed(rows)]
+
+    # ---------------- writes ----------------
+
+    def post(self, church_id, user_id, full_name, body):
+        """
+        Queue a message; the Future resolves to its dict once stored and
+        broadcast, or fails with MessageNotSaved.
+        """
+        self.warm(church_id)
+
+        future = Future()
+        row = ChatMessage(church_id=church_id, user_id=user_id, body=body, created_at=timezone.now())
+        with self._lock:
+            self._pending.append((row, full_name, future))
+
+        self._ensure_worker()
+        self._wake.set()
+        return future
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="chat-broadcaster", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+                self.relay()
+            except Exception:
+                logger.exception("chat relay failed")
+            finally:
+                close_old_connections()
+
+    def flush(self):
+        """Write queued messages, then broadcast them. Returns how many were stored."""
+        with self._lock:
+            batch, self._pending = self._pending[: self.batch_size], self._pending[self.batch_size:]
+        if self._pending:
+            self._wake.set()
+        if not batch:
+            return 0
+
+        rows = [row for row, _, _ in batch]
+        try:
+            # savepoints: a failed INSERT must not break an enclosing transaction
+            with transaction.atomic():
+                ChatMessage.objects.bulk_create(rows)
+        except Exception:
+            # one bad row must not hold back the rest: store them one by one
+            # and fail only the posts whose rows are rejected
+            stored = []
+            for entry in batch:
+                row, _, future = entry
+                row.pk = None
+                try:
+                    with transaction.atomic():
+                        row.save(force_insert=True)
+                except Exception as exc:
+                    logger.exception("chat message of user %s dropped", row.user_id)
+                    future.set_exception(MessageNotSaved(str(exc)))
+                else:
+                    stored.append(entry)
+            batch = stored
+
+        for row, full_name, future in batch:
+            message = message_dict(row.id, row.church_id, row.user_id, full_name, row.body, row.created_at)
+            self._deliver(message)
+            future.set_result(message)
+        return len(batch)
+
+    # ---------------- relay (other workers) ----------------
+
+    def relay(self):
+        """Broadcast rows written by other processes. Returns how many."""
+        with self._lock:
+            church_ids = [church_id for church_id, room in self._rooms.items() if room.warm]
+            floor = self._floor
+        if not church_ids or floor is None:
+            return 0
+
+        settled = timezone.now() - timedelta(seconds=self.settle_seconds)
+        rows = list(
+            ChatMessage.objects.filter(church_id__in=church_ids, id__gt=floor)
+            .order_by("id")
+            .values_list("id", "church_id", "user_id", "user__full_name", "body", "created_at")
+        )
+
+        relayed = 0
+        for row in rows:
+            if row[0] not in self._seen:
+                self._deliver(message_dict(*row))
+                relayed += 1
+
+        # rows past the settle window are final: move the floor over them
+        old = [row[0] for row in rows if row[5] < settled]
+        if old:
+            with self._lock:
+                self._floor = max(self._floor, max(old))
+                self._seen = {message_id for message_id in self._seen if message_id > self._floor}
+        return relayed
+
+    def _deliver(self, message):
+        with self._lock:
+            self._room(message["church"]).add(message)
+            self._seen.add(message["id"])
+        get_fanout().publish(chat_channel(message["church"]), message)
+
+
+_broadcaster = None
+_broadcaster_lock = threading.Lock()
+
+
+def get_broadcaster():
+    global _broadcaster
+    if _broadcaster is None:
+        with _broadcaster_lock:
+            if _broadcaster is None:
+                _broadcaster = ChatBroadcaster(**getattr(settings, "CHAT", {}))
+                atexit.register(_broadcaster.flush)
+    return _broadcaster
@@ -0,0 +1,340 @@
+import atexit
+import fcntl
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from . import checkins
+
+logger = logging.getLogger(__name__)
+
+
+def options():
+    return {
+        "enabled": False,
+        "flush_interval_ms": 200,
+        "batch_size": 500,
+        "journal_dir": Path(settings.BASE_DIR) / "checkin-journal",
+        "fsync": True,
+        **getattr(settings, "CHECKIN_BUFFER", {}),
+    }
+
+
+def buffer_enabled():
+    return options()["enabled"]
+
+
+def fold(entries):
+    """(event_id, user_id, status, at), oldest first → {(event_id, user_id): (status, first_at)}."""
+    state = {}
+    for event_id, user_id, status, at in entries:
+        first_at = state[event_id, user_id][1] if (event_id, user_id) in state else at
+        state[event_id, user_id] = (status, first_at)
+    return state
+
+
+def deferred():
+    """Check-ins are acknowledged before they reach Attendance (buffer or log)."""
+    return buffer_enabled() or checkins.log_enabled()
+
+
+def append(event_id, user_ids, status="in"):
+    if buffer_enabled():
+        return get_buffer().append(event_id, user_ids, status)
+    return checkins.append(event_id, user_ids, status)
+
+
+def pending(event_id, user_id=None):
+    """
+    Acknowledged check-ins not in Attendance yet, in checkins.pending()'s
+    format: the log's uncompacted tail, then the buffer journals (newer) of
+    every process sharing journal_dir. Read them before Attendance: a
+    segment is deleted only once its batch is committed.
+    """
+    state = checkins.pending(event_id, user_id) if checkins.log_enabled() else {}
+    if buffer_enabled():
+        for pending_user, (status, first_at) in journal_pending(options()["journal_dir"], event_id, user_id).items():
+            state[pending_user] = (status, state[pending_user][1] if pending_user in state else first_at)
+    return state
+
+
+def start():
+    """Server start hook (backend.asgi / backend.wsgi): replay orphaned journals now."""
+    if buffer_enabled():
+        get_buffer()
+
+
+# ======================================================
+# JOURNAL — one JSON line per check-in, a segment per process boot and flush
+# ======================================================
+
+def read_journal(path):
+    entries = []
+    with open(path) as journal:
+        for line in journal:
+            try:
+                event_id, user_id, status, at = json.loads(line)
+            except ValueError:
+                # torn write of a process that died (or is still writing) mid-line
+                continue
+            entries.append((event_id, user_id, status, datetime.fromisoformat(at)))
+    return entries
+
+
+def journal_pending(journal_dir, event_id, user_id=None):
+    """{user_id: (status, first_at)} from every segment on disk, oldest check-in first."""
+    journal_dir = Path(journal_dir)
+    entries = []
+    for path in journal_dir.glob("*.jsonl") if journal_dir.is_dir() else ():
+        try:
+            entries += [
+                entry for entry in read_journal(path)
+                if entry[0] == event_id and (user_id is None or entry[1] == user_id)
+            ]
+        except FileNotFoundError:
+            continue  # flushed and deleted meanwhile: already in Attendance
+    entries.sort(key=lambda entry: entry[3])
+    return {u: value for (_, u), value in fold(entries).items()}
+
+
+def _try_lock(handle):
+    """Exclusive flock, or False while another open file (a live process) holds it."""
+    try:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+# ======================================================
+# BUFFER
+# ======================================================
+
+class CheckInBuffer:
+    """
+    Write-behind for single check-ins: append() journals the check-in to
+    local disk and returns; one background thread writes the buffer to
+    Attendance in a single transaction (checkins.apply) every
+    `flush_interval_ms` or `batch_size` check-ins.
+
+    Segments are named after this process's boot (a uuid, so a recycled
+    pid never adopts a dead worker's files) and stay flock()ed until their
+    batch is committed and they are deleted. The kernel drops the lock
+    with the process, so an unlocked segment is exactly what a crash left
+    behind for replay_orphans().
+    """
+
+    def __init__(self, journal_dir, flush_interval_ms=200, batch_size=500, fsync=True, **_):
+        self.journal_dir = Path(journal_dir)
+        self.flush_interval = flush_interval_ms / 1000
+        self.batch_size = batch_size
+        self.fsync = fsync
+        self.pid = os.getpid()
+        self.boot_id = f"{self.pid}-{uuid.uuid4().hex}"
+
+        self._entries = []
+        self._flushing = []
+        self._segments = []  # (path, locked handle) of closed, unflushed segments
+        self._journal = None
+        self._journal_path = None
+        self._seq = 0
+        self._replayed = False
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._flusher = None
+
+    # ---------------- writes ----------------
+
+    def append(self, event_id, user_ids, status="in"):
+        now = timezone.now()
+        entries = [(event_id, user_id, status, now) for user_id in user_ids]
+        lines = "".join(json.dumps([e, u, s, at.isoformat()]) + "\n" for e, u, s, at in entries)
+
+        with self._lock:
+            journal = self._open_journal()
+            journal.write(lines)
+            journal.flush()
+            if self.fsync:
+                os.fsync(journal.fileno())
+            self._entries.extend(entries)
+            full = len(self._entries) >= self.batch_size
+
+        self._ensure_flusher()
+        if full:
+            self._wake.set()
+        return now
+
+    def _open_journal(self):
+        if self._journal is None:
+            self.journal_dir.mkdir(parents=True, exist_ok=True)
+            self._seq += 1
+            path = self.journal_dir / f"{self.boot_id}-{self._seq}.jsonl"
+            # locked under a name replay_orphans() ignores, then renamed (the
+            # lock stays with the open file): it never sees this one unlocked
+            staging = path.with_suffix(".tmp")
+            journal = open(staging, "a")
+            _try_lock(journal)  # a new file: nobody else holds it
+            os.rename(staging, path)
+            self._journal, self._journal_path = journal, path
+        return self._journal
+
+    def _rotate(self):
+        """Stop writing the current segment; returns every segment not yet flushed."""
+        if self._journal is not None:
+            self._segments.append((self._journal_path, self._journal))
+            self._journal = self._journal_path = None
+        segments, self._segments = self._segments, []
+        return segments
+
+    # ---------------- reads ----------------
+
+    def pending(self, event_id, user_id=None):
+        """This process's share of pending(); see journal_pending() for all of them."""
+        with self._lock:
+            entries = [
+                entry for entry in self._flushing + self._entries
+                if entry[0] == event_id and (user_id is None or entry[1] == user_id)
+            ]
+        return {u: value for (_, u), value in fold(entries).items()}
+
+    # ---------------- flushing ----------------
+
+    def _ensure_flusher(self):
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+
+        with self._lock:
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(target=self._flush_loop, name="checkin-flusher", daemon=True)
+                self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                if not self._replayed:
+                    self.replay_orphans()
+                self.flush()
+            except Exception:
+                logger.exception("check-in buffer flush failed; retrying in %ss", self.flush_interval)
+            finally:
+                close_old_connections()
+
+    def flush(self):
+        """Write everything buffered in one transaction. Returns check-ins written."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._entries:
+                    return 0
+                batch, self._entries = self._entries, []
+                self._flushing = batch
+                segments = self._rotate()
+
+            try:
+                with transaction.atomic():
+                    checkins.apply(fold(batch))
+            except Exception:
+                with self._lock:
+                    self._entries = batch + self._entries
+                    self._flushing = []
+                    self._segments = segments + self._segments
+                raise
+
+            with self._lock:
+                self._flushing = []
+            for path, handle in segments:
+                # unlink before unlocking: a replayer never sees it unlocked
+                path.unlink(missing_ok=True)
+                handle.close()
+            return len(batch)
+
+    def close(self):
+        """Flush at exit; on failure the journal stays for the next start."""
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("check-in buffer not flushed at exit; journal kept in %s", self.journal_dir)
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            for _, handle in self._segments:
+                handle.close()
+
+    # ---------------- recovery ----------------
+
+    def replay_orphans(self):
+        """
+        Apply segments no live process holds a lock on (crash, kill -9).
+        Each one is claimed under its lock by an atomic rename, so
+        concurrent starts never replay the same journal twice. Returns
+        check-ins replayed.
+        """
+        claimed = []
+        try:
+            for path in sorted(self.journal_dir.glob("*.jsonl")) if self.journal_dir.is_dir() else ():
+                if path.name.startswith(self.boot_id):
+                    continue
+                try:
+                    handle = open(path)
+                except FileNotFoundError:
+                    continue  # flushed or claimed meanwhile
+                if not _try_lock(handle):
+                    handle.close()  # a live process is still writing or flushing it
+                    continue
+                target = self.journal_dir / f"replay-{self.boot_id}-{uuid.uuid4().hex}.jsonl"
+                try:
+                    os.rename(path, target)
+                except FileNotFoundError:
+                    handle.close()  # claimed by another process while we waited
+                    continue
+                claimed.append((target, handle))
+
+            # journals of different workers interleave: replay in check-in order
+            entries = sorted((entry for path, _ in claimed for entry in read_journal(path)), key=lambda e: e[3])
+            if entries:
+                with transaction.atomic():
+                    checkins.apply(fold(entries))
+                logger.info("replayed %s check-ins from %s orphaned journal(s)", len(entries), len(claimed))
+
+            for path, _ in claimed:
+                path.unlink()
+        finally:
+            # on failure the renamed files unlock and are left for the next replay
+            for _, handle in claimed:
+                handle.close()
+        self._replayed = True
+        return len(entries)
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    """The process's buffer; journals of dead processes are replayed when it is created."""
+    global _buffer
+    if _buffer is None or _buffer.pid != os.getpid():
+        with _buffer_lock:
+            # a buffer inherited through fork() belongs to the parent
+            if _buffer is None or _buffer.pid != os.getpid():
+                buffer = CheckInBuffer(**options())
+                try:
+                    buffer.replay_orphans()
+                except Exception:
+                    # left unlocked on disk; the flusher retries
+                    logger.exception("check-in journal replay failed")
+                atexit.register(buffer.close)
+                _buffer = buffer
+    return _buffer
@@ -0,0 +1,230 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from . import analytics
+from .counters import apply_attendance_changes
+from .models import Attendance, CheckInCompaction, CheckInLog, Event, User
+from .versions import attendance_key, bump_version
+
+logger = logging.getLogger(__name__)
+
+
+def options():
+    return {
+        "enabled": False,
+        "compact_interval": 1.0,
+        "batch_size": 5000,
+        "settle_seconds": 1.0,
+        **getattr(settings, "CHECKIN_LOG", {}),
+    }
+
+
+def log_enabled():
+    return options()["enabled"]
+
+
+# ======================================================
+# WRITES — one INSERT, no read-before-write
+# ======================================================
+
+def append(event_id, user_ids, status="in"):
+    """Log check-ins; Attendance catches up at the next compaction."""
+    now = timezone.now()
+    code = CheckInLog.STATUS_CODES[status]
+    entries = [CheckInLog(event_id=event_id, user_id=user_id, status=code, at=now) for user_id in user_ids]
+
+    if len(entries) == 1:
+        entries[0].save(force_insert=True)
+    else:
+        CheckInLog.objects.bulk_create(entries)
+
+    get_compactor().ensure_running()
+    return now
+
+
+# ======================================================
+# READS — pending (not yet compacted) entries
+# ======================================================
+
+def pending(event_id, user_id=None):
+    """
+    {user_id: (status, first_at)} for the event's uncompacted entries:
+    the latest status, and the time a new Attendance row would get. A scan
+    of the partial index on the uncompacted tail — it is short.
+    """
+    entries = CheckInLog.objects.filter(compacted=False, event_id=event_id)
+    if user_id is not None:
+        entries = entries.filter(user_id=user_id)
+
+    state = {}
+    for user_id, code, at in entries.order_by("id").values_list("user_id", "status", "at"):
+        first_at = state[user_id][1] if user_id in state else at
+        state[user_id] = (CheckInLog.STATUSES[code], first_at)
+    return state
+
+
+def merge(event, rows, pending):
+    """
+    `rows` (the event's Attendance, user loaded) with `pending` applied,
+    newest first like Attendance.Meta.ordering. Rows not compacted yet are
+    unsaved instances: their id is None until the next compaction.
+    """
+    by_user = {row.user_id: row for row in rows}
+    users = User.objects.in_bulk([user_id for user_id in pending if user_id not in by_user])
+
+    for user_id, (status, first_at) in pending.items():
+        if user_id in by_user:
+            by_user[user_id].status = status
+        elif user_id in users:
+            rows.append(Attendance(event=event, user=users[user_id], status=status, timestamp=first_at))
+
+    rows.sort(key=lambda row: row.timestamp, reverse=True)
+    return rows
+
+
+# ======================================================
+# COMPACTION — log → Attendance (current state)
+# ======================================================
+
+def compact(batch_size=None, settle_seconds=None):
+    """
+    Fold up to `batch_size` settled, uncompacted entries into Attendance
+    (see apply()) and flag them compacted, in one transaction. Entries are
+    tracked one by one, not by a high-water mark: one whose transaction
+    commits after a higher id is simply picked up by a later run. Returns
+    entries consumed.
+    """
+    opts = options()
+    batch_size = batch_size or opts["batch_size"]
+    settle_seconds = opts["settle_seconds"] if settle_seconds is None else settle_seconds
+
+    with transaction.atomic():
+        # the lock makes concurrent compactors (one per process) take turns
+        run, _ = CheckInCompaction.objects.select_for_update().get_or_create(pk=1)
+
+        # entries still settling wait a round, so quick in→out pairs from
+        # concurrent requests are folded together, in id order
+        cutoff = timezone.now() - timedelta(seconds=settle_seconds)
+        entries = list(
+            CheckInLog.objects.filter(compacted=False, at__lte=cutoff).order_by("id").values_list(
+                "id", "event_id", "user_id", "status", "at"
+            )[:batch_size]
+        )
+        if not entries:
+            return 0
+
+        state = {}
+        for _, event_id, user_id, code, at in entries:
+            first_at = state[event_id, user_id][1] if (event_id, user_id) in state else at
+            state[event_id, user_id] = (CheckInLog.STATUSES[code], first_at)
+        apply(state)
+
+        CheckInLog.objects.filter(id__in=[entry[0] for entry in entries]).update(compacted=True)
+        run.compacted_at = timezone.now()
+        run.save(update_fields=["compacted_at"])
+
+    return len(entries)
+
+
+def apply(state):
+    """
+    Write {(event_id, user_id): (status, first_at)} to Attendance — call
+    inside a transaction. Only changed pairs are written; counters,
+    rollups and attendance versions follow in batches, as for bulk check-in.
+    Idempotent, so a batch may be applied twice (e.g. a journal replay).
+    """
+    # entries of since-deleted events or users are history only
+    churches = dict(Event.objects.filter(id__in={e for e, _ in state}).values_list("id", "church_id"))
+    users = set(User.objects.filter(id__in={u for _, u in state}).values_list("id", flat=True))
+    state = {(e, u): value for (e, u), value in state.items() if e in churches and u in users}
+
+    current = {
+        (e, u): status
+        for e, u, status in Attendance.objects.filter(
+            event_id__in={e for e, _ in state}, user_id__in={u for _, u in state}
+        ).values_list("event_id", "user_id", "status")
+    }
+    changed = {key: value for key, value in state.items() if current.get(key) != value[0]}
+
+    Attendance.objects.bulk_create(
+        [Attendance(event_id=e, user_id=u, status=status, timestamp=at) for (e, u), (status, at) in changed.items()],
+        update_conflicts=True,
+        unique_fields=["event", "user"],
+        update_fields=["status"],
+        batch_size=500,
+    )
+
+    # bulk_create skips post_save: the same follow-ups as EventBulkAttendanceView
+    apply_attendance_changes((e, current.get((e, u)), status) for (e, u), (status, _) in changed.items())
+    visits = {}
+    for (e, u), (_, at) in changed.items():
+        if (e, u) not in current:
+            visits.setdefault(churches[e], []).append((u, at))
+    for church_id, church_visits in visits.items():
+        analytics.record_check_ins(church_id, church_visits)
+    for event_id in {e for e, _ in changed}:
+        bump_version(attendance_key(event_id))
+    return len(changed)
+
+
+def compact_all(settle_seconds=None):
+    total = 0
+    while consumed := compact(settle_seconds=settle_seconds):
+        total += consumed
+    return total
+
+
+def prune(before):
+    """Delete compacted entries older than `before`. Returns rows deleted."""
+    deleted, _ = CheckInLog.objects.filter(compacted=True, at__lt=before).delete()
+    return deleted
+
+
+class Compactor:
+    """
+    Background thread compacting every `compact_interval` seconds in the
+    processes that write to the log. `manage.py compact_checkins` does the
+    same from cron or on demand.
+    """
+
+    def __init__(self, compact_interval=1.0):
+        self.compact_interval = compact_interval
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def ensure_running(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="checkin-compactor", daemon=True)
+                self._thread.start()
+
+    def _loop(self):
+        while True:
+            time.sleep(self.compact_interval)
+            try:
+                compact_all()
+            except Exception:
+                logger.exception("check-in log compaction failed; retrying in %ss", self.compact_interval)
+            finally:
+                close_old_connections()
+
+
+_compactor = None
+_compactor_lock = threading.Lock()
+
+
+def get_compactor():
+    global _compactor
+    if _compactor is None:
+        with _compactor_lock:
+            if _compactor is None:
+                _compactor = Compactor(options()["compact_interval"])
+    return _compactor
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+
+
+class ThresholdGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware for responses of GZIP_MIN_LENGTH+ bytes only: below
+    that the gzip header and CPU cost more than they save. Streaming
+    responses (exports, SSE) pass through untouched — their size is not
+    known up front, and GzipFile holds back events until it fills a block.
+    """
+
+    def process_response(self, request, response):
+        if response.streaming or len(response.content) < getattr(settings, "GZIP_MIN_LENGTH", 1024):
+            return response
+        return super().process_response(request, response)
@@ -0,0 +1,118 @@
+from collections import Counter
+
+from django.db.models import Count, F, Q
+
+from .models import Attendance, Event, EventAttendanceCounter
+
+STATUS_FIELDS = {"in": "checked_in", "out": "checked_out"}
+
+
+# ======================================================
+# INCREMENTAL UPDATES
+# ======================================================
+
+def apply_attendance_change(event_id, old_status=None, new_status=None):
+    """
+    Move one attendee between counters with a single UPDATE ... SET x = x + 1.
+    old_status=None means a new row, new_status=None a deleted row.
+    """
+    apply_attendance_changes([(event_id, old_status, new_status)])
+
+
+def apply_attendance_changes(changes):
+    """
+    Many writes at once, as (event_id, old_status, new_status): one UPDATE
+    per event with the summed deltas (bulk check-in, log compaction).
+    """
+    deltas = {}
+    for event_id, old_status, new_status in changes:
+        if old_status == new_status:
+            continue
+
+        delta = deltas.setdefault(event_id, Counter())
+        if old_status in STATUS_FIELDS:
+            delta[STATUS_FIELDS[old_status]] -= 1
+        if new_status in STATUS_FIELDS:
+            delta[STATUS_FIELDS[new_status]] += 1
+        if old_status is None:
+            delta["total"] += 1
+        elif new_status is None:
+            delta["total"] -= 1
+
+    for event_id, delta in deltas.items():
+        updates = {field: F(field) + n for field, n in delta.items() if n}
+        if updates:
+            # the row is created with its Event; events bulk created without
+            # one are repaired by rebuild_counters (manage.py rebuild_attendance_counters)
+            EventAttendanceCounter.objects.filter(event_id=event_id).update(**updates)
+
+
+# ======================================================
+# FULL RECOMPUTE
+# ======================================================
+
+def count_attendance(event_ids):
+    """
+    {event_id: {"checked_in", "checked_out", "total"}} in one GROUP BY query.
+    """
+    rows = (
+        Attendance.objects.filter(event_id__in=event_ids)
+        .order_by()
+        .values("event_id")
+        .annotate(
+            checked_in=Count("id", filter=Q(status="in")),
+            checked_out=Count("id", filter=Q(status="out")),
+            total=Count("id"),
+        )
+    )
+    return {row.pop("event_id"): row for row in rows}
+
+
+def rebuild_counters(event_ids=None, batch_size=1000):
+    """
+    Recompute counters from Attendance for the given events (all if None).
+    Returns the number of counters written.
+    """
+    if event_ids is None:
+        event_ids = Event.objects.order_by("pk").values_list("pk", flat=True).iterator()
+
+    written = 0
+    batch = []
+    for event_id in event_ids:
+        batch.append(event_id)
+        if len(batch) >= batch_size:
+            written += _write_counters(batch)
+            batch = []
+
+    if batch:
+        written += _write_counters(batch)
+
+    return written
+
+
+def _write_counters(event_ids):
+    counts = count_attendance(event_ids)
+    empty = {"checked_in": 0, "checked_out": 0, "total": 0}
+
+    EventAttendanceCounter.objects.bulk_create(
+        [EventAttendanceCounter(event_id=pk, **counts.get(pk, empty)) for pk in event_ids],
+        update_conflicts=True,
+        unique_fields=["event"],
+        update_fields=["checked_in", "checked_out", "total"],
+    )
+    return len(event_ids)
+
+
+# ======================================================
+# READS
+# ======================================================
+
+def get_counter(event):
+    """
+    The event's counter, or an all-zero placeholder if none exists yet.
+    Pair with select_related("attendance_counter") on list querysets.
+    """
+    try:
+        return event.attendance_counter
+    except EventAttendanceCounter.DoesNotExist:
+        return EventAttendanceCounter(event=event)
@@ -0,0 +1,179 @@
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.functional import SimpleLazyObject
+from rest_framework.permissions import SAFE_METHODS
+
+# Applied to every new SQLite connection (see core.signals). journal_mode is
+# stored in the file; the others are per connection.
+SQLITE_PRAGMAS = {
+    # readers don't block the writer and vice versa
+    "journal_mode": "WAL",
+    # fsync at checkpoints only; still durable against app crashes in WAL mode
+    "synchronous": "NORMAL",
+    # wait for the write lock instead of failing with "database is locked"
+    "busy_timeout": 5000,
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+    # negative = KiB
+    "cache_size": -20000,
+}
+
+
+def sqlite_pragmas():
+    return {**SQLITE_PRAGMAS, **getattr(settings, "SQLITE_PRAGMAS", {})}
+
+
+def configure_connection(connection):
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+# ======================================================
+# READ REPLICAS
+# ======================================================
+
+# the request being handled; follows it into sync_to_async threads
+_current_request = ContextVar("core_db_request", default=None)
+
+STICKY_KEY = "db-primary:{}"
+
+# each worker would only see its own sticky marks: a user's next read,
+# served by another worker, could go to a replica that lacks their write
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+# Read from the primary even on replica requests: memberships gate every
+# permission check and are cached per process, so a stale read would stick.
+PRIMARY_ONLY = {("core", "membership")}
+
+
+def replica_aliases():
+    return getattr(settings, "REPLICA_DATABASES", [])
+
+
+class ReadState:
+    """Per request: whether reads may use a replica, and which one."""
+
+    def __init__(self, request):
+        self.request = request
+        self.safe = request.method in SAFE_METHODS
+        self.alias = None
+        self.sticky = None
+
+    def replica(self):
+        if not self.safe:
+            return None
+
+        if self.sticky is None:
+            user = getattr(self.request, "user", None)
+            if isinstance(user, SimpleLazyObject) or user is None:
+                # not authenticated yet (DRF sets request.user in the view):
+                # decide later, read from the primary meanwhile
+                return None
+            self.sticky = bool(user.is_authenticated and cache.get(STICKY_KEY.format(user.pk)))
+
+        if self.sticky:
+            return None
+
+        if self.alias is None:
+            # one replica per request, so its reads see one snapshot
+            self.alias = random.choice(replica_aliases())
+        return self.alias
+
+
+class ReplicaRouter:
+    """
+    Reads from SAFE_METHODS requests go to a replica (settings.REPLICA_DATABASES),
+    everything else to "default": writes, reads in unsafe requests (so
+    update_or_create and select_for_update stay on the primary), reads inside
+    transaction.atomic(), and reads outside any request (commands, threads).
+
+    A user who wrote reads from the primary for REPLICA_STICKY_SECONDS, so they
+    see their own writes despite replication lag.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _current_request.get()
+        if state is None or not replica_aliases():
+            return None
+        if model._meta.app_label != "core" or (model._meta.app_label, model._meta.model_name) in PRIMARY_ONLY:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return state.replica()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db not in replica_aliases()
+
+
+def mark_sticky(user_id):
+    cache.set(STICKY_KEY.format(user_id), 1, getattr(settings, "REPLICA_STICKY_SECONDS", 5))
+
+
+class ReplicaRoutingMiddleware:
+    """Scopes ReplicaRouter to the request and records who just wrote."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replica_aliases():
+            raise MiddlewareNotUsed
+        if isinstance(caches[DEFAULT_CACHE_ALIAS], PROCESS_LOCAL_CACHES):
+            raise ImproperlyConfigured(
+                "REPLICA_DATABASES needs a cache shared by all workers (e.g. REDIS_URL): "
+                "read-your-writes stickiness is recorded there"
+            )
+
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        token = _current_request.set(ReadState(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        self.after(request, response)
+        return response
+
+    async def __acall__(self, request):
+        token = _current_request.set(ReadState(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        if request.method not in SAFE_METHODS:
+            await sync_to_async(self.after)(request, response)
+        return response
+
+    def after(self, request, response):
+        if request.method in SAFE_METHODS or response.status_code >= 400:
+            return
+
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            mark_sticky(user.pk)
@@ -0,0 +1,115 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import Church, ChurchTrigram
+from .versions import DIRECTORY_KEY, get_version
+
+# More candidates than this and the term is common: walking the churches in
+# name order fills a page sooner than sorting every match
+MAX_CANDIDATES = 1000
+
+
+# ======================================================
+# TRIGRAM INDEX
+# ======================================================
+
+def normalize(text):
+    return " ".join((text or "").lower().split())
+
+
+def church_trigrams(church):
+    """
+    Trigrams of "name location denomination". Two trailing spaces make every
+    character start a trigram, so 1–2 character queries can use a range scan.
+    """
+    text = normalize(" ".join(filter(None, [church.name, church.location, church.denomination])))
+    text += "  "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def index_church(church):
+    ChurchTrigram.objects.filter(church_id=church.pk).delete()
+    ChurchTrigram.objects.bulk_create(
+        [ChurchTrigram(church_id=church.pk, trigram=t) for t in church_trigrams(church)]
+    )
+
+
+def rebuild_directory_index(batch_size=500):
+    ChurchTrigram.objects.all().delete()
+
+    rows = []
+    for church in Church.objects.only("id", "name", "location", "denomination").iterator():
+        rows.extend(ChurchTrigram(church_id=church.pk, trigram=t) for t in church_trigrams(church))
+        if len(rows) >= batch_size:
+            ChurchTrigram.objects.bulk_create(rows)
+            rows = []
+
+    ChurchTrigram.objects.bulk_create(rows)
+
+
+# ======================================================
+# SEARCH
+# ======================================================
+
+def candidates(q):
+    """church_id rows of the trigram index covering `q` (normalized)."""
+    if len(q) < 3:
+        # trigrams starting with q — an index range scan, not LIKE
+        return ChurchTrigram.objects.filter(trigram__gte=q, trigram__lt=q + "\U0010ffff").values("church_id")
+
+    grams = {q[i:i + 3] for i in range(len(q) - 2)}
+    return (
+        ChurchTrigram.objects.filter(trigram__in=grams)
+        .values("church_id")
+        .annotate(hits=Count("trigram"))
+        .filter(hits=len(grams))
+        .values("church_id")
+    )
+
+
+def search_churches(queryset, q):
+    """
+    Substring match of `q` against name, location or denomination.
+    Candidates come from the trigram index; icontains only re-checks them.
+    A selective term passes them as literal ids — behind a subquery the
+    planner walks the whole name index (ORDER BY name LIMIT n) testing
+    every church.
+    """
+    q = normalize(q)
+    if not q:
+        return queryset
+
+    matches = candidates(q)
+    ids = list(matches.values_list("church_id", flat=True).distinct()[: MAX_CANDIDATES + 1])
+    return matching(queryset, q, ids if len(ids) <= MAX_CANDIDATES else matches)
+
+
+def matching(queryset, q, candidates):
+    """Churches among `candidates` (ids or a church_id subquery) containing normalized `q`."""
+    return queryset.filter(id__in=candidates).filter(
+        Q(name__icontains=q) | Q(location__icontains=q) | Q(denomination__icontains=q)
+    )
+
+
+# ======================================================
+# ANONYMOUS RESPONSE CACHE
+# ======================================================
+
+def cache_key(request):
+    # Church writes bump DIRECTORY_KEY in the database, so every worker moves
+    # on to new keys at once and the old pages just expire
+    version, _ = get_version(DIRECTORY_KEY)
+    url = request.build_absolute_uri()  # paginated pages embed absolute next links
+    digest = hashlib.md5(url.encode(), usedforsecurity=False).hexdigest()
+    return f"church-directory:{version}:{digest}"
+
+
+def get_cached(request):
+    return cache.get(cache_key(request))
+
+
+def set_cached(request, data):
+    cache.set(cache_key(request), data, getattr(settings, "CHURCH_DIRECTORY_CACHE_TTL", 60))
@@ -0,0 +1,188 @@
+import csv
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from .models import Membership, User
+
+IMPORT_ROLES = ("member", "deacon")
+
+# below this many passwords a process pool costs more than it saves
+PARALLEL_THRESHOLD = 32
+
+
+# ======================================================
+# PARSING
+# ======================================================
+
+def parse_csv(text):
+    """
+    Header row required: email, full_name, password (optional), role (optional).
+    """
+    reader = csv.DictReader(io.StringIO(text))
+    return [{(k or "").strip().lower(): (v or "").strip() for k, v in row.items()} for row in reader]
+
+
+def clean_rows(rows):
+    """
+    Validate and normalize raw rows. Returns (valid, report) where report
+    holds an entry for every row that was rejected here.
+    """
+    valid = []
+    report = []
+    seen = set()
+    max_email = User._meta.get_field("email").max_length
+    max_name = User._meta.get_field("full_name").max_length
+
+    for number, raw in enumerate(rows, start=1):
+        if not isinstance(raw, dict):
+            report.append({"row": number, "status": "error", "error": "Row must be an object"})
+            continue
+
+        # kept as written (signup does the same); only duplicates compare case-insensitively
+        email = User.objects.normalize_email((raw.get("email") or "").strip())
+        full_name = (raw.get("full_name") or "").strip() or None
+        role = (raw.get("role") or "member").strip().lower()
+
+        try:
+            validate_email(email)
+        except ValidationError:
+            report.append({"row": number, "email": email, "status": "error", "error": "Invalid email"})
+            continue
+
+        if len(email) > max_email:
+            report.append({"row": number, "email": email, "status": "error",
+                           "error": f"Email is longer than {max_email} characters"})
+            continue
+
+        if full_name and len(full_name) > max_name:
+            report.append({"row": number, "email": email, "status": "error",
+                           "error": f"full_name is longer than {max_name} characters"})
+            continue
+
+        if role not in IMPORT_ROLES:
+            report.append({"row": number, "email": email, "status": "error", "error": f"Invalid role {role!r}"})
+            continue
+
+        if email.lower() in seen:
+            report.append({"row": number, "email": email, "status": "skipped", "error": "Duplicate in file"})
+            continue
+        seen.add(email.lower())
+
+        valid.append({
+            "row": number,
+            "email": email,
+            "full_name": full_name,
+            "password": raw.get("password") or None,  # None → unusable password
+            "role": role,
+        })
+
+    return valid, report
+
+
+# ======================================================
+# PASSWORD HASHING
+# ======================================================
+
+def hash_passwords(passwords, workers=None):
+    """
+    PBKDF2 is deliberately slow (hundreds of ms each), so spread it over
+    a process pool — threads would serialize on the GIL. The pool spawns
+    fresh interpreters (set up from the inherited DJANGO_SETTINGS_MODULE):
+    forking a threaded web worker can copy a lock held by another thread
+    and hang the child.
+    """
+    workers = workers or getattr(settings, "MEMBER_IMPORT_WORKERS", None) or os.cpu_count() or 1
+
+    if workers <= 1 or len(passwords) < PARALLEL_THRESHOLD:
+        return [make_password(p) for p in passwords]
+
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=django.setup,
+    ) as pool:
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+# ======================================================
+# IMPORT
+# ======================================================
+
+def import_members(church_id, rows, batch_size=500, workers=None):
+    """
+    Create users + memberships for `church_id`. Existing emails are skipped.
+    Returns {"created", "skipped", "failed", "rows": [...]}.
+    """
+    valid, report = clean_rows(rows)
+
+    # existing accounts, one query (emails compared case-insensitively)
+    existing = set(
+        User.objects.annotate(email_lower=Lower("email"))
+        .filter(email_lower__in=[r["email"].lower() for r in valid])
+        .values_list("email_lower", flat=True)
+    )
+    for r in valid:
+        if r["email"].lower() in existing:
+            report.append({"row": r["row"], "email": r["email"], "status": "skipped", "error": "Already registered"})
+    valid = [r for r in valid if r["email"].lower() not in existing]
+
+    hashes = hash_passwords([r["password"] for r in valid], workers=workers)
+
+    for start in range(0, len(valid), batch_size):
+        batch = valid[start:start + batch_size]
+        batch_hashes = hashes[start:start + batch_size]
+        report.extend(_insert_batch(church_id, batch, batch_hashes))
+
+    report.sort(key=lambda r: r["row"])
+    return {
+        "created": sum(r["status"] == "created" for r in report),
+        "skipped": sum(r["status"] == "skipped" for r in report),
+        "failed": sum(r["status"] == "error" for r in report),
+        "rows": report,
+    }
+
+
+def _insert_batch(church_id, batch, hashes):
+    with transaction.atomic():
+        User.objects.bulk_create(
+            [
+                User(email=r["email"], full_name=r["full_name"], password=h)
+                for r, h in zip(batch, hashes)
+            ],
+            ignore_conflicts=True,
+        )
+
+        # Re-read ids; a matching hash proves the row is ours and not a
+        # concurrent signup that won the race for the same email.
+        ours = {
+            email: (user_id, password)
+            for email, user_id, password in User.objects.filter(
+                email__in=[r["email"] for r in batch]
+            ).values_list("email", "id", "password")
+        }
+
+        results = []
+        memberships = []
+        for r, h in zip(batch, hashes):
+            user_id, password = ours.get(r["email"], (None, None))
+            if password != h:
+                results.append({"row": r["row"], "email": r["email"], "status": "skipped", "error": "Already registered"})
+                continue
+
+            memberships.append(Membership(user_id=user_id, church_id=church_id, role=r["role"]))
+            results.append({"row": r["row"], "email": r["email"], "status": "created", "user_id": user_id})
+
+        Membership.objects.bulk_create(memberships, ignore_conflicts=True)
+
+    return results
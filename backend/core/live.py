@@ -0,0 +1,227 @@
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+# ======================================================
+# IN-PROCESS PUB/SUB
+# ======================================================
+
+class Channel:
+    """
+    One stream (e.g. "event:12"): live subscriber queues plus a bounded
+    replay buffer so reconnecting clients can resume from Last-Event-ID.
+    """
+
+    def __init__(self, buffer_size):
+        self.buffer = deque(maxlen=buffer_size)
+        self.subscribers = set()
+        # ids at or after this are gap-free in `buffer`
+        self.since = time.time_ns()
+        self.idle_since = None
+
+
+class Subscription:
+    def __init__(self, key, loop, queue_size):
+        self.key = key
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+        # filled by subscribe(): replay items, whether the replay is gap-free,
+        # and the id a client should resume from if nothing new arrives
+        self.backlog = []
+        self.complete = True
+        self.head = None
+
+    def deliver(self, item):
+        # runs on the subscriber's event loop
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class LocalFanout:
+    """
+    Process-local broker. Publishers may be sync threads (signals in sync
+    views); subscribers are asyncio tasks, one per connection — no thread each.
+
+    It only sees writes made in this process. It is the stand-in for a
+    cross-worker backend (e.g. Redis pub/sub) with the same interface,
+    selected by settings.LIVE_FANOUT_BACKEND.
+    """
+
+    def __init__(self, buffer_size=500, queue_size=1000, idle_grace=120):
+        self.buffer_size = buffer_size
+        self.queue_size = queue_size
+        self.idle_grace = idle_grace
+        self._channels = {}
+        self._lock = threading.Lock()
+        self._last_id = 0
+
+    def _next_id(self):
+        # monotonic across channel re-creation, so stale ids are detectable
+        self._last_id = max(self._last_id + 1, time.time_ns())
+        return self._last_id
+
+    def is_open(self, key):
+        """Someone is (or was just) listening — worth building a payload."""
+        return key in self._channels
+
+    def publish(self, key, payload):
+        with self._lock:
+            channel = self._channels.get(key)
+            if channel is None:
+                return None
+
+            item = (self._next_id(), payload)
+            if len(channel.buffer) == channel.buffer.maxlen:
+                # the oldest item falls off; only ids from it on stay resumable
+                channel.since = channel.buffer[0][0]
+            channel.buffer.append(item)
+            subscribers = list(channel.subscribers)
+
+        for sub in subscribers:
+            sub.loop.call_soon_threadsafe(sub.deliver, item)
+        return item[0]
+
+    def subscribe(self, key, last_event_id=None):
+        """
+        `sub.complete` is False when events after `last_event_id` may have
+        been missed and the client has to resync.
+        """
+        sub = Subscription(key, asyncio.get_running_loop(), self.queue_size)
+
+        with self._lock:
+            self._sweep()
+            channel = self._channels.get(key)
+            if channel is None:
+                channel = self._channels[key] = Channel(self.buffer_size)
+
+            channel.subscribers.add(sub)
+            channel.idle_since = None
+
+            if last_event_id is not None:
+                if last_event_id >= channel.since:
+                    sub.backlog = [item for item in channel.buffer if item[0] > last_event_id]
+                else:
+                    sub.complete = False
+
+            sub.head = channel.buffer[-1][0] if channel.buffer else channel.since
+
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            channel = self._channels.get(sub.key)
+            if channel is None:
+                return
+
+            channel.subscribers.discard(sub)
+            if not channel.subscribers:
+                # keep the buffer a while so a quick reconnect can resume
+                channel.idle_since = time.monotonic()
+
+    def _sweep(self):
+        now = time.monotonic()
+        for key in [
+            k for k, c in self._channels.items()
+            if c.idle_since is not None and now - c.idle_since > self.idle_grace
+        ]:
+            del self._channels[key]
+
+
+_fanout = None
+_fanout_lock = threading.Lock()
+
+
+def get_fanout():
+    global _fanout
+    if _fanout is None:
+        with _fanout_lock:
+            if _fanout is None:
+                backend = getattr(settings, "LIVE_FANOUT_BACKEND", "core.live.LocalFanout")
+                _fanout = import_string(backend)()
+    return _fanout
+
+
+# ======================================================
+# ATTENDANCE DELTAS
+# ======================================================
+
+def attendance_channel(event_id):
+    return f"event:{event_id}"
+
+
+def attendance_delta(event_id, user_id, email, full_name, status, timestamp):
+    return {
+        "event": event_id,
+        "user": {"id": user_id, "email": email, "full_name": full_name},
+        "status": status,
+        "timestamp": timestamp.isoformat() if timestamp else None,
+    }
+
+
+# ======================================================
+# SERVER-SENT EVENTS
+# ======================================================
+
+def sse_message(data, event=None, event_id=None, retry=None):
+    lines = []
+    if retry is not None:
+        lines.append(f"retry: {retry}")
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(data, separators=(",", ":")))
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+async def sse_stream(key, last_event_id=None, keepalive=15, max_seconds=300, event="attendance"):
+    """
+    Async generator of SSE frames. Ends after `max_seconds` so connections
+    to dead clients cannot pile up; EventSource reconnects and resumes.
+    Payloads go out as `event` frames.
+    """
+    fanout = get_fanout()
+    sub = fanout.subscribe(key, last_event_id)
+
+    try:
+        if not sub.complete:
+            # gap we cannot replay — tell the client to re-fetch the full list
+            yield sse_message({"reason": "resume window expired"}, event="reset")
+
+        for event_id, payload in sub.backlog:
+            yield sse_message(payload, event=event, event_id=event_id)
+
+        # after the replay, so its id never skips past an undelivered item
+        yield sse_message({"channel": key}, event="ready", event_id=sub.head, retry=3000)
+
+        deadline = time.monotonic() + max_seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+
+            try:
+                event_id, payload = await asyncio.wait_for(
+                    sub.queue.get(), timeout=min(keepalive, remaining)
+                )
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+
+            if sub.overflowed:
+                yield sse_message({"reason": "client too slow"}, event="reset")
+                return
+
+            yield sse_message(payload, event=event, event_id=event_id)
+    finally:
+        fanout.unsubscribe(sub)
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.analytics import backfill_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the weekly church and monthly member attendance rollups "
+        "from Attendance (after bulk loads, raw SQL or a restore)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--church", type=int, nargs="*", help="Only these church ids (default: all)")
+        parser.add_argument("--batch-size", type=int, default=100, help="Churches aggregated per transaction")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        churches = backfill_rollups(options["church"] or None, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfilled attendance rollups for {churches} churches in {time.monotonic() - started:.1f}s."
+        ))
@@ -0,0 +1,102 @@
+import json
+import logging
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import (
+    ClientRunner,
+    HTTPRunner,
+    build_endpoints,
+    cleanup,
+    compare,
+    environment,
+    pick_fixture,
+    run_benchmark,
+    tokens_for,
+    uncovered_routes,
+)
+from core.management.commands.seed_scale import SEED_PASSWORD
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive every core API route and report p50/p95/p99 latency, throughput and "
+        "SQL queries per endpoint as JSON. Compare against a saved --baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50, help="Measured requests per endpoint")
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--url", help="Benchmark a running server (e.g. http://127.0.0.1:8000) instead of the test client")
+        parser.add_argument("--concurrency", type=int, default=1, help="Parallel requests (--url only)")
+        parser.add_argument("--only", help="Comma-separated endpoint labels to run")
+        parser.add_argument("--password", default=SEED_PASSWORD, help="Password of the fixture accounts (login endpoint)")
+        parser.add_argument("--output", help="Write the JSON report here (default: stdout)")
+        parser.add_argument("--baseline", help="Report to compare against")
+        parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 slowdown vs. baseline (0.2 = 20%%)")
+        parser.add_argument("--fail-on-regression", action="store_true")
+
+    def handle(self, *args, **options):
+        fixture = pick_fixture()
+        if fixture is None:
+            raise CommandError("No church with a pastor and a member; run `manage.py seed_scale` first")
+
+        endpoints = build_endpoints(fixture, options["password"])
+        if options["only"]:
+            wanted = {label.strip() for label in options["only"].split(",")}
+            endpoints = [ep for ep in endpoints if ep.label in wanted]
+
+        tokens = tokens_for(fixture)
+        if options["url"]:
+            runner = HTTPRunner(tokens, options["url"], concurrency=options["concurrency"])
+        else:
+            runner = ClientRunner(tokens)
+
+        def log(label, result):
+            if "skipped" in result:
+                line = f"{label:<28} skipped ({result['skipped']})"
+            else:
+                line = (
+                    f"{label:<28} p50 {result['p50_ms']:>8.2f}ms  p95 {result['p95_ms']:>8.2f}ms  "
+                    f"p99 {result['p99_ms']:>8.2f}ms  {result['rps'] or 0:>8.1f} req/s  "
+                    f"queries {result['queries'] if result['queries'] is not None else '-'}"
+                )
+                if result["errors"]:
+                    line += f"  ({result['errors']} errors, status {result['status']})"
+            self.stderr.write(line)
+
+        # expected 4xx responses would otherwise log a warning per request
+        request_logger = logging.getLogger("django.request")
+        level = request_logger.level
+        request_logger.setLevel(logging.ERROR)
+        try:
+            results = run_benchmark(runner, endpoints, options["requests"], options["warmup"], log=log)
+        finally:
+            request_logger.setLevel(level)
+            cleanup()
+
+        report = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "environment": environment(runner, options["requests"], options["warmup"]),
+            "uncovered_routes": uncovered_routes(endpoints),
+            "endpoints": results,
+        }
+
+        text = json.dumps(report, indent=2)
+        if options["output"]:
+            Path(options["output"]).write_text(text)
+        else:
+            sys.stdout.write(text + "\n")
+
+        if options["baseline"]:
+            baseline = json.loads(Path(options["baseline"]).read_text())
+            regressions = compare(report, baseline, tolerance=options["tolerance"])
+            for line in regressions:
+                self.stderr.write(self.style.ERROR(line))
+            if not regressions:
+                self.stderr.write(self.style.SUCCESS("No regressions against the baseline."))
+            elif options["fail_on_regression"]:
+                raise CommandError(f"{len(regressions)} regression(s) against {options['baseline']}")
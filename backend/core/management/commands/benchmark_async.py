@@ -0,0 +1,140 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.authentication import ChurchRefreshToken
+from core.benchmark import AsyncHTTPRunner, Endpoint, environment, pick_fixture, run_benchmark
+from core.models import User
+
+MODES = {"sync": "False", "async": "True"}
+
+
+def attendance_endpoints(fx):
+    e = fx.event_id
+    return [
+        Endpoint("attendance (leader)", "GET", f"events/{e}/attendance/", auth="leader"),
+        Endpoint("attendance (member)", "GET", f"events/{e}/attendance/", auth="member"),
+        # a check-in rush: every request is a different member (round robin)
+        Endpoint("check in", "POST", f"events/{e}/attendance/", auth="members", body=lambda n: {}),
+        Endpoint("dashboard", "GET", "dashboard/", auth="member"),
+    ]
+
+
+@contextmanager
+def serve(async_views, workers, port, backlog):
+    """gunicorn + uvicorn workers, as deployed (render.yaml), for the duration."""
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn", "backend.asgi:application",
+            "-k", "uvicorn.workers.UvicornWorker",
+            "-w", str(workers),
+            "-b", f"127.0.0.1:{port}",
+            "--backlog", str(backlog),
+            "--log-level", "warning",
+        ],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, "ASYNC_VIEWS": async_views},
+    )
+    try:
+        wait_for_port(port, process)
+        yield
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def wait_for_port(port, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise CommandError(f"server exited with status {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise CommandError(f"server did not listen on :{port} within {timeout}s")
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve the app with gunicorn + uvicorn workers twice — APIView (ASYNC_VIEWS=False) "
+        "and async views (ASYNC_VIEWS=True) for attendance and the dashboard — and compare "
+        "requests per second under many concurrent keep-alive clients."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=500, help="Concurrent connections")
+        parser.add_argument("--requests", type=int, default=5000, help="Measured requests per endpoint and mode")
+        parser.add_argument("--warmup", type=int, default=50)
+        parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "2")))
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--only", help="Comma-separated endpoint labels to run")
+        parser.add_argument("--output", help="Write the JSON report here (default: stdout)")
+
+    def handle(self, *args, **options):
+        fixture = pick_fixture()
+        if fixture is None:
+            raise CommandError("No church with a pastor and a member; run `manage.py seed_scale` first")
+
+        endpoints = attendance_endpoints(fixture)
+        if options["only"]:
+            wanted = {label.strip() for label in options["only"].split(",")}
+            endpoints = [ep for ep in endpoints if ep.label in wanted]
+
+        members = list(User.objects.filter(email__in=fixture.member_emails))
+
+        report = {"created_at": datetime.now(timezone.utc).isoformat(), "modes": {}}
+        for mode, flag in MODES.items():
+            self.stderr.write(f"— {mode} views ({options['workers']} workers, {options['clients']} clients)")
+            # fresh per mode: a long run outlives ACCESS_TOKEN_LIFETIME
+            tokens = {
+                "leader": str(ChurchRefreshToken.for_user(fixture.leader).access_token),
+                "member": str(ChurchRefreshToken.for_user(fixture.member).access_token),
+                "members": [str(ChurchRefreshToken.for_user(user).access_token) for user in members],
+            }
+            runner = AsyncHTTPRunner(tokens, f"http://127.0.0.1:{options['port']}", concurrency=options["clients"])
+            with serve(flag, options["workers"], options["port"], backlog=max(2048, options["clients"] * 2)):
+                results = run_benchmark(runner, endpoints, options["requests"], options["warmup"], log=self.log)
+            report["modes"][mode] = results
+
+        report["environment"] = {
+            **environment(runner, options["requests"], options["warmup"]),
+            "workers": options["workers"],
+            "server": "gunicorn -k uvicorn.workers.UvicornWorker",
+        }
+        report["speedup"] = {
+            label: round(report["modes"]["async"][label]["rps"] / report["modes"]["sync"][label]["rps"], 2)
+            for label in report["modes"]["sync"]
+            if report["modes"]["sync"][label].get("rps")
+        }
+        for label, ratio in report["speedup"].items():
+            self.stderr.write(f"{label:<24} async/sync {ratio:.2f}x")
+
+        text = json.dumps(report, indent=2)
+        if options["output"]:
+            Path(options["output"]).write_text(text)
+        else:
+            sys.stdout.write(text + "\n")
+
+    def log(self, label, result):
+        line = (
+            f"{label:<24} {result['rps'] or 0:>8.1f} req/s  p50 {result['p50_ms']:>8.2f}ms  "
+            f"p95 {result['p95_ms']:>8.2f}ms"
+        )
+        if result["errors"]:
+            line += f"  ({result['errors']} errors, status {result['status']})"
+        self.stderr.write(line)
@@ -0,0 +1,144 @@
+import json
+import statistics
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from core.models import Announcement, Attendance, Church, Event, User
+from core.read_serializers import (
+    AnnouncementValuesSerializer,
+    AttendanceValuesSerializer,
+    EventValuesSerializer,
+)
+from core.serializers import AnnouncementSerializer, AttendanceSerializer, EventSerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+def best_of(repeat, build):
+    """(median seconds, result of the last run) over `repeat` runs of build()."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = build()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the DRF serializers against their values() twins "
+        "(core.read_serializers) on N-row lists of announcements, events and "
+        "attendance, check the rendered JSON is byte-identical, and fail when serialization "
+        "(rows already fetched) is below --min-speedup. Rows are created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (median reported)")
+        parser.add_argument("--min-speedup", type=float, default=5.0)
+        parser.add_argument("--output", help="Write the JSON report here (default: stdout)")
+
+    def handle(self, *args, **options):
+        report = {}
+        try:
+            with transaction.atomic():
+                querysets = self.create_rows(options["rows"])
+                for label, (queryset, drf, fast) in querysets.items():
+                    report[label] = self.measure(queryset, drf, fast, options["repeat"])
+                    self.log(label, report[label])
+                raise Rollback
+        except Rollback:
+            pass
+
+        text = json.dumps({"rows": options["rows"], "lists": report}, indent=2)
+        if options["output"]:
+            Path(options["output"]).write_text(text)
+        else:
+            sys.stdout.write(text + "\n")
+
+        mismatched = [label for label, result in report.items() if not result["identical"]]
+        if mismatched:
+            raise CommandError(f"output differs from the DRF serializer: {', '.join(mismatched)}")
+        slow = [label for label, result in report.items() if result["serialize_speedup"] < options["min_speedup"]]
+        if slow:
+            raise CommandError(f"serialization below {options['min_speedup']}x: {', '.join(slow)}")
+
+    def create_rows(self, n):
+        now = timezone.now()
+        church = Church.objects.create(name="Serializer Benchmark Church")
+        users = User.objects.bulk_create(
+            User(email=f"serializer{i}@bench.test", full_name=f"Member {i}", password="!") for i in range(n)
+        )
+        author = users[0]
+
+        Announcement.objects.bulk_create(
+            Announcement(church=church, title=f"Announcement {i}", body="Body " * 20, created_by=author)
+            for i in range(n)
+        )
+        Event.objects.bulk_create(
+            Event(
+                church=church, title=f"Event {i}", location="Hall",
+                starts_at=now + timedelta(hours=i), ends_at=now + timedelta(hours=i, minutes=90),
+                created_by=author if i % 10 else None,
+                recurrence="weekly" if i % 7 == 0 else "",
+                recurrence_exceptions=["2030-01-06"] if i % 7 == 0 else [],
+            )
+            for i in range(n)
+        )
+        event = Event.objects.filter(church=church).order_by("id").first()
+        Attendance.objects.bulk_create(
+            Attendance(event=event, user=user, status="in" if i % 3 else "out") for i, user in enumerate(users)
+        )
+
+        return {
+            "announcements": (
+                Announcement.objects.filter(church=church), AnnouncementSerializer, AnnouncementValuesSerializer,
+            ),
+            "events": (Event.objects.filter(church=church), EventSerializer, EventValuesSerializer),
+            "attendance": (Attendance.objects.filter(event=event), AttendanceSerializer, AttendanceValuesSerializer),
+        }
+
+    def measure(self, queryset, drf, fast, repeat):
+        instances = queryset.select_related(*drf_relations(drf))
+        # end to end: query + serialization, model instances vs. values_list() tuples
+        drf_seconds, drf_data = best_of(repeat, lambda: drf(instances.all(), many=True).data)
+        fast_seconds, fast_data = best_of(repeat, lambda: fast.many(fast.values(queryset)))
+        # serialization alone, on rows already fetched: the query costs both
+        # sides the same database driver work (e.g. SQLite's datetime parsing)
+        loaded, rows = list(instances), list(fast.values(queryset))
+        drf_serialize, _ = best_of(repeat, lambda: drf(loaded, many=True).data)
+        fast_serialize, _ = best_of(repeat, lambda: fast.many(rows))
+
+        renderer = JSONRenderer()
+        return {
+            "rows": len(fast_data),
+            "drf_ms": round(drf_seconds * 1000, 1),
+            "values_ms": round(fast_seconds * 1000, 1),
+            "speedup": round(drf_seconds / fast_seconds, 1),
+            "drf_serialize_ms": round(drf_serialize * 1000, 1),
+            "values_serialize_ms": round(fast_serialize * 1000, 1),
+            "serialize_speedup": round(drf_serialize / fast_serialize, 1),
+            "identical": renderer.render(drf_data) == renderer.render(fast_data),
+        }
+
+    def log(self, label, result):
+        self.stderr.write(
+            f"{label:<14} {result['rows']:>7} rows  DRF {result['drf_ms']:>8.1f}ms  "
+            f"values {result['values_ms']:>7.1f}ms  {result['speedup']:>5.1f}x  "
+            f"(serialization {result['drf_serialize_ms']:.1f}ms vs {result['values_serialize_ms']:.1f}ms, "
+            f"{result['serialize_speedup']:.1f}x)  {'identical' if result['identical'] else 'DIFFERENT'}"
+        )
+
+
+def drf_relations(serializer):
+    # the nested user, as the views load it
+    return ["user"] if serializer is AttendanceSerializer else ["created_by"]
@@ -0,0 +1,113 @@
+import re
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.authentication import ChurchRefreshToken
+from core.checkins import compact_all
+from core.counters import get_counter
+from core.models import Attendance, Church, Event, Membership, User
+
+CHURCH_NAME = "Concurrency Test Church"
+EMAIL = "concurrency{}@load.test"
+
+
+def error_summary(body):
+    # DEBUG error pages: the exception is in <title>
+    title = re.search(r"<title>(.*?)</title>", body, re.S)
+    return " ".join((title.group(1) if title else body[:200]).split())
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire parallel check-ins at EventAttendanceView.post on a running server "
+        "(e.g. gunicorn with 2+ workers) and fail if any request errors, e.g. "
+        "with 'database is locked'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", required=True, help="Base URL, e.g. http://127.0.0.1:8000")
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--rounds", type=int, default=3, help="Check-ins per user (repeats hit the same row)")
+        parser.add_argument("--concurrency", type=int, default=32)
+
+    def handle(self, *args, **options):
+        event, users = self.setup(options["users"])
+        tokens = [str(ChurchRefreshToken.for_user(u).access_token) for u in users]
+        url = options["url"].rstrip("/") + f"/api/events/{event.id}/attendance/"
+
+        def check_in(job):
+            user_no, _ = job
+            req = urllib.request.Request(url, data=b"{}", method="POST", headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {tokens[user_no]}",
+            })
+            try:
+                with urllib.request.urlopen(req, timeout=60) as response:
+                    response.read()
+                    return response.status, None
+            except urllib.error.HTTPError as e:
+                return e.code, error_summary(e.read().decode(errors="replace"))
+            except OSError as e:
+                return "connection error", str(e)
+
+        # round-major, so the same row is hit by consecutive rounds concurrently
+        jobs = [(u, r) for r in range(options["rounds"]) for u in range(len(users))]
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            results = list(pool.map(check_in, jobs))
+        elapsed = time.perf_counter() - started
+
+        statuses = Counter(status for status, _ in results)
+        errors = Counter(detail for status, detail in results if status != 200)
+
+        try:
+            # with CHECKIN_LOG the server only appended; fold the log in first
+            compacted = compact_all(settle_seconds=0)
+            if compacted:
+                self.stdout.write(f"compacted {compacted} check-in log entries")
+            rows = Attendance.objects.filter(event=event).count()
+            counter = get_counter(event)
+            self.stdout.write(
+                f"{len(jobs)} requests in {elapsed:.1f}s ({len(jobs) / elapsed:.0f} req/s): {dict(statuses)}"
+            )
+            self.stdout.write(
+                f"attendance rows {rows} (expected {len(users)}); "
+                f"counter total {counter.total}, in {counter.checked_in}, out {counter.checked_out}"
+            )
+            for detail, count in errors.most_common(5):
+                self.stdout.write(self.style.ERROR(f"{count}× {detail}"))
+
+            if errors or rows != len(users) or counter.total != rows or counter.checked_in != rows:
+                raise CommandError("Concurrent check-ins failed or left inconsistent rows")
+            self.stdout.write(self.style.SUCCESS("No errors; rows and counters consistent."))
+        finally:
+            self.teardown()
+
+    def setup(self, count):
+        self.teardown()
+
+        church = Church.objects.create(name=CHURCH_NAME)
+        now = timezone.now()
+        event = Event.objects.create(church=church, title="Load test", starts_at=now, ends_at=now + timedelta(hours=1))
+
+        password = make_password(None)
+        User.objects.bulk_create(User(email=EMAIL.format(n), password=password) for n in range(count))
+        users = list(User.objects.filter(email__in=[EMAIL.format(n) for n in range(count)]).order_by("id"))
+        Membership.objects.bulk_create(Membership(user=u, church=church) for u in users)
+
+        if not users:
+            raise CommandError("--users must be at least 1")
+        return event, users
+
+    def teardown(self):
+        Church.objects.filter(name=CHURCH_NAME).delete()
+        User.objects.filter(email__endswith="@load.test").delete()
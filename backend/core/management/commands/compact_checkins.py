@@ -0,0 +1,35 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.checkin_buffer import CheckInBuffer, buffer_enabled, options as buffer_options
+from core.checkins import compact_all, prune
+
+
+class Command(BaseCommand):
+    help = (
+        "Compact the append-only check-in log into Attendance (current state) and, "
+        "with CHECKIN_BUFFER, replay journals left by crashed web processes. Web "
+        "processes do both in the background; run it from cron as a backstop or "
+        "with --prune-days to trim old history."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--settle-seconds", type=float, default=None,
+            help="Skip entries younger than this (default: CHECKIN_LOG['settle_seconds']; 0 when no writers are running)",
+        )
+        parser.add_argument("--prune-days", type=int, default=None, help="Afterwards, delete compacted entries older than N days")
+
+    def handle(self, *args, **options):
+        if buffer_enabled():
+            replayed = CheckInBuffer(**buffer_options()).replay_orphans()
+            self.stdout.write(self.style.SUCCESS(f"Replayed {replayed} journaled check-ins."))
+
+        compacted = compact_all(settle_seconds=options["settle_seconds"])
+        self.stdout.write(self.style.SUCCESS(f"Compacted {compacted} check-in log entries."))
+
+        if options["prune_days"] is not None:
+            deleted = prune(timezone.now() - timedelta(days=options["prune_days"]))
+            self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} entries older than {options['prune_days']} days."))
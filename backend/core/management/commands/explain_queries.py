@@ -0,0 +1,175 @@
+from datetime import timedelta
+
+from django.core.exceptions import EmptyResultSet
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.db import connections
+
+from core import search
+from core import directory
+from core.exports import attendance_values
+from core.models import Announcement, Attendance, Church, Event, Membership
+from core.pagination import AnnouncementCursorPagination, ChurchDirectoryPagination, EventCursorPagination
+from core.recurrence import overlapping
+from core.views import DashboardView, dashboard_querysets
+
+
+# Plan fragments that mean "read the whole table"
+FULL_SCAN_MARKERS = {
+    "sqlite": ("SCAN core_",),
+    "postgresql": ("Seq Scan",),
+}
+
+# SQLite reports MATCH lookups on the FTS5 index as a scan of the virtual table
+INDEXED_SCAN_MARKERS = ("VIRTUAL TABLE INDEX",)
+
+# Endpoints that are allowed to scan: the unfiltered directory, and a common
+# directory term, which walks the churches in name order until a page fills
+ALLOWED_SCANS = {"GET churches/", "GET churches/?q= (common term)"}
+
+
+def full_scan(vendor, plan):
+    markers = FULL_SCAN_MARKERS.get(vendor, ())
+    return any(
+        any(m in line for m in markers) and not any(m in line for m in INDEXED_SCAN_MARKERS)
+        for line in plan.splitlines()
+    )
+
+
+class RecordingCursor:
+    """Stands in for a DB cursor to capture the raw SQL a helper would run."""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, sql, params=None):
+        self.statements.append((sql, params or []))
+
+    def fetchall(self):
+        return []
+
+
+class Command(BaseCommand):
+    help = (
+        "Print EXPLAIN plans for the queries behind every core API endpoint. "
+        "Fails (exit status 1) when any of them reads a whole table, so it can gate CI."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+        parser.add_argument("--church", type=int, help="Church id to plan with (default: first membership)")
+        parser.add_argument("--user", type=int, help="User id to plan with (default: first membership)")
+        parser.add_argument("--event", type=int, help="Event id to plan with (default: first event of the church)")
+
+    def handle(self, *args, **options):
+        db = options["database"]
+        vendor = connections[db].vendor
+
+        membership = Membership.objects.using(db).order_by("pk").first()
+        church_id = options["church"] or (membership.church_id if membership else 1)
+        user_id = options["user"] or (membership.user_id if membership else 1)
+
+        event = Event.objects.using(db).filter(church_id=church_id).order_by("pk").first()
+        event_id = options["event"] or (event.id if event else 1)
+
+        failures = []
+        for label, query in self.endpoint_queries(db, church_id, user_id, event_id):
+            sql, plan = self.explain(db, query)
+
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(sql)
+            self.stdout.write(plan)
+            self.stdout.write("")
+
+            if label not in ALLOWED_SCANS and full_scan(vendor, plan):
+                failures.append(label)
+
+        if failures:
+            raise CommandError("Full table scan in: " + ", ".join(failures))
+        self.stdout.write(self.style.SUCCESS(f"All endpoint queries use an index on {vendor}."))
+
+    def explain(self, db, query):
+        """(SQL, plan) of a QuerySet, or of a raw (sql, params) pair."""
+        if not isinstance(query, tuple):
+            try:
+                return str(query.query), query.explain()
+            except EmptyResultSet:
+                return "(no query: the result is known to be empty)", ""
+
+        sql, params = query
+        connection = connections[db]
+        prefix = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else "EXPLAIN "
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            plan = "\n".join(" ".join(str(column) for column in row) for row in cursor.fetchall())
+        return sql, plan
+
+    def search_queries(self, db, church_id):
+        """The raw index query behind GET search/ (when the vendor has one)."""
+        backend = search.BACKENDS.get(connections[db].vendor)
+        if backend is None:
+            return []
+
+        recorder = RecordingCursor()
+        backend().search(recorder, church_id, ["service"], tuple(search.KINDS), 20)
+        return [("GET search/?q=", statement) for statement in recorder.statements]
+
+    def endpoint_queries(self, db, church_id, user_id, event_id):
+        announcements = Announcement.objects.using(db).filter(church_id=church_id)
+        events = Event.objects.using(db).filter(church_id=church_id)
+        attendance = Attendance.objects.using(db).filter(event_id=event_id)
+
+        page = AnnouncementCursorPagination.page_size + 1
+        month = timezone.now()
+
+        churches = Church.objects.using(db).order_by(*ChurchDirectoryPagination.ordering)
+        directory_page = ChurchDirectoryPagination.page_size + 1
+        term = directory.normalize(churches.filter(pk=church_id).values_list("name", flat=True).first() or "church")
+
+        dashboard = dashboard_querysets(church_id, DashboardView.default_limit)
+        announcement_count, event_count, latest, one_off, rules = (qs.using(db) for qs in dashboard)
+
+        return [
+            ("membership (every authenticated request)",
+             Membership.objects.using(db).filter(user_id=user_id).order_by("pk")
+             .values_list("id", "church_id", "role")),
+
+            ("GET churches/", Church.objects.using(db).all()),
+            ("GET churches/<id>/", Church.objects.using(db).filter(pk=church_id)),
+            ("GET churches/?q=", directory.matching(churches, term, [church_id])[:directory_page]),
+            ("GET churches/?q= (common term)",
+             directory.matching(churches, term, directory.candidates(term))[:directory_page]),
+
+            ("GET dashboard/ (church)", Church.objects.using(db).filter(pk=church_id)),
+            ("GET dashboard/ (announcement count)", announcement_count),
+            ("GET dashboard/ (event count)", event_count),
+            ("GET dashboard/ (latest announcements)", latest),
+            ("GET dashboard/ (upcoming events)", one_off),
+            ("GET dashboard/ (recurring events)", rules),
+
+            *self.search_queries(db, church_id),
+            ("GET search/?q= (objects)",
+             announcements.filter(pk__in=[1, 2, 3]).select_related("created_by")),
+
+            ("GET announcements/", announcements.select_related("church", "created_by")),
+            ("GET announcements/?cursor=",
+             announcements.order_by(*AnnouncementCursorPagination.ordering)[:page]),
+
+            ("GET events/", events.select_related("church", "created_by")),
+            ("GET events/?mine=1", events.filter(created_by_id=user_id)),
+            ("GET events/?cursor=", events.order_by(*EventCursorPagination.ordering)[:page]),
+            *zip(("GET events/?from=&to= (one-off)", "GET events/?from=&to= (recurring)"),
+                 overlapping(events, month, month + timedelta(days=31))),
+
+            ("GET events/<id>/attendance/ (event)", Event.objects.using(db).filter(pk=event_id)),
+            ("GET events/<id>/attendance/ (leader)", attendance.select_related("user")),
+            ("GET events/<id>/attendance/ (member)", attendance.filter(user_id=user_id)),
+            ("POST events/<id>/attendance/", attendance.filter(user_id=user_id)),
+
+            ("GET events/<id>/attendance/export/", attendance_values(attendance)),
+            ("GET attendance/export/", attendance_values(
+                Attendance.objects.using(db).filter(event__church_id=church_id))),
+            ("GET attendance/export/?from=&to=", attendance_values(
+                Attendance.objects.using(db).filter(event__church_id=church_id)
+                .filter(event__starts_at__gte=month, event__starts_at__lt=month + timedelta(days=31)))),
+        ]
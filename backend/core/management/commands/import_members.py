@@ -0,0 +1,41 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importer import import_members, parse_csv
+from core.models import Church
+
+
+class Command(BaseCommand):
+    help = "Bulk import members into a church from a CSV (with header) or JSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--church", type=int, required=True)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--workers", type=int, help="Hashing processes (default: CPU count)")
+        parser.add_argument("--report", help="Write the per-row report to this JSON file")
+
+    def handle(self, *args, **options):
+        if not Church.objects.filter(id=options["church"]).exists():
+            raise CommandError(f"Church {options['church']} does not exist")
+
+        path = Path(options["path"])
+        text = path.read_text(encoding="utf-8-sig")
+        rows = json.loads(text) if path.suffix.lower() == ".json" else parse_csv(text)
+
+        report = import_members(
+            options["church"], rows, batch_size=options["batch_size"], workers=options["workers"]
+        )
+
+        for row in report["rows"]:
+            if row["status"] != "created":
+                self.stdout.write(f"row {row['row']}: {row['status']} — {row.get('error')}")
+
+        if options["report"]:
+            Path(options["report"]).write_text(json.dumps(report, indent=2))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {report['created']}, skipped {report['skipped']}, failed {report['failed']}."
+        ))
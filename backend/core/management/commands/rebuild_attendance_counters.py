@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute EventAttendanceCounter rows from Attendance."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--event", type=int, nargs="*", help="Only these event ids (default: all)")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        written = rebuild_counters(options["event"] or None, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} attendance counters."))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the full-text search index over announcements and events "
+        "(after bulk loads, raw SQL or restoring a backup)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=None, help="Database alias (default: the primary)")
+
+    def handle(self, *args, **options):
+        indexed = rebuild_search_index(using=options["database"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} announcements and events."))
@@ -0,0 +1,246 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core.analytics import backfill_rollups
+from core.counters import rebuild_counters
+from core.directory import rebuild_directory_index
+from core.models import (
+    Announcement,
+    Attendance,
+    ChatMessage,
+    Church,
+    ChurchTrigram,
+    ChurchWeeklyAttendance,
+    Event,
+    EventAttendanceCounter,
+    Membership,
+    MemberMonthlyAttendance,
+    User,
+)
+from core.search import rebuild_search_index
+from core.versions import DIRECTORY_KEY, bump_version, church_key
+
+# Seeded rows are recognisable (and removable with --reset) by these
+SEED_DOMAIN = "seed.test"
+SEED_CHURCH_PREFIX = "Seed Church "
+SEED_PASSWORD = "benchmark"
+
+CITIES = ["Atlanta", "Boston", "Chicago", "Dallas", "Denver", "Houston", "Los Angeles",
+          "Miami", "Nashville", "New York", "Phoenix", "Portland", "Seattle"]
+DENOMINATIONS = ["Baptist", "Catholic", "Lutheran", "Methodist", "Non-denominational",
+                 "Orthodox", "Pentecostal", "Presbyterian"]
+EVENT_TITLES = ["Sunday Service", "Bible Study", "Youth Night", "Prayer Meeting",
+                "Choir Practice", "Community Dinner", "Small Group", "Outreach"]
+
+
+def seed_email(church_no, member_no):
+    return f"seed{church_no}-{member_no}@{SEED_DOMAIN}"
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a large, reproducible synthetic dataset (churches, members, events, "
+        "announcements, attendance) with bulk_create. Same --seed, same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--churches", type=int, default=10)
+        parser.add_argument("--members", type=int, default=200, help="Members per church (first is pastor, second deacon)")
+        parser.add_argument("--events", type=int, default=50, help="Events per church")
+        parser.add_argument("--announcements", type=int, default=50, help="Announcements per church")
+        parser.add_argument("--attendance-rate", type=float, default=0.6,
+                            help="Fraction of a church's members with an attendance row per event")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--reset", action="store_true", help="Delete previously seeded data first")
+
+    def handle(self, *args, **options):
+        if not 0 <= options["attendance_rate"] <= 1:
+            raise CommandError("--attendance-rate must be between 0 and 1")
+        if options["members"] < 2:
+            raise CommandError("--members must be at least 2 (pastor and deacon)")
+
+        if options["reset"]:
+            self.reset()
+        elif User.objects.filter(email__endswith="@" + SEED_DOMAIN).exists():
+            raise CommandError("Seed data already exists; pass --reset to replace it")
+
+        rng = random.Random(options["seed"])
+        batch_size = options["batch_size"]
+        started = time.monotonic()
+
+        # one hash for every seeded account; PBKDF2 per user would dominate
+        password = make_password(SEED_PASSWORD)
+        # dates relative to today so upcoming events exist; the shape is fixed by the seed
+        anchor = timezone.now().replace(hour=10, minute=0, second=0, microsecond=0)
+
+        church_ids = self.seed_churches(rng, options["churches"])
+        members = self.seed_members(church_ids, options["members"], password, batch_size)
+        events = self.seed_events(rng, church_ids, members, options["events"], anchor, batch_size)
+        self.seed_announcements(rng, church_ids, members, options["announcements"], batch_size)
+        rows = self.seed_attendance(rng, events, members, options["attendance_rate"], batch_size)
+
+        self.stdout.write("Rebuilding counters, rollups and the directory and search indexes…")
+        rebuild_counters(batch_size=batch_size)
+        backfill_rollups(church_ids)
+        rebuild_directory_index()
+        rebuild_search_index()
+        for church_id in church_ids:
+            bump_version(church_key(church_id))
+        bump_version(DIRECTORY_KEY)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(church_ids)} churches, {sum(len(m) for m in members.values())} members, "
+            f"{len(events)} events, {len(church_ids) * options['announcements']} announcements and "
+            f"{rows} attendance rows in {time.monotonic() - started:.1f}s "
+            f"(password for every account: {SEED_PASSWORD!r})."
+        ))
+
+    # ---------------------------------------------------
+    # GENERATORS
+    # ---------------------------------------------------
+
+    def seed_churches(self, rng, count):
+        Church.objects.bulk_create([
+            Church(
+                name=f"{SEED_CHURCH_PREFIX}{n:05d}",
+                location=rng.choice(CITIES),
+                denomination=rng.choice(DENOMINATIONS),
+                size=rng.randint(20, 5000),
+            )
+            for n in range(count)
+        ])
+        return list(
+            Church.objects.filter(name__startswith=SEED_CHURCH_PREFIX).order_by("name").values_list("id", flat=True)
+        )
+
+    def seed_members(self, church_ids, per_church, password, batch_size):
+        """Returns {church_id: [user_id, ...]}, pastor first, deacon second."""
+        User.objects.bulk_create(
+            (
+                User(email=seed_email(c, m), full_name=f"Member {c}-{m}", password=password)
+                for c in range(len(church_ids))
+                for m in range(per_church)
+            ),
+            batch_size=batch_size,
+        )
+        ids = dict(User.objects.filter(email__endswith="@" + SEED_DOMAIN).values_list("email", "id"))
+
+        members = {}
+        memberships = []
+        for c, church_id in enumerate(church_ids):
+            members[church_id] = [ids[seed_email(c, m)] for m in range(per_church)]
+            for m, user_id in enumerate(members[church_id]):
+                role = "pastor" if m == 0 else "deacon" if m == 1 else "member"
+                memberships.append(Membership(user_id=user_id, church_id=church_id, role=role))
+
+        Membership.objects.bulk_create(memberships, batch_size=batch_size)
+        self.stdout.write(f"{len(memberships)} members")
+        return members
+
+    def seed_events(self, rng, church_ids, members, per_church, anchor, batch_size):
+        """Returns [(event_id, church_id), ...]; half past, half upcoming."""
+
+        def make_event(church_id):
+            starts_at = anchor + timedelta(days=rng.randint(-180, 180), hours=rng.randint(0, 10))
+            return Event(
+                church_id=church_id,
+                title=rng.choice(EVENT_TITLES),
+                starts_at=starts_at,
+                ends_at=starts_at + timedelta(hours=rng.choice((1, 2, 3))),
+                location=rng.choice(CITIES),
+                created_by_id=members[church_id][rng.randint(0, 1)],
+            )
+
+        Event.objects.bulk_create(
+            (make_event(church_id) for church_id in church_ids for _ in range(per_church)),
+            batch_size=batch_size,
+        )
+        events = list(
+            Event.objects.filter(church_id__in=church_ids).order_by("id").values_list("id", "church_id")
+        )
+        self.stdout.write(f"{len(events)} events")
+        return events
+
+    def seed_announcements(self, rng, church_ids, members, per_church, batch_size):
+        Announcement.objects.bulk_create(
+            (
+                Announcement(
+                    church_id=church_id,
+                    title=f"{rng.choice(EVENT_TITLES)} update",
+                    body="Lorem ipsum dolor sit amet. " * rng.randint(1, 20),
+                    created_by_id=members[church_id][rng.randint(0, 1)],
+                )
+                for church_id in church_ids
+                for _ in range(per_church)
+            ),
+            batch_size=batch_size,
+        )
+        self.stdout.write(f"{len(church_ids) * per_church} announcements")
+
+    def seed_attendance(self, rng, events, members, rate, batch_size):
+        total = 0
+        batch = []
+        for event_id, church_id in events:
+            church_members = members[church_id]
+            for user_id in rng.sample(church_members, round(len(church_members) * rate)):
+                batch.append(Attendance(
+                    event_id=event_id,
+                    user_id=user_id,
+                    status="in" if rng.random() < 0.8 else "out",
+                ))
+
+            if len(batch) >= batch_size:
+                total += self.write_attendance(batch)
+                batch = []
+
+        total += self.write_attendance(batch)
+        self.stdout.write(f"{total} attendance rows")
+        return total
+
+    def write_attendance(self, batch):
+        # counters are rebuilt once at the end instead of per row
+        with transaction.atomic():
+            Attendance.objects.bulk_create(batch)
+        return len(batch)
+
+    # ---------------------------------------------------
+    # RESET
+    # ---------------------------------------------------
+
+    def reset(self):
+        """
+        Bottom-up raw deletes: cascading through the ORM would load every
+        attendance row to run its signals. Counters, rollups, versions and
+        the search index are rebuilt afterwards by handle().
+        """
+        churches = Church.objects.filter(name__startswith=SEED_CHURCH_PREFIX)
+        users = User.objects.filter(email__endswith="@" + SEED_DOMAIN)
+        events = Event.objects.filter(church__in=churches)
+
+        with transaction.atomic():
+            for qs in (
+                ChatMessage.objects.filter(church__in=churches),
+                Attendance.objects.filter(event__in=events),
+                Attendance.objects.filter(user__in=users),
+                EventAttendanceCounter.objects.filter(event__in=events),
+                ChurchWeeklyAttendance.objects.filter(church__in=churches),
+                MemberMonthlyAttendance.objects.filter(church__in=churches),
+                MemberMonthlyAttendance.objects.filter(user__in=users),
+                events,
+                Announcement.objects.filter(church__in=churches),
+                Membership.objects.filter(church__in=churches),
+                Membership.objects.filter(user__in=users),
+                ChurchTrigram.objects.filter(church__in=churches),
+                churches,
+                users,
+            ):
+                qs._raw_delete(qs.db)
+
+        self.stdout.write("Removed previous seed data")
@@ -0,0 +1,40 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the SQLite primary into the SQLite replica file(s) (SQLITE_REPLICA_PATH). "
+        "Local stand-in for replication: the replica lags until this runs again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", action="append", help="Replica alias (default: all)")
+
+    def handle(self, *args, **options):
+        aliases = options["database"] or settings.REPLICA_DATABASES
+        if not aliases:
+            raise CommandError("No replicas configured; set SQLITE_REPLICA_PATH")
+
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != "sqlite":
+            raise CommandError("Only SQLite primaries can be copied; use real replication for Postgres")
+
+        for alias in aliases:
+            if alias not in settings.REPLICA_DATABASES or connections[alias].vendor != "sqlite":
+                raise CommandError(f"{alias} is not a SQLite replica")
+
+            connections[alias].close()
+            source = sqlite3.connect(primary.settings_dict["NAME"])
+            target = sqlite3.connect(connections[alias].settings_dict["NAME"])
+            try:
+                # online backup: consistent snapshot even while the primary is written
+                source.backup(target)
+            finally:
+                source.close()
+                target.close()
+
+            self.stdout.write(self.style.SUCCESS(f"{alias} ← {primary.settings_dict['NAME']}"))
@@ -0,0 +1,167 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .models import Membership
+
+LEADER_ROLES = ("pastor", "deacon")
+
+
+# ======================================================
+# RESOLVED MEMBERSHIP
+# ======================================================
+
+class MembershipInfo(NamedTuple):
+    id: int
+    church_id: int
+    role: str
+
+    @property
+    def is_leader(self):
+        return self.role.lower() in LEADER_ROLES
+
+
+# ======================================================
+# PROCESS-WIDE LRU / TTL CACHE
+# ======================================================
+
+class MembershipCache:
+    """
+    Thread-safe LRU cache of user_id -> tuple of MembershipInfo.
+    Entries expire after `ttl` seconds so other workers' writes are
+    eventually picked up; local writes invalidate through signals.
+    """
+
+    def __init__(self, maxsize=10000, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._data.get(user_id)
+            if entry is None:
+                return None
+
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[user_id]
+                return None
+
+            self._data.move_to_end(user_id)
+            return value
+
+    def set(self, user_id, value):
+        with self._lock:
+            self._data[user_id] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(user_id)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._data.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+membership_cache = MembershipCache(
+    maxsize=getattr(settings, "MEMBERSHIP_CACHE_MAXSIZE", 10000),
+    ttl=getattr(settings, "MEMBERSHIP_CACHE_TTL", 60),
+)
+
+
+# ======================================================
+# RESOLVERS
+# ======================================================
+
+def resolve_memberships(user_id, cached=True):
+    """
+    All memberships of a user, oldest first (same order `.first()` used).
+    Served from the process cache when possible; cached=False reads the
+    database (and refreshes the cache).
+    """
+    user_id = int(user_id)
+
+    memberships = membership_cache.get(user_id) if cached else None
+    if memberships is not None:
+        return memberships
+
+    memberships = tuple(
+        MembershipInfo(*row)
+        for row in Membership.objects.filter(user_id=user_id)
+        .order_by("pk")
+        .values_list("id", "church_id", "role")
+    )
+    membership_cache.set(user_id, memberships)
+    return memberships
+
+
+def get_membership(request, church_id=None):
+    """
+    The requesting user's membership, resolved once per request and shared
+    by views, permissions and serializers.
+
+    Without `church_id` this is the user's primary church (first membership).
+    With `church_id` it is the membership in that church, or None.
+
+    Token-backed users (core.authentication) answer from their JWT claims
+    without touching the database.
+    """
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return None
+
+    if getattr(user, "has_membership_claims", False):
+        claimed = user.membership_claim
+        if church_id is None or (claimed and claimed.church_id == church_id):
+            return claimed
+
+    memberships = getattr(request, "_core_memberships", None)
+    if memberships is None:
+        memberships = resolve_memberships(user.pk)
+        request._core_memberships = memberships
+
+    return _select(memberships, church_id)
+
+
+async def aget_membership(request, church_id=None):
+    """
+    get_membership() for async views. Claims and the process cache are
+    read on the event loop; only a cache miss goes to a DB thread.
+    """
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return None
+
+    if getattr(user, "has_membership_claims", False):
+        claimed = user.membership_claim
+        if church_id is None or (claimed and claimed.church_id == church_id):
+            return claimed
+
+    memberships = getattr(request, "_core_memberships", None)
+    if memberships is None:
+        memberships = membership_cache.get(int(user.pk))
+        if memberships is None:
+            memberships = await sync_to_async(resolve_memberships)(user.pk)
+        request._core_memberships = memberships
+
+    return _select(memberships, church_id)
+
+
+def _select(memberships, church_id):
+    if church_id is None:
+        return memberships[0] if memberships else None
+
+    for membership in memberships:
+        if membership.church_id == church_id:
+            return membership
+    return None
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.26 on 2026-10-18 14:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['church', 'created_at', 'id'], name='announcement_church_created'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['church', 'starts_at', 'id'], name='event_church_starts'),
+        ),
+    ]
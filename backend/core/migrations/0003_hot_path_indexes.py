@@ -0,0 +1,45 @@
+# Generated by Django 4.2.26 on 2026-10-18 14:51
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def remove_duplicate_attendance(apps, schema_editor):
+    """
+    Keep only the newest row per (event, user) so the unique constraint
+    can be created on databases that already raced into duplicates.
+    """
+    Attendance = apps.get_model("core", "Attendance")
+
+    duplicates = (
+        Attendance.objects.values("event_id", "user_id")
+        .annotate(n=Count("id"), keep=Max("id"))
+        .filter(n__gt=1)
+    )
+    for row in duplicates.iterator():
+        Attendance.objects.filter(
+            event_id=row["event_id"], user_id=row["user_id"]
+        ).exclude(id=row["keep"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_attendance, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['event', '-timestamp'], name='attendance_event_timestamp'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['church', 'created_by'], name='event_church_creator'),
+        ),
+        migrations.AddConstraint(
+            model_name='attendance',
+            constraint=models.UniqueConstraint(fields=('event', 'user'), name='attendance_event_user_unique'),
+        ),
+    ]
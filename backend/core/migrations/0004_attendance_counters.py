@@ -0,0 +1,49 @@
+# Generated by Django 4.2.26 on 2026-10-18 14:52
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+import django.db.models.deletion
+
+
+def backfill_counters(apps, schema_editor):
+    Attendance = apps.get_model("core", "Attendance")
+    Event = apps.get_model("core", "Event")
+    EventAttendanceCounter = apps.get_model("core", "EventAttendanceCounter")
+
+    counts = {
+        row.pop("event_id"): row
+        for row in Attendance.objects.order_by().values("event_id").annotate(
+            checked_in=Count("id", filter=Q(status="in")),
+            checked_out=Count("id", filter=Q(status="out")),
+            total=Count("id"),
+        )
+    }
+    empty = {"checked_in": 0, "checked_out": 0, "total": 0}
+
+    EventAttendanceCounter.objects.bulk_create(
+        [
+            EventAttendanceCounter(event_id=pk, **counts.get(pk, empty))
+            for pk in Event.objects.values_list("pk", flat=True).iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventAttendanceCounter',
+            fields=[
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='attendance_counter', serialize=False, to='core.event')),
+                ('checked_in', models.IntegerField(default=0)),
+                ('checked_out', models.IntegerField(default=0)),
+                ('total', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.26 on 2026-10-18 14:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def index_existing_churches(apps, schema_editor):
+    Church = apps.get_model("core", "Church")
+    ChurchTrigram = apps.get_model("core", "ChurchTrigram")
+
+    rows = []
+    for church in Church.objects.iterator():
+        text = " ".join(filter(None, [church.name, church.location, church.denomination]))
+        text = " ".join(text.lower().split()) + "  "
+        rows.extend(
+            ChurchTrigram(church_id=church.pk, trigram=t)
+            for t in {text[i:i + 3] for i in range(len(text) - 2)}
+        )
+
+    ChurchTrigram.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_change_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChurchTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='church',
+            index=models.Index(fields=['name', 'id'], name='church_name'),
+        ),
+        migrations.AddField(
+            model_name='churchtrigram',
+            name='church',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trigrams', to='core.church'),
+        ),
+        migrations.AddConstraint(
+            model_name='churchtrigram',
+            constraint=models.UniqueConstraint(fields=('trigram', 'church'), name='church_trigram_unique'),
+        ),
+        migrations.RunPython(index_existing_churches, migrations.RunPython.noop),
+    ]
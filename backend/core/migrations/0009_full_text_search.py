@@ -0,0 +1,54 @@
+# Generated by Django 4.2.26 on 2026-10-18 15:40
+
+from django.db import migrations
+
+# Key of an index row: pk * 2 + 0 for announcements, pk * 2 + 1 for events
+# (see core.search.doc_id).
+SQLITE = [
+    "CREATE VIRTUAL TABLE core_search USING fts5("
+    "church, kind, title, body, tokenize = 'porter unicode61 remove_diacritics 2')",
+    "INSERT INTO core_search (rowid, church, kind, title, body) "
+    "SELECT id * 2, church_id, 'announcement', title, body FROM core_announcement",
+    "INSERT INTO core_search (rowid, church, kind, title, body) "
+    "SELECT id * 2 + 1, church_id, 'event', title, location FROM core_event",
+]
+
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('english', title), 'A') || setweight(to_tsvector('english', {body}), 'B')"
+)
+
+POSTGRES = [
+    "CREATE TABLE core_search ("
+    "id bigint PRIMARY KEY, church_id bigint NOT NULL, kind varchar(20) NOT NULL, "
+    "title text NOT NULL, body text NOT NULL, document tsvector NOT NULL)",
+    "CREATE INDEX core_search_document ON core_search USING GIN (document)",
+    "CREATE INDEX core_search_church ON core_search (church_id)",
+    "INSERT INTO core_search (id, church_id, kind, title, body, document) "
+    "SELECT id * 2, church_id, 'announcement', title, body, "
+    + POSTGRES_VECTOR.format(body="body") + " FROM core_announcement",
+    "INSERT INTO core_search (id, church_id, kind, title, body, document) "
+    "SELECT id * 2 + 1, church_id, 'event', title, location, "
+    + POSTGRES_VECTOR.format(body="location") + " FROM core_event",
+]
+
+
+def create_search_index(apps, schema_editor):
+    statements = {"sqlite": SQLITE, "postgresql": POSTGRES}.get(schema_editor.connection.vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute("DROP TABLE IF EXISTS core_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_event_recurrence'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
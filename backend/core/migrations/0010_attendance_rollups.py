@@ -0,0 +1,90 @@
+# Generated by Django 4.2.26 on 2026-10-18 15:25
+
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, DateField, F, Min
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def backfill_rollups(apps, schema_editor):
+    Attendance = apps.get_model("core", "Attendance")
+    ChurchWeeklyAttendance = apps.get_model("core", "ChurchWeeklyAttendance")
+    MemberMonthlyAttendance = apps.get_model("core", "MemberMonthlyAttendance")
+
+    attendance = Attendance.objects.order_by()
+    church = F("event__church_id")
+
+    first_timers = Counter()
+    for row in attendance.values("user_id", church=church).annotate(first=Min("timestamp")).iterator():
+        day = timezone.localdate(row["first"])
+        first_timers[row["church"], day - timedelta(days=day.weekday())] += 1
+
+    weekly = attendance.values(church=church, week=TruncWeek("timestamp", output_field=DateField()))
+    ChurchWeeklyAttendance.objects.bulk_create(
+        (
+            ChurchWeeklyAttendance(
+                church_id=row["church"], week=row["week"], check_ins=row["check_ins"],
+                first_timers=first_timers[row["church"], row["week"]],
+            )
+            for row in weekly.annotate(check_ins=Count("id")).iterator()
+        ),
+        batch_size=1000,
+    )
+
+    monthly = attendance.values("user_id", church=church, month=TruncMonth("timestamp", output_field=DateField()))
+    MemberMonthlyAttendance.objects.bulk_create(
+        (
+            MemberMonthlyAttendance(
+                church_id=row["church"], user_id=row["user_id"], month=row["month"], check_ins=row["check_ins"],
+            )
+            for row in monthly.annotate(check_ins=Count("id")).iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_full_text_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChurchWeeklyAttendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week', models.DateField()),
+                ('check_ins', models.IntegerField(default=0)),
+                ('first_timers', models.IntegerField(default=0)),
+                ('church', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='weekly_attendance', to='core.church')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MemberMonthlyAttendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('check_ins', models.IntegerField(default=0)),
+                ('church', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='member_attendance', to='core.church')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_attendance', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['church', 'month'], name='member_month_church')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='membermonthlyattendance',
+            constraint=models.UniqueConstraint(fields=('church', 'user', 'month'), name='member_month_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='churchweeklyattendance',
+            constraint=models.UniqueConstraint(fields=('church', 'week'), name='church_week_unique'),
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
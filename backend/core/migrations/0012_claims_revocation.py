@@ -0,0 +1,20 @@
+# Generated by Django 4.2.26 on 2026-10-18 16:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_checkin_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClaimsRevocation',
+            fields=[
+                ('user_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('revoked_at', models.DateTimeField()),
+            ],
+        ),
+    ]
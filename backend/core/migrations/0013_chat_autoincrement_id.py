@@ -0,0 +1,31 @@
+# Generated by Django 4.2.26 on 2026-10-18 16:21
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def drop_id_allocator(apps, schema_editor):
+    # ids came from this ChangeVersion row before the column autoincremented
+    apps.get_model("core", "ChangeVersion").objects.filter(key="chat:ids").delete()
+
+
+def restore_id_allocator(apps, schema_editor):
+    last = apps.get_model("core", "ChatMessage").objects.aggregate(last=Max("id"))["last"]
+    if last:
+        apps.get_model("core", "ChangeVersion").objects.update_or_create(key="chat:ids", defaults={"version": last})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_claims_revocation'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='chatmessage',
+            name='id',
+            field=models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.RunPython(drop_id_allocator, restore_id_allocator),
+    ]
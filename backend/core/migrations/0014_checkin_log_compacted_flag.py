@@ -0,0 +1,48 @@
+# Generated by Django 4.2.26 on 2026-10-18 16:22
+
+from django.db import migrations, models
+from django.db.models import Max, Min
+
+WATERMARK_KEY = "checkin-log:compacted"
+
+
+def flag_compacted(apps, schema_editor):
+    # the old high-water mark: every entry up to it has been compacted
+    ChangeVersion = apps.get_model("core", "ChangeVersion")
+    mark = ChangeVersion.objects.filter(key=WATERMARK_KEY).values_list("version", flat=True).first() or 0
+    apps.get_model("core", "CheckInLog").objects.filter(id__lte=mark).update(compacted=True)
+    ChangeVersion.objects.filter(key=WATERMARK_KEY).delete()
+
+
+def restore_watermark(apps, schema_editor):
+    CheckInLog = apps.get_model("core", "CheckInLog")
+    first = CheckInLog.objects.filter(compacted=False).aggregate(first=Min("id"))["first"]
+    mark = first - 1 if first else CheckInLog.objects.aggregate(last=Max("id"))["last"] or 0
+    apps.get_model("core", "ChangeVersion").objects.update_or_create(key=WATERMARK_KEY, defaults={"version": mark})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_chat_autoincrement_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CheckInCompaction',
+            fields=[
+                ('id', models.PositiveSmallIntegerField(default=1, primary_key=True, serialize=False)),
+                ('compacted_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='checkinlog',
+            name='compacted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(flag_compacted, restore_watermark),
+        migrations.AddIndex(
+            model_name='checkinlog',
+            index=models.Index(condition=models.Q(('compacted', False)), fields=['id'], name='checkinlog_uncompacted'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.26 on 2026-10-18 16:41
+
+from django.db import migrations, models
+
+
+def start_epochs(apps, schema_editor):
+    # tokens minted before this carry no epoch (read as 0): keep them revoked
+    apps.get_model("core", "ClaimsRevocation").objects.update(epoch=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_checkin_log_compacted_flag'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='claimsrevocation',
+            name='epoch',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(start_epochs, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
-from django.db import models
+from django.db import models, router, transaction
+from django.utils import timezone
 
 
 # ======================================================
@@ -52,10 +53,34 @@ class Church(models.Model):
     denomination = models.CharField(max_length=100, blank=True, null=True)
     size = models.IntegerField(blank=True, null=True)  # optional
 
+    class Meta:
+        indexes = [
+            # directory listing / keyset pagination by (name, id)
+            models.Index(fields=["name", "id"], name="church_name"),
+        ]
+
     def __str__(self):
         return self.name
 
 
+class ChurchTrigram(models.Model):
+    """
+    Search index for the public church directory: every 3-character slice of
+    the church's lowercased name/location/denomination (see core.directory).
+    """
+
+    church = models.ForeignKey(Church, on_delete=models.CASCADE, related_name="trigrams")
+    trigram = models.CharField(max_length=3)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["trigram", "church"], name="church_trigram_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.trigram!r} → {self.church_id}"
+
+
 # ======================================================
 # MEMBERSHIP MODEL — User belongs to a Church with a Role
 # ======================================================
@@ -92,6 +117,12 @@ class Announcement(models.Model):
     created_by = models.ForeignKey("core.User", on_delete=models.SET_NULL, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # keyset pagination: church's announcements by (created_at, id)
+            models.Index(fields=["church", "created_at", "id"], name="announcement_church_created"),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.church.name})"
 
@@ -111,6 +142,29 @@ class Event(models.Model):
 
     created_by = models.ForeignKey("core.User", on_delete=models.SET_NULL, null=True)
 
+    # Recurring events are one row (the first occurrence + a rule); the
+    # occurrences are generated per requested window (see core.recurrence).
+    RECURRENCE_CHOICES = [
+        ("", "Does not repeat"),
+        ("weekly", "Weekly"),
+        ("monthly", "Monthly"),
+    ]
+
+    recurrence = models.CharField(max_length=10, choices=RECURRENCE_CHOICES, blank=True, default="")
+    recurrence_interval = models.PositiveSmallIntegerField(default=1)  # every N weeks / months
+    recurrence_until = models.DateTimeField(blank=True, null=True)  # last possible start; null = forever
+    recurrence_exceptions = models.JSONField(blank=True, default=list)  # skipped dates, "YYYY-MM-DD"
+
+    class Meta:
+        indexes = [
+            # keyset pagination: church's events by (starts_at, id)
+            models.Index(fields=["church", "starts_at", "id"], name="event_church_starts"),
+            # ?mine=1
+            models.Index(fields=["church", "created_by"], name="event_church_creator"),
+            # ?from=&to=: one-off events by end (recurrence = ""), rules by kind
+            models.Index(fields=["church", "recurrence", "ends_at"], name="event_church_rule_ends"),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.church.name})"
 
@@ -131,10 +185,219 @@ class Attendance(models.Model):
         ]
     )
 
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # set on creation like auto_now_add, but keeps an explicit value: rows
+    # compacted from the check-in log carry the time of the check-in
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # remembered so counters can tell an in→out flip from a no-op save
+        instance._loaded_status = dict(zip(field_names, values)).get("status")
+        return instance
+
+    def save(self, *args, **kwargs):
+        # post_save updates the event's counter, the rollups and its version:
+        # one transaction with the row, even when the caller has none open
+        with transaction.atomic(using=kwargs.get("using") or router.db_for_write(type(self), instance=self)):
+            super().save(*args, **kwargs)
 
     class Meta:
         ordering = ["-timestamp"]
+        constraints = [
+            # one row per (event, user); also the index update_or_create looks up by
+            models.UniqueConstraint(fields=["event", "user"], name="attendance_event_user_unique"),
+        ]
+        indexes = [
+            # leader attendance list (newest first)
+            models.Index(fields=["event", "-timestamp"], name="attendance_event_timestamp"),
+        ]
 
     def __str__(self):
         return f"{self.user.email} → {self.event.title} ({self.status})"
+
+
+# ======================================================
+# CHECK-IN LOG — append-only history, compacted into Attendance
+# ======================================================
+
+class CheckInLog(models.Model):
+    """
+    Every check-in/out as it happened (settings.CHECKIN_LOG). INSERTed
+    without FK constraints; core.checkins compacts it into Attendance and
+    flags the rows it folded, so the only index covers the uncompacted tail.
+    """
+
+    STATUS_CODES = {"in": 1, "out": 2}
+    STATUSES = {code: status for status, code in STATUS_CODES.items()}
+
+    id = models.BigAutoField(primary_key=True)
+    event = models.ForeignKey(
+        Event, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name="+"
+    )
+    user = models.ForeignKey(
+        "core.User", on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name="+"
+    )
+    status = models.PositiveSmallIntegerField(choices=[(1, "Checked In"), (2, "Checked Out")])
+    at = models.DateTimeField()
+    compacted = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            # pending() / compact(): WHERE NOT compacted ORDER BY id
+            models.Index(fields=["id"], condition=models.Q(compacted=False), name="checkinlog_uncompacted"),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} user {self.user_id} → event {self.event_id} ({self.STATUSES[self.status]})"
+
+
+class CheckInCompaction(models.Model):
+    """
+    One row: compactors lock it (SELECT ... FOR UPDATE) to take turns, and
+    note when they last folded entries into Attendance.
+    """
+
+    id = models.PositiveSmallIntegerField(primary_key=True, default=1)
+    compacted_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"check-in log compacted at {self.compacted_at}"
+
+
+# ======================================================
+# ATTENDANCE COUNTERS — denormalized per-event totals
+# ======================================================
+
+class EventAttendanceCounter(models.Model):
+    """
+    Maintained on every Attendance write (see core.counters / core.signals).
+    Repair with `manage.py rebuild_attendance_counters`.
+    """
+
+    event = models.OneToOneField(
+        Event, on_delete=models.CASCADE, primary_key=True, related_name="attendance_counter"
+    )
+
+    checked_in = models.IntegerField(default=0)
+    checked_out = models.IntegerField(default=0)
+    total = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.event.title}: {self.checked_in} in / {self.checked_out} out"
+
+
+# ======================================================
+# ATTENDANCE ROLLUPS — analytics without scanning Attendance
+# ======================================================
+
+class ChurchWeeklyAttendance(models.Model):
+    """
+    Check-ins and first-time visitors per church per week (starting Monday,
+    local time), by check-in time. Maintained on every Attendance write
+    (see core.analytics); backfill with `manage.py backfill_analytics`.
+    """
+
+    church = models.ForeignKey(Church, on_delete=models.CASCADE, related_name="weekly_attendance")
+    week = models.DateField()
+
+    check_ins = models.IntegerField(default=0)
+    first_timers = models.IntegerField(default=0)  # members whose first check-in here was this week
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["church", "week"], name="church_week_unique"),
+        ]
+
+    def __str__(self):
+        return f"church {self.church_id}, week of {self.week}: {self.check_ins}"
+
+
+class MemberMonthlyAttendance(models.Model):
+    """
+    Check-ins per member per church per month (first day of the month).
+    A row exists only for months with at least one check-in.
+    """
+
+    church = models.ForeignKey(Church, on_delete=models.CASCADE, related_name="member_attendance")
+    user = models.ForeignKey("core.User", on_delete=models.CASCADE, related_name="monthly_attendance")
+    month = models.DateField()
+
+    check_ins = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # also answers "has this member checked in here before?"
+            models.UniqueConstraint(fields=["church", "user", "month"], name="member_month_unique"),
+        ]
+        indexes = [
+            # analytics: a church's members over a range of months
+            models.Index(fields=["church", "month"], name="member_month_church"),
+        ]
+
+    def __str__(self):
+        return f"user {self.user_id} @ church {self.church_id}, {self.month:%Y-%m}: {self.check_ins}"
+
+
+# ======================================================
+# CHANGE VERSIONS — drive ETag / Last-Modified
+# ======================================================
+
+class ChangeVersion(models.Model):
+    """
+    Monotonic version per scope, bumped by signals on every write.
+    Keys: "church:<id>" (announcements, events), "attendance:<event id>",
+    "churches".
+    """
+
+    key = models.CharField(max_length=64, primary_key=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.key} v{self.version}"
+
+
+# ======================================================
+# TOKEN CLAIM REVOCATIONS — shared by every worker
+# ======================================================
+
+class ClaimsRevocation(models.Model):
+    """
+    Access tokens of `user_id` whose claims_epoch is below `epoch` are
+    rejected (core.authentication); every revocation adds one. Not a
+    foreign key: a deleted user's tokens must stay revoked.
+    """
+
+    user_id = models.BigIntegerField(primary_key=True)
+    epoch = models.PositiveIntegerField(default=0)
+    revoked_at = models.DateTimeField()  # last revocation
+
+    def __str__(self):
+        return f"user {self.user_id} at epoch {self.epoch} (revoked at {self.revoked_at})"
+
+
+# ======================================================
+# COMMUNITY CHAT (church-scoped)
+# ======================================================
+
+class ChatMessage(models.Model):
+    """
+    Written in batches by core.chat; a message is broadcast once its row
+    (and so its id) exists.
+    """
+
+    church = models.ForeignKey(Church, on_delete=models.CASCADE, related_name="chat_messages")
+    user = models.ForeignKey("core.User", on_delete=models.SET_NULL, null=True)
+
+    body = models.TextField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # history: WHERE church = ? AND id < ? ORDER BY id DESC
+            models.Index(fields=["church", "id"], name="chat_church_id"),
+        ]
+
+    def __str__(self):
+        return f"{self.church_id}#{self.id}"
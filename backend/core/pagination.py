@@ -0,0 +1,169 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import DateTimeField, Q
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+# ======================================================
+# KEYSET (CURSOR) PAGINATION
+# ======================================================
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination over a (field, id) pair.
+
+    Opt-in: only active when the request carries `?cursor=` (empty for the
+    first page), otherwise the view returns its plain, unpaginated list.
+    Each page is a single indexed range scan `WHERE (field, id) > cursor`,
+    so its cost does not grow with how deep the client has scrolled.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = 20
+    max_page_size = 100
+    invalid_cursor_message = "Invalid cursor"
+
+    # ("-created_at", "-id") → newest first. The last field must be unique.
+    ordering = ("-id",)
+
+    def is_active(self, request):
+        return self.cursor_query_param in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_active(request):
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.after(position))
+
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    # ------------------------------------------------------
+    # cursor helpers
+    # ------------------------------------------------------
+
+    def _fields(self):
+        return [(f.lstrip("-"), f.startswith("-")) for f in self.ordering]
+
+    def after(self, position):
+        """
+        Row-value comparison `(a, b) > (x, y)` spelled out as
+        `a > x OR (a = x AND b > y)` so every backend can use the index.
+        """
+        fields = self._fields()
+        condition = Q()
+        for i, (name, descending) in enumerate(fields):
+            lookup = "lt" if descending else "gt"
+            term = Q(**{f"{name}__{lookup}": position[i]})
+            for j, (prev_name, _) in enumerate(fields[:i]):
+                term &= Q(**{prev_name: position[j]})
+            condition |= term
+        return condition
+
+    def encode_cursor(self, row):
+        values = []
+        for name, _ in self._fields():
+            # model instances, or values() dicts (core.read_serializers)
+            value = row[name] if isinstance(row, dict) else getattr(row, name)
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+
+        raw = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, request, model):
+        """
+        Cursor values, each converted by its model field. Anything that
+        does not decode or convert (a tampered cursor) is a 404, never a 500.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        position = []
+        for (name, _), value in zip(self._fields(), values):
+            field = model._meta.get_field(name)
+            try:
+                if value is None or isinstance(value, (dict, list)):
+                    raise ValidationError("not a scalar")
+                value = field.to_python(value)
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+            if isinstance(field, DateTimeField) and timezone.is_naive(value):
+                value = timezone.make_aware(value)
+            position.append(value)
+        return position
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+        return url
+
+
+class AnnouncementCursorPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
+class EventCursorPagination(KeysetPagination):
+    ordering = ("starts_at", "id")
+
+
+class ChurchDirectoryPagination(KeysetPagination):
+    """
+    Search results (?q=) are always paginated; the bare list stays opt-in.
+    """
+
+    ordering = ("name", "id")
+
+    def is_active(self, request):
+        return super().is_active(request) or "q" in request.query_params
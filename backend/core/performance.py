@@ -0,0 +1,283 @@
+import cProfile
+import io
+import json
+import logging
+import pstats
+import random
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger("core.performance")
+
+# metrics of the request being handled; contextvars follow the request
+# into sync_to_async threads, so async views are measured too
+_current = ContextVar("core_request_metrics", default=None)
+_serializing = ContextVar("core_serializing", default=False)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.statements = Counter()
+        self.lock = threading.Lock()
+
+    def repeated(self, threshold):
+        """The same SQL run `threshold`+ times with different params: N+1."""
+        return [
+            {"sql": sql[:200], "count": count}
+            for sql, count in self.statements.most_common(3)
+            if count >= threshold
+        ]
+
+
+# ======================================================
+# HOOKS — SQL and serializer timing
+# ======================================================
+
+def record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - start
+        with metrics.lock:
+            metrics.queries += 1
+            metrics.db_seconds += elapsed
+            metrics.statements[sql] += 1
+
+
+def _install_on_connection(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+_original_data = BaseSerializer.data
+
+
+def _timed_data(self):
+    metrics = _current.get()
+    # only the outermost .data; nested serializers are part of it
+    if metrics is None or _serializing.get():
+        return _original_data.fget(self)
+
+    token = _serializing.set(True)
+    start = time.perf_counter()
+    try:
+        return _original_data.fget(self)
+    finally:
+        metrics.serialize_seconds += time.perf_counter() - start
+        _serializing.reset(token)
+
+
+_installed = False
+
+
+def install():
+    """Idempotent: hook every DB connection and DRF serializer .data."""
+    global _installed
+    if _installed:
+        return
+
+    connection_created.connect(_install_on_connection, dispatch_uid="core.performance")
+    for connection in connections.all(initialized_only=True):
+        _install_on_connection(connection)
+
+    BaseSerializer.data = property(_timed_data)
+    _installed = True
+
+
+# ======================================================
+# PROFILER HOOK
+# ======================================================
+
+class CProfiler:
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def report(self, limit):
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    def save(self, path):
+        self.profile.dump_stats(path.with_suffix(".prof"))
+
+
+class PyinstrumentProfiler:
+    def __init__(self):
+        from pyinstrument import Profiler
+
+        self.profiler = Profiler(async_mode="enabled")
+
+    def start(self):
+        self.profiler.start()
+
+    def stop(self):
+        self.profiler.stop()
+
+    def report(self, limit):
+        return self.profiler.output_text(show_all=False)
+
+    def save(self, path):
+        path.with_suffix(".html").write_text(self.profiler.output_html())
+
+
+PROFILERS = {"cprofile": CProfiler, "pyinstrument": PyinstrumentProfiler}
+
+# only one profiler can hook the interpreter at a time
+_profile_lock = threading.Lock()
+
+
+# ======================================================
+# MIDDLEWARE
+# ======================================================
+
+class PerformanceMiddleware:
+    """
+    Per request: SQL count and time, serializer time and total time, as a
+    Server-Timing header and one JSON log line on "core.performance".
+    Requests over PERF_QUERY_BUDGET, or running one statement
+    PERF_REPEATED_QUERY_THRESHOLD+ times (N+1), log at WARNING.
+
+    With PERF_PROFILE_SAMPLE_RATE > 0 a sample of requests is profiled and
+    the top frames are logged when a request takes PERF_PROFILE_SLOW_MS+.
+
+    Off unless settings.PERF_INSTRUMENTATION. Keep it first in MIDDLEWARE.
+    For streaming responses the timings stop when the stream starts.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PERF_INSTRUMENTATION", False):
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+        self.query_budget = getattr(settings, "PERF_QUERY_BUDGET", 20)
+        self.repeat_threshold = getattr(settings, "PERF_REPEATED_QUERY_THRESHOLD", 5)
+        self.sample_rate = getattr(settings, "PERF_PROFILE_SAMPLE_RATE", 0.0)
+        self.slow_ms = getattr(settings, "PERF_PROFILE_SLOW_MS", 500)
+        self.profile_dir = getattr(settings, "PERF_PROFILE_DIR", None)
+        self.profile_limit = getattr(settings, "PERF_PROFILE_TOP_FRAMES", 25)
+
+        name = getattr(settings, "PERF_PROFILER", "cprofile")
+        if name not in PROFILERS:
+            raise ImproperlyConfigured(f"PERF_PROFILER must be one of {sorted(PROFILERS)}")
+        if name == "pyinstrument" and self.sample_rate:
+            try:
+                import pyinstrument  # noqa: F401
+            except ImportError:
+                raise ImproperlyConfigured("PERF_PROFILER = 'pyinstrument' requires the pyinstrument package")
+        self.profiler_class = PROFILERS[name]
+
+        install()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        metrics, token, profiler = self.begin()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, profiler)
+
+    async def __acall__(self, request):
+        metrics, token, profiler = self.begin()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, profiler)
+
+    # ---------------------------------------------------
+
+    def begin(self):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+
+        profiler = None
+        if self.sample_rate and random.random() < self.sample_rate and _profile_lock.acquire(blocking=False):
+            profiler = self.profiler_class()
+            profiler.start()
+        return metrics, token, profiler
+
+    def finish(self, request, response, metrics, profiler):
+        total_ms = (time.perf_counter() - metrics.started) * 1000
+        if profiler is not None:
+            profiler.stop()
+            _profile_lock.release()
+
+        db_ms = metrics.db_seconds * 1000
+        serialize_ms = metrics.serialize_seconds * 1000
+        repeated = metrics.repeated(self.repeat_threshold)
+        over_budget = metrics.queries > self.query_budget
+
+        response["Server-Timing"] = ", ".join([
+            f'db;dur={db_ms:.1f};desc="{metrics.queries} queries"',
+            f"serialize;dur={serialize_ms:.1f}",
+            f"total;dur={total_ms:.1f}",
+        ])
+        response["Timing-Allow-Origin"] = "*"
+
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(total_ms, 2),
+            "db_ms": round(db_ms, 2),
+            "queries": metrics.queries,
+            "serialize_ms": round(serialize_ms, 2),
+        }
+        if over_budget:
+            record["query_budget"] = self.query_budget
+        if repeated:
+            record["repeated_queries"] = repeated
+
+        level = logging.WARNING if over_budget or repeated else logging.INFO
+        logger.log(level, json.dumps(record))
+
+        if profiler is not None and total_ms >= self.slow_ms:
+            self.dump_profile(request, profiler, total_ms)
+
+        return response
+
+    def dump_profile(self, request, profiler, total_ms):
+        logger.warning(
+            "slow request %s %s took %.0fms — top frames:\n%s",
+            request.method, request.path, total_ms, profiler.report(self.profile_limit),
+        )
+        if self.profile_dir:
+            name = f"{int(time.time() * 1000)}-{request.method}-{request.path.strip('/').replace('/', '_') or 'root'}"
+            directory = Path(self.profile_dir)
+            directory.mkdir(parents=True, exist_ok=True)
+            profiler.save(directory / name)
@@ -1,8 +1,5 @@
-from django.db.models.functions import Lower
 from rest_framework.permissions import BasePermission, SAFE_METHODS
-from .models import Membership
-
-LEADER_ROLES = ("pastor", "deacon")
+from .membership import aget_membership, get_membership
 
 
 class LeadersOnly(BasePermission):
@@ -18,14 +15,10 @@ class LeadersOnly(BasePermission):
         Helper method that pulls the user's membership.
         If obj is provided, restrict to that object's church.
         """
-        qs = Membership.objects.annotate(role_lower=Lower("role")).filter(
-            user=request.user
-        )
-
         if obj is not None:
-            qs = qs.filter(church=obj.church)
+            return get_membership(request, church_id=obj.church_id)
 
-        return qs.first()
+        return get_membership(request)
 
     def has_permission(self, request, view):
         # Must be logged in
@@ -38,7 +31,7 @@ class LeadersOnly(BasePermission):
 
         # WRITE: must be a leader
         membership = self._get_membership(request)
-        return membership and membership.role.lower() in LEADER_ROLES
+        return bool(membership and membership.is_leader)
 
     def has_object_permission(self, request, view, obj):
         # SAFE methods allowed always
@@ -46,4 +39,23 @@ class LeadersOnly(BasePermission):
             return True
 
         membership = self._get_membership(request, obj=obj)
-        return membership and membership.role.lower() in LEADER_ROLES
+        return bool(membership and membership.is_leader)
+
+    # async function views (core.views.async_api_view): same rules,
+    # membership via aget_membership()
+
+    async def ahas_permission(self, request, view):
+        if not request.user.is_authenticated:
+            return False
+        if request.method in SAFE_METHODS:
+            return True
+
+        membership = await aget_membership(request)
+        return bool(membership and membership.is_leader)
+
+    async def ahas_object_permission(self, request, view, obj):
+        if request.method in SAFE_METHODS:
+            return True
+
+        membership = await aget_membership(request, church_id=obj.church_id)
+        return bool(membership and membership.is_leader)
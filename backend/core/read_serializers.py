@@ -0,0 +1,201 @@
+import functools
+
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.response import Response
+
+_drf_datetime = serializers.DateTimeField().to_representation
+
+
+def datetime_value(value, tz):
+    """
+    DateTimeField.to_representation for the default ISO-8601 format, in
+    the time zone many() resolved once for the whole list; "Z" for UTC.
+    Naive values go through DRF itself.
+    """
+    if value.tzinfo is None:
+        return _drf_datetime(value)
+    text = value.astimezone(tz).isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+# ======================================================
+# VALUES SERIALIZERS — read-only fast path for large lists
+# ======================================================
+
+def _expression(plan, converters):
+    """Source of a dict display building one object of `plan` from `row`."""
+    items = []
+    for name, index, convert, nested in plan:
+        value = f"row[{index}]"
+        if nested is not None:
+            value = f"None if {value} is None else {_expression(nested, converters)}"
+        elif convert is not None:
+            converters.append(convert)
+            value = f"None if {value} is None else convert{len(converters) - 1}({value}, tz)"
+        items.append(f"{name!r}: {value}")
+    return "{" + ", ".join(items) + "}"
+
+
+def compile_builder(plan):
+    """
+    One function per plan, row → dict, generated like namedtuple's
+    methods: a single dict display instead of a loop over fields.
+    """
+    converters = []
+    source = f"def build(row, tz):\n    return {_expression(plan, converters)}\n"
+    namespace = {f"convert{i}": convert for i, convert in enumerate(converters)}
+    exec(source, namespace)
+    return namespace["build"]
+
+
+class ValuesSerializer:
+    """
+    Read-only twin of a ModelSerializer for list responses: rows are
+    values_list(*columns) tuples and become dicts through a builder
+    compiled once per class from its plan (output name, tuple index,
+    converter), with no per-row Field objects. Renders to the same JSON
+    bytes as the serializer it mirrors.
+
+    `fields` entries, in output order:
+      (name, column)                       value as stored
+      (name, column, convert)              convert(value, tz) unless None
+      (name, ValuesSerializer, relation)   nested object, None without one
+    """
+
+    fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.columns = cls.compile_columns()
+        cls.plan = cls.compile_plan(cls.columns)
+        cls.build = staticmethod(compile_builder(cls.plan))
+
+    @classmethod
+    def compile_columns(cls, prefix=""):
+        columns = []
+        for _, source, *rest in cls.fields:
+            if _is_nested(source):
+                columns += source.compile_columns(f"{prefix}{rest[0]}__")
+            else:
+                columns.append(prefix + source)
+        return list(dict.fromkeys(columns))
+
+    @classmethod
+    def compile_plan(cls, columns, prefix=""):
+        plan = []
+        for name, source, *rest in cls.fields:
+            if _is_nested(source):
+                relation = f"{prefix}{rest[0]}__"
+                # the related row's id decides between an object and None
+                plan.append((name, columns.index(relation + "id"), None, source.compile_plan(columns, relation)))
+            else:
+                plan.append((name, columns.index(prefix + source), rest[0] if rest else None, None))
+        return tuple(plan)
+
+    @classmethod
+    def subset(cls, fields, expand=()):
+        """
+        Twin with only `fields` (core.sparse): nested entries not in
+        `expand` become the related id, as PrimaryKeyRelatedField renders it.
+        """
+        return _subset(cls, tuple(fields), tuple(expand))
+
+    @classmethod
+    def values(cls, queryset):
+        return queryset.values_list(*cls.columns)
+
+    @classmethod
+    def many(cls, rows):
+        build = cls.build
+        tz = timezone.get_current_timezone()
+        return [build(row, tz) for row in rows]
+
+
+def _is_nested(source):
+    return isinstance(source, type) and issubclass(source, ValuesSerializer)
+
+
+@functools.lru_cache(maxsize=256)
+def _subset(cls, fields, expand):
+    entries = []
+    for name, source, *rest in cls.fields:
+        if name not in fields and name not in expand:
+            continue
+        if _is_nested(source) and name not in expand:
+            entries.append((name, f"{rest[0]}_id"))
+        else:
+            entries.append((name, source, *rest))
+    return type(cls.__name__, (cls,), {"fields": tuple(entries)})
+
+
+class UserValuesSerializer(ValuesSerializer):
+    fields = (("id", "id"), ("email", "email"), ("full_name", "full_name"))
+
+
+class AnnouncementValuesSerializer(ValuesSerializer):
+    """Mirrors AnnouncementSerializer."""
+
+    fields = (
+        ("id", "id"),
+        ("church", "church_id"),
+        ("title", "title"),
+        ("body", "body"),
+        ("created_by", UserValuesSerializer, "created_by"),
+        ("created_at", "created_at", datetime_value),
+    )
+
+
+class EventValuesSerializer(ValuesSerializer):
+    """Mirrors EventSerializer."""
+
+    fields = (
+        ("id", "id"),
+        ("church", "church_id"),
+        ("title", "title"),
+        ("starts_at", "starts_at", datetime_value),
+        ("ends_at", "ends_at", datetime_value),
+        ("location", "location"),
+        ("created_by", UserValuesSerializer, "created_by"),
+        ("recurrence", "recurrence"),
+        ("recurrence_interval", "recurrence_interval"),
+        ("recurrence_until", "recurrence_until", datetime_value),
+        ("recurrence_exceptions", "recurrence_exceptions"),
+    )
+
+
+class AttendanceValuesSerializer(ValuesSerializer):
+    """Mirrors AttendanceSerializer."""
+
+    fields = (
+        ("id", "id"),
+        ("event", "event_id"),
+        ("user", UserValuesSerializer, "user"),
+        ("status", "status"),
+        ("timestamp", "timestamp", datetime_value),
+    )
+
+
+class ValuesListMixin:
+    """
+    list() through `values_serializer_class`: the same response as the
+    viewset's serializer_class, paginated or not, built from values() rows.
+    """
+
+    values_serializer_class = None
+
+    def get_values_serializer_class(self):
+        return self.values_serializer_class
+
+    def list(self, request, *args, **kwargs):
+        reader = self.get_values_serializer_class()
+        queryset = self.filter_queryset(self.get_queryset())
+
+        # the keyset paginator reads its cursor fields by name: dict rows,
+        # whose first values are in `columns` order
+        ordering = [name.lstrip("-") for name in getattr(self.paginator, "ordering", None) or ()]
+        columns = [*reader.columns, *(name for name in ordering if name not in reader.columns)]
+        page = self.paginate_queryset(queryset.values(*columns))
+        if page is not None:
+            return self.get_paginated_response(reader.many([list(row.values()) for row in page]))
+        return Response(reader.many(reader.values(queryset)))
@@ -0,0 +1,116 @@
+import copy
+import heapq
+from datetime import timedelta
+
+from django.db.models import DateTimeField, ExpressionWrapper, F, Q
+from django.utils import timezone
+
+# longest ?from=&to= window; bounds how many occurrences one request expands
+MAX_WINDOW = timedelta(days=366)
+
+
+# ======================================================
+# WINDOW QUERY — only rows that can overlap [start, end)
+# ======================================================
+
+def overlapping(queryset, start, end):
+    """
+    (one_off, rules): events with an occurrence that may overlap [start, end).
+    Two queries rather than one OR, so each is a range on
+    event_church_rule_ends instead of a pass over the church's past events;
+    expand() takes them chained.
+
+    One-off events: recurrence = "" AND ends_at > start AND starts_at < end.
+    Rules: recurrence IN (weekly, monthly), started before `end` and not
+    finished before `start`; the generator below drops the misses.
+    """
+    one_off = queryset.filter(recurrence="", ends_at__gt=start, starts_at__lt=end)
+
+    # end of the last possible occurrence: recurrence_until + duration
+    series_ends_at = ExpressionWrapper(
+        F("ends_at") + (F("recurrence_until") - F("starts_at")), output_field=DateTimeField()
+    )
+    rules = queryset.alias(series_ends_at=series_ends_at).filter(
+        Q(recurrence_until__isnull=True) | Q(series_ends_at__gt=start),
+        recurrence__in=["weekly", "monthly"],
+        starts_at__lt=end,
+    )
+    return one_off, rules
+
+
+# ======================================================
+# EXPANSION
+# ======================================================
+
+def _add_months(dt, months):
+    month = dt.month - 1 + months
+    # ValueError when the day doesn't exist (Jan 31 + 1 month): that month is skipped
+    return dt.replace(year=dt.year + month // 12, month=month % 12 + 1)
+
+
+def _nth(recurrence, first, interval, k):
+    if recurrence == "weekly":
+        return first + k * timedelta(weeks=interval)
+    return _add_months(first, k * interval)
+
+
+def occurrences(event, start, end):
+    """
+    Lazily yields (starts_at, ends_at) of `event` overlapping [start, end).
+
+    Repeats keep the wall-clock time of the first occurrence in the current
+    time zone, so a 10:00 service stays at 10:00 across DST changes.
+    Monthly rules skip months without that day (like RFC 5545).
+    """
+    duration = event.ends_at - event.starts_at
+
+    if not event.recurrence:
+        if event.starts_at < end and event.ends_at > start:
+            yield event.starts_at, event.ends_at
+        return
+
+    tz = timezone.get_current_timezone()
+    first = timezone.localtime(event.starts_at, tz).replace(tzinfo=None)
+    # first occurrence that could still be running at `start`
+    earliest = timezone.localtime(start, tz).replace(tzinfo=None) - duration
+    skipped = set(event.recurrence_exceptions or ())
+    interval = max(event.recurrence_interval, 1)
+
+    if event.recurrence == "weekly":
+        k = max(0, (earliest - first) // timedelta(weeks=interval) - 1)
+    else:
+        months = (earliest.year - first.year) * 12 + earliest.month - first.month
+        k = max(0, months // interval - 1)
+
+    while True:
+        try:
+            local = _nth(event.recurrence, first, interval, k)
+        except ValueError:
+            k += 1
+            continue
+        k += 1
+
+        occurrence = timezone.make_aware(local, tz)
+        if occurrence >= end or (event.recurrence_until and occurrence > event.recurrence_until):
+            return
+        if occurrence + duration > start and local.date().isoformat() not in skipped:
+            yield occurrence, occurrence + duration
+
+
+def _tagged(event, start, end):
+    for starts_at, ends_at in occurrences(event, start, end):
+        yield starts_at, event.id, ends_at, event
+
+
+def expand(events, start, end):
+    """
+    All occurrences of `events` in [start, end), ordered by start, as event
+    copies whose starts_at/ends_at are the occurrence's. Lazy: a merge of
+    one generator per event.
+    """
+    streams = [_tagged(event, start, end) for event in events]
+    for starts_at, _, ends_at, event in heapq.merge(*streams, key=lambda item: item[:2]):
+        occurrence = copy.copy(event)
+        occurrence.starts_at = starts_at
+        occurrence.ends_at = ends_at
+        yield occurrence
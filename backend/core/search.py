@@ -0,0 +1,266 @@
+import logging
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, router, transaction
+
+from .models import Announcement, Event
+
+logger = logging.getLogger(__name__)
+
+TABLE = "core_search"
+
+# One index row per object; its key is pk * len(KINDS) + kind position, so
+# an object's row is found by primary key / rowid rather than a scan.
+KINDS = {"announcement": 0, "event": 1}
+KIND_AT = {position: kind for kind, position in KINDS.items()}
+MODELS = {"announcement": Announcement, "event": Event}
+
+# title matches count ten times as much as body (event: location) matches
+TITLE_WEIGHT = 10.0
+
+MAX_TERMS = 8
+
+
+def kind_of(instance):
+    return "announcement" if isinstance(instance, Announcement) else "event"
+
+
+def doc_id(kind, pk):
+    return pk * len(KINDS) + KINDS[kind]
+
+
+def parse_doc_id(id_):
+    pk, position = divmod(id_, len(KINDS))
+    return KIND_AT[position], pk
+
+
+def document(instance):
+    kind = kind_of(instance)
+    body = instance.body if kind == "announcement" else instance.location
+    return doc_id(kind, instance.pk), instance.church_id, kind, instance.title, body or ""
+
+
+def terms(q):
+    """Words of `q`; every term is matched as a prefix, all must match."""
+    return re.findall(r"[^\W_]+", (q or "").lower())[:MAX_TERMS]
+
+
+# ======================================================
+# BACKENDS — SQLite FTS5 / Postgres tsvector + GIN
+# ======================================================
+
+class SQLiteIndex:
+    """
+    FTS5 table (church, kind, title, body). The church id and kind are
+    indexed tokens, so scoping is part of the MATCH and never a post-filter.
+    """
+
+    def create(self, cursor):
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+            "church, kind, title, body, tokenize = 'porter unicode61 remove_diacritics 2')"
+        )
+
+    def drop(self, cursor):
+        cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+    def populate(self, cursor):
+        cursor.execute(
+            f"INSERT INTO {TABLE} (rowid, church, kind, title, body) "
+            f"SELECT id * {len(KINDS)} + {KINDS['announcement']}, church_id, 'announcement', title, body "
+            "FROM core_announcement"
+        )
+        cursor.execute(
+            f"INSERT INTO {TABLE} (rowid, church, kind, title, body) "
+            f"SELECT id * {len(KINDS)} + {KINDS['event']}, church_id, 'event', title, location "
+            "FROM core_event"
+        )
+
+    def upsert(self, cursor, rows):
+        # FTS5 has no ON CONFLICT; rowid lookups keep both statements cheap
+        self.delete(cursor, [row[0] for row in rows])
+        cursor.executemany(
+            f"INSERT INTO {TABLE} (rowid, church, kind, title, body) VALUES (%s, %s, %s, %s, %s)",
+            [(id_, str(church_id), kind, title, body) for id_, church_id, kind, title, body in rows],
+        )
+
+    def delete(self, cursor, ids):
+        cursor.executemany(f"DELETE FROM {TABLE} WHERE rowid = %s", [(id_,) for id_ in ids])
+
+    def search(self, cursor, church_id, words, kinds, limit):
+        match = f'church:"{church_id}"'
+        if len(kinds) < len(KINDS):
+            match += " AND (" + " OR ".join(f'kind:"{kind}"' for kind in kinds) + ")"
+        match += " AND {title body}:(" + " ".join(f'"{word}"*' for word in words) + ")"
+
+        # bm25() is lower-is-better; negated so rank is higher-is-better like Postgres
+        cursor.execute(
+            f"SELECT rowid, -bm25({TABLE}, 0, 0, {TITLE_WEIGHT}, 1.0) AS rank, "
+            f"snippet({TABLE}, 3, '', '', '…', 24) "
+            f"FROM {TABLE} WHERE {TABLE} MATCH %s ORDER BY rank DESC LIMIT %s",
+            [match, limit],
+        )
+        return cursor.fetchall()
+
+
+class PostgresIndex:
+    """
+    Plain table with a weighted tsvector (title A, body B) under a GIN
+    index; church_id has its own B-tree so the planner can AND the two.
+    """
+
+    config = "english"
+
+    def create(self, cursor):
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {TABLE} ("
+            "id bigint PRIMARY KEY, church_id bigint NOT NULL, kind varchar(20) NOT NULL, "
+            "title text NOT NULL, body text NOT NULL, document tsvector NOT NULL)"
+        )
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {TABLE}_document ON {TABLE} USING GIN (document)")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {TABLE}_church ON {TABLE} (church_id)")
+
+    def drop(self, cursor):
+        cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+    def vector(self, title, body):
+        return (
+            f"setweight(to_tsvector('{self.config}', {title}), 'A') || "
+            f"setweight(to_tsvector('{self.config}', {body}), 'B')"
+        )
+
+    def populate(self, cursor):
+        for kind, table, body in (("announcement", "core_announcement", "body"), ("event", "core_event", "location")):
+            cursor.execute(
+                f"INSERT INTO {TABLE} (id, church_id, kind, title, body, document) "
+                f"SELECT id * {len(KINDS)} + {KINDS[kind]}, church_id, '{kind}', title, {body}, "
+                f"{self.vector('title', body)} FROM {table}"
+            )
+
+    def upsert(self, cursor, rows):
+        cursor.executemany(
+            f"INSERT INTO {TABLE} (id, church_id, kind, title, body, document) "
+            f"VALUES (%s, %s, %s, %s, %s, {self.vector('%s', '%s')}) "
+            "ON CONFLICT (id) DO UPDATE SET church_id = EXCLUDED.church_id, kind = EXCLUDED.kind, "
+            "title = EXCLUDED.title, body = EXCLUDED.body, document = EXCLUDED.document",
+            [(*row, row[3], row[4]) for row in rows],
+        )
+
+    def delete(self, cursor, ids):
+        cursor.execute(f"DELETE FROM {TABLE} WHERE id = ANY(%s)", [list(ids)])
+
+    def search(self, cursor, church_id, words, kinds, limit):
+        query = " & ".join(f"{word}:*" for word in words)
+        # ts_headline re-parses the text: only run it on the rows returned
+        cursor.execute(
+            f"SELECT id, rank, ts_headline('{self.config}', body, query, "
+            "'StartSel=\"\", StopSel=\"\", MaxWords=30, MinWords=12') "
+            "FROM ("
+            f"  SELECT id, body, query, ts_rank(document, query) AS rank "
+            f"  FROM {TABLE}, to_tsquery('{self.config}', %s) query "
+            "  WHERE church_id = %s AND kind = ANY(%s) AND document @@ query "
+            "  ORDER BY rank DESC LIMIT %s"
+            ") hits ORDER BY rank DESC",
+            [query, church_id, list(kinds), limit],
+        )
+        return cursor.fetchall()
+
+
+BACKENDS = {"sqlite": SQLiteIndex, "postgresql": PostgresIndex}
+
+
+def backend_for(connection):
+    try:
+        return BACKENDS[connection.vendor]()
+    except KeyError:
+        raise ImproperlyConfigured(f"Full-text search is not implemented for {connection.vendor}")
+
+
+_unindexed_vendors = set()
+
+
+def index_backend(connection):
+    """
+    backend_for() on the save path: None where search isn't implemented
+    (warned once per vendor), so saving an Event or Announcement never
+    fails over the index.
+    """
+    backend_class = BACKENDS.get(connection.vendor)
+    if backend_class is None:
+        if connection.vendor not in _unindexed_vendors:
+            _unindexed_vendors.add(connection.vendor)
+            logger.warning("Full-text search is not implemented for %s; not indexing", connection.vendor)
+        return None
+    return backend_class()
+
+
+# ======================================================
+# MAINTENANCE (signals + rebuild_search_index)
+# ======================================================
+
+def index_objects(instances, using=None):
+    connection = connections[using or router.db_for_write(Event)]
+    backend = index_backend(connection)
+    if backend is None:
+        return
+    with connection.cursor() as cursor:
+        backend.upsert(cursor, [document(instance) for instance in instances])
+
+
+def remove_objects(instances, using=None):
+    connection = connections[using or router.db_for_write(Event)]
+    backend = index_backend(connection)
+    if backend is None:
+        return
+    with connection.cursor() as cursor:
+        backend.delete(cursor, [doc_id(kind_of(i), i.pk) for i in instances])
+
+
+def rebuild_search_index(using=None):
+    """Drop, recreate and refill the index from the source tables."""
+    using = using or router.db_for_write(Event)
+    connection = connections[using]
+    backend = backend_for(connection)
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        backend.drop(cursor)
+        backend.create(cursor)
+        backend.populate(cursor)
+        cursor.execute(f"SELECT COUNT(*) FROM {TABLE}")
+        return cursor.fetchone()[0]
+
+
+# ======================================================
+# SEARCH
+# ======================================================
+
+def search(church_id, q, kinds=tuple(KINDS), limit=20):
+    """
+    Ranked hits for `q` within one church, best first, as dicts with the
+    source object under "object". Index rows whose object is gone (e.g.
+    removed by a raw delete) are dropped.
+    """
+    words = terms(q)
+    if not words or not kinds:
+        return []
+
+    connection = connections[router.db_for_read(Event)]
+    with connection.cursor() as cursor:
+        hits = backend_for(connection).search(cursor, church_id, words, kinds, limit)
+
+    hits = [(*parse_doc_id(id_), rank, snippet) for id_, rank, snippet in hits]
+
+    wanted = {}
+    for kind, pk, _, _ in hits:
+        wanted.setdefault(kind, []).append(pk)
+    objects = {
+        kind: MODELS[kind].objects.filter(church_id=church_id).select_related("created_by").in_bulk(pks)
+        for kind, pks in wanted.items()
+    }
+
+    return [
+        {"type": kind, "id": pk, "rank": rank, "snippet": snippet, "object": objects[kind][pk]}
+        for kind, pk, rank, snippet in hits
+        if pk in objects[kind]
+    ]
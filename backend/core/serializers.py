@@ -1,5 +1,10 @@
 from rest_framework import serializers
 from .models import User, Church, Membership, Announcement, Event, Attendance
+from .membership import get_membership
+from .counters import get_counter
+from . import checkins
+from .authentication import ChurchRefreshToken
+from .sparse import SparseFieldsSerializerMixin
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 
@@ -13,7 +18,7 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ["id", "email", "full_name"]
 
 
-class ChurchSerializer(serializers.ModelSerializer):
+class ChurchSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Church
         fields = ["id", "name", "location", "denomination", "size"]
@@ -32,7 +37,7 @@ class MembershipSerializer(serializers.ModelSerializer):
 # ANNOUNCEMENT SERIALIZER
 # ======================================================
 
-class AnnouncementSerializer(serializers.ModelSerializer):
+class AnnouncementSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True)
 
     class Meta:
@@ -41,16 +46,18 @@ class AnnouncementSerializer(serializers.ModelSerializer):
         read_only_fields = ["church", "created_by"]
 
     def create(self, validated_data):
-        user = self.context["request"].user
+        request = self.context["request"]
+        user = request.user
 
-        membership = Membership.objects.filter(user=user).first()
+        membership = get_membership(request)
         if not membership:
             raise serializers.ValidationError(
                 {"error": "You must belong to a church to create announcements."}
             )
 
-        validated_data["church"] = membership.church
-        validated_data["created_by"] = user
+        validated_data.pop("church", None)
+        validated_data["church_id"] = membership.church_id
+        validated_data["created_by_id"] = user.pk
 
         return super().create(validated_data)
 
@@ -59,8 +66,12 @@ class AnnouncementSerializer(serializers.ModelSerializer):
 # EVENT SERIALIZER
 # ======================================================
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True)
+    # skipped occurrences of a recurring event, by local date
+    recurrence_exceptions = serializers.ListField(
+        child=serializers.DateField(), required=False, max_length=500
+    )
 
     class Meta:
         model = Event
@@ -72,24 +83,82 @@ class EventSerializer(serializers.ModelSerializer):
             "ends_at",
             "location",
             "created_by",
+            "recurrence",
+            "recurrence_interval",
+            "recurrence_until",
+            "recurrence_exceptions",
         ]
         read_only_fields = ["church", "created_by"]
 
+    def validate_recurrence_exceptions(self, value):
+        return sorted({day.isoformat() for day in value})
+
+    def validate(self, attrs):
+        starts_at = attrs.get("starts_at", getattr(self.instance, "starts_at", None))
+        ends_at = attrs.get("ends_at", getattr(self.instance, "ends_at", None))
+        until = attrs.get("recurrence_until", getattr(self.instance, "recurrence_until", None))
+
+        if starts_at and ends_at and ends_at < starts_at:
+            raise serializers.ValidationError({"ends_at": "Must not be before starts_at."})
+        if starts_at and until and until < starts_at:
+            raise serializers.ValidationError({"recurrence_until": "Must not be before starts_at."})
+        if attrs.get("recurrence_interval") == 0:
+            raise serializers.ValidationError({"recurrence_interval": "Must be at least 1."})
+        return attrs
+
     def create(self, validated_data):
-        user = self.context["request"].user
+        request = self.context["request"]
+        user = request.user
 
-        membership = Membership.objects.filter(user=user).first()
+        membership = get_membership(request)
         if not membership:
             raise serializers.ValidationError(
                 {"error": "You must belong to a church to create an event."}
             )
 
-        validated_data["church"] = membership.church
-        validated_data["created_by"] = user
+        validated_data.pop("church", None)
+        validated_data["church_id"] = membership.church_id
+        validated_data["created_by_id"] = user.pk
 
         return super().create(validated_data)
 
 
+class DashboardEventSerializer(EventSerializer):
+    """
+    Event plus its attendance counts — use select_related("attendance_counter").
+    """
+
+    attendance = serializers.SerializerMethodField()
+
+    class Meta(EventSerializer.Meta):
+        fields = EventSerializer.Meta.fields + ["attendance"]
+
+    def get_attendance(self, obj):
+        counter = get_counter(obj)
+        return {
+            "checked_in": counter.checked_in,
+            "checked_out": counter.checked_out,
+            "total": counter.total,
+        }
+
+
+# ======================================================
+# SEARCH RESULT SERIALIZER (see core.search)
+# ======================================================
+
+class SearchResultSerializer(serializers.Serializer):
+    OBJECT_SERIALIZERS = {"announcement": AnnouncementSerializer, "event": EventSerializer}
+
+    type = serializers.CharField()
+    id = serializers.IntegerField()
+    rank = serializers.FloatField()
+    snippet = serializers.CharField()
+    object = serializers.SerializerMethodField()
+
+    def get_object(self, hit):
+        return self.OBJECT_SERIALIZERS[hit["type"]](hit["object"]).data
+
+
 # ======================================================
 # ATTENDANCE SERIALIZER
 # ======================================================
@@ -107,25 +176,30 @@ class AttendanceSerializer(serializers.ModelSerializer):
         event = validated_data["event"]
         status = validated_data.get("status", "in")
 
+        if checkins.log_enabled():
+            at = checkins.append(event.id, [user.pk], status)
+            return Attendance(event=event, user_id=user.pk, status=status, timestamp=at)
+
         attendance, created = Attendance.objects.update_or_create(
-            user=user,
+            user_id=user.pk,
             event=event,
             defaults={"status": status}
         )
         return attendance
 
 
-class EventAttendanceListSerializer(serializers.ModelSerializer):
-    attendances = AttendanceSerializer(many=True, read_only=True)
-    total_attendees = serializers.SerializerMethodField()
-
-    class Meta:
-        model = Event
-        fields = ["id", "title", "starts_at", "ends_at", "attendances", "total_attendees"]
+class BulkCheckInSerializer(serializers.Serializer):
+    """
+    Usher / kiosk payload: {"users": [12, "jane@example.com", ...], "status": "in"}.
+    Integers (or digit strings) are user ids, anything else is an email.
+    """
 
-    def get_total_attendees(self, obj):
-        return obj.attendances.count()
+    MAX_USERS = 1000
 
+    users = serializers.ListField(
+        child=serializers.CharField(), allow_empty=False, max_length=MAX_USERS
+    )
+    status = serializers.ChoiceField(choices=["in", "out"], default="in")
 
 
 # ======================================================
@@ -134,6 +208,7 @@ class EventAttendanceListSerializer(serializers.ModelSerializer):
 
 class EmailLoginTokenSerializer(TokenObtainPairSerializer):
     username_field = "email"
+    token_class = ChurchRefreshToken
 
     def validate(self, attrs):
         attrs["username"] = attrs.get("email")
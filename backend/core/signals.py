@@ -0,0 +1,188 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .analytics import record_check_ins, remove_check_in
+from .authentication import revoke_claims
+from .counters import apply_attendance_change
+from .db import configure_connection
+from .directory import index_church
+from .live import attendance_channel, attendance_delta, get_fanout
+from .membership import membership_cache
+from .search import index_objects, remove_objects
+from .models import Announcement, Attendance, Church, Event, EventAttendanceCounter, Membership, User
+from .versions import DIRECTORY_KEY, attendance_key, bump_version, church_key
+
+
+# ======================================================
+# DATABASE CONNECTIONS (SQLite pragmas)
+# ======================================================
+
+@receiver(connection_created)
+def configure_new_connection(sender, connection, **kwargs):
+    configure_connection(connection)
+
+
+# ======================================================
+# MEMBERSHIP CACHE INVALIDATION
+# ======================================================
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def invalidate_membership_cache(sender, instance, **kwargs):
+    membership_cache.invalidate(instance.user_id)
+
+
+# ======================================================
+# JWT CLAIM REVOCATION (church / role live in access tokens)
+# ======================================================
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def revoke_membership_claims(sender, instance, **kwargs):
+    revoke_claims(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def revoke_inactive_user_claims(sender, instance, created, **kwargs):
+    if not created and not instance.is_active:
+        revoke_claims(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user_claims(sender, instance, **kwargs):
+    revoke_claims(instance.pk)
+
+
+# ======================================================
+# ATTENDANCE FOLLOW-UPS (counters, rollups, change versions)
+# ======================================================
+
+@receiver(post_save, sender=Event)
+def create_attendance_counter(sender, instance, created, raw=False, **kwargs):
+    # every event has its counter row, so check-ins only ever UPDATE it
+    if created and not raw:
+        EventAttendanceCounter.objects.create(event=instance)
+
+
+@receiver(pre_save, sender=Attendance)
+def load_attendance_status(sender, instance, **kwargs):
+    # rows not read from the DB (fixtures, Attendance(pk=...).save()):
+    # look up the stored status so counters still move by delta
+    if instance.pk is not None and not hasattr(instance, "_loaded_status"):
+        instance._loaded_status = (
+            Attendance.objects.filter(pk=instance.pk).values_list("status", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Attendance)
+def attendance_saved(sender, instance, created, using, **kwargs):
+    old_status = None if created else getattr(instance, "_loaded_status", None)
+    instance._loaded_status = instance.status
+    if old_status == instance.status:
+        return  # re-saved as it was (update_or_create of a checked-in member)
+
+    visit = (instance.user_id, instance.timestamp)
+    # an in/out flip doesn't change the rollups; only new rows do
+    update_attendance_follow_ups(instance, old_status, instance.status, using, added=visit if created else None)
+
+
+@receiver(post_delete, sender=Attendance)
+def attendance_deleted(sender, instance, using, **kwargs):
+    old_status = getattr(instance, "_loaded_status", instance.status)
+    visit = (instance.user_id, instance.timestamp)
+    update_attendance_follow_ups(instance, old_status, None, using, removed=visit)
+
+
+def update_attendance_follow_ups(instance, old_status, new_status, using, added=None, removed=None):
+    """
+    Counters, rollups and the event's version for one Attendance write, as
+    F() updates in the write's own transaction (Attendance.save() and
+    delete() are atomic): they commit or roll back with the row.
+    """
+    apply_attendance_change(instance.event_id, old_status, new_status)
+    bump_version(attendance_key(instance.event_id))
+
+    church_id = event_church_id(instance, using)
+    if church_id is None:
+        return  # event already gone: nothing to roll up
+    if added:
+        record_check_ins(church_id, [added])
+    if removed:
+        remove_check_in(church_id, *removed)
+
+
+def event_church_id(instance, using):
+    if Attendance.event.is_cached(instance):
+        return instance.event.church_id
+    return Event.objects.using(using).filter(pk=instance.event_id).values_list("church_id", flat=True).first()
+
+
+# ======================================================
+# CHANGE VERSIONS (ETag / Last-Modified)
+# ======================================================
+
+@receiver(post_save, sender=Announcement)
+@receiver(post_delete, sender=Announcement)
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def bump_church_version(sender, instance, **kwargs):
+    bump_version(church_key(instance.church_id))
+
+
+@receiver(post_save, sender=Church)
+@receiver(post_delete, sender=Church)
+def bump_directory_version(sender, instance, **kwargs):
+    bump_version(DIRECTORY_KEY)
+
+
+# ======================================================
+# CHURCH DIRECTORY (search index; the anonymous cache follows DIRECTORY_KEY)
+# ======================================================
+
+@receiver(post_save, sender=Church)
+def index_church_directory(sender, instance, **kwargs):
+    index_church(instance)
+
+
+# ======================================================
+# FULL-TEXT SEARCH INDEX (announcements + events)
+# ======================================================
+
+@receiver(post_save, sender=Announcement)
+@receiver(post_save, sender=Event)
+def index_search_document(sender, instance, using, **kwargs):
+    # same transaction as the row, so the index never sees an uncommitted object
+    index_objects([instance], using=using)
+
+
+@receiver(post_delete, sender=Announcement)
+@receiver(post_delete, sender=Event)
+def remove_search_document(sender, instance, using, **kwargs):
+    remove_objects([instance], using=using)
+
+
+# ======================================================
+# LIVE ATTENDANCE FEED (SSE)
+# ======================================================
+
+@receiver(post_save, sender=Attendance)
+@receiver(post_delete, sender=Attendance)
+def publish_attendance(sender, instance, **kwargs):
+    key = attendance_channel(instance.event_id)
+    fanout = get_fanout()
+    if not fanout.is_open(key):
+        return  # nobody listening: skip the user lookup entirely
+
+    deleted = kwargs.get("signal") is post_delete
+    user = instance.user
+    payload = attendance_delta(
+        instance.event_id,
+        user.id,
+        user.email,
+        user.full_name,
+        None if deleted else instance.status,
+        instance.timestamp,
+    )
+    transaction.on_commit(lambda: fanout.publish(key, payload))
@@ -0,0 +1,137 @@
+import functools
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_names(value):
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+@functools.lru_cache(maxsize=None)
+def describe(serializer_class):
+    """(field names in output order, names of nested serializers) of a serializer class."""
+    fields = serializer_class().fields
+    return tuple(fields), frozenset(name for name, field in fields.items() if isinstance(field, serializers.BaseSerializer))
+
+
+def parse_sparse(request, serializer_class):
+    """
+    ?fields=id,title&expand=created_by → (fields, expand), both in the
+    serializer's field order; None without ?fields= (full representation,
+    relations already expanded). Unknown names are a 400.
+    """
+    fields, expand = parse_names(request.query_params.get("fields")), parse_names(request.query_params.get("expand"))
+    names, expandable = describe(serializer_class)
+
+    unknown = [name for name in fields if name not in names]
+    if unknown:
+        raise ValidationError({"error": f"Unknown field(s) in ?fields=: {', '.join(unknown)}"})
+    unknown = [name for name in expand if name not in expandable]
+    if unknown:
+        raise ValidationError({
+            "error": f"Cannot expand: {', '.join(unknown)} (expandable: {', '.join(sorted(expandable)) or 'none'})"
+        })
+
+    if not fields:
+        return None
+    wanted = set(fields) | set(expand)
+    return tuple(name for name in names if name in wanted), tuple(name for name in names if name in expand)
+
+
+# ======================================================
+# SERIALIZERS
+# ======================================================
+
+class SparseFieldsSerializerMixin:
+    """
+    fields=(...) keeps only those fields. A nested serializer among them
+    renders as the related primary key unless it is also in expand=(...).
+    """
+
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is None:
+            return
+
+        for name, field in list(self.fields.items()):
+            if name not in fields:
+                self.fields.pop(name)
+            elif isinstance(field, serializers.BaseSerializer) and name not in expand:
+                self.fields[name] = serializers.PrimaryKeyRelatedField(read_only=True)
+
+
+# ======================================================
+# VIEWSETS
+# ======================================================
+
+class SparseFieldsMixin:
+    """
+    ?fields= / ?expand= on reads (list, retrieve). The response keeps only
+    the requested fields and the query selects only their columns: only()
+    for model instances, a trimmed values_serializer_class for ValuesListMixin.
+    Writes always answer with the full representation.
+    """
+
+    # columns the view itself reads besides the serialized fields
+    sparse_required_fields = ("id",)
+
+    def get_sparse_required_fields(self):
+        return self.sparse_required_fields
+
+    def get_sparse_fields(self):
+        if not hasattr(self, "_sparse_fields"):
+            sparse = None
+            if self.request.method in SAFE_METHODS:
+                sparse = parse_sparse(self.request, self.get_serializer_class())
+            self._sparse_fields = sparse
+        return self._sparse_fields
+
+    def get_serializer(self, *args, **kwargs):
+        sparse = self.get_sparse_fields()
+        if sparse is not None:
+            kwargs["fields"], kwargs["expand"] = sparse
+        return super().get_serializer(*args, **kwargs)
+
+    def get_values_serializer_class(self):
+        reader = super().get_values_serializer_class()
+        sparse = self.get_sparse_fields()
+        return reader if sparse is None else reader.subset(*sparse)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        sparse = self.get_sparse_fields()
+        if sparse is None:
+            return queryset
+
+        columns, related = sparse_columns(queryset.model, self.get_serializer_class(), *sparse)
+        if self.action == "list":
+            # the paginator reads its ordering back from the last row
+            columns += [name.lstrip("-") for name in getattr(self.paginator, "ordering", None) or ()]
+
+        # select_related(None): a deferred relation cannot also be joined
+        queryset = queryset.select_related(None)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*self.get_sparse_required_fields(), *columns)
+
+
+def sparse_columns(model, serializer_class, fields, expand):
+    """(only() names, select_related() names) behind `fields` of `serializer_class`."""
+    declared = serializer_class().fields
+    columns, related = [], []
+    for name in fields:
+        source = declared[name].source
+        try:
+            model._meta.get_field(source)
+        except FieldDoesNotExist:
+            continue  # computed; reads whatever it reads
+
+        columns.append(source)
+        if name in expand:
+            nested = declared[name]
+            related.append(source)
+            columns += [f"{source}__{field.source}" for field in nested.fields.values()]
+    return columns, related
@@ -1,3 +1,1391 @@
-from django.test import TestCase
+import asyncio
+import base64
+import csv
+import json
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth.hashers import check_password
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, connection
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from .authentication import ChurchRefreshToken, claims_epoch
+from . import analytics, chat, checkin_buffer, checkins, db, directory, importer, renderers, search, views
+from .exports import async_chunks
+from .counters import count_attendance, rebuild_counters
+from .membership import MembershipCache, get_membership, membership_cache, resolve_memberships
+from .models import (
+    Announcement, Attendance, ChatMessage, CheckInLog, Church, ChurchWeeklyAttendance, Event, EventAttendanceCounter, Membership,
+    MemberMonthlyAttendance, User,
+)
+from .renderers import FastJSONRenderer
+from .read_serializers import AnnouncementValuesSerializer, AttendanceValuesSerializer, EventValuesSerializer
+from .serializers import AnnouncementSerializer, AttendanceSerializer, EventSerializer
+from .versions import DIRECTORY_KEY, bump_version
+
+
+def cursor(values):
+    raw = json.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+class ChurchAPITestCase(APITestCase):
+    """A church with a pastor and a member; clients authenticate with real access tokens."""
+
+    def setUp(self):
+        # process-wide caches outlive the rolled-back rows (and their reused ids)
+        membership_cache.clear()
+        cache.clear()
+
+        self.church = Church.objects.create(name="Grace", location="Seoul", denomination="Presbyterian")
+        self.pastor = self.create_member("pastor@example.com", "Pastor Kim", "pastor")
+        self.member = self.create_member("member@example.com", "Member Lee", "member")
+
+    def create_member(self, email, full_name, role, church=None):
+        user = User.objects.create_user(email, "secret-pass", full_name=full_name)
+        Membership.objects.create(user=user, church=church or self.church, role=role)
+        return user
+
+    def authenticate(self, user):
+        token = ChurchRefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def create_event(self, **kwargs):
+        starts_at = kwargs.pop("starts_at", timezone.now() + timedelta(days=1))
+        return Event.objects.create(
+            church=self.church,
+            title=kwargs.pop("title", "Sunday Service"),
+            starts_at=starts_at,
+            ends_at=kwargs.pop("ends_at", starts_at + timedelta(hours=2)),
+            created_by=self.pastor,
+            **kwargs,
+        )
+
+    def check_in(self, user, event, status="in"):
+        Attendance.objects.update_or_create(event=event, user=user, defaults={"status": status})
+
+
+# ======================================================
+# MEMBERSHIP RESOLUTION
+# ======================================================
+
+class MembershipCacheTests(TestCase):
+    def test_lru_eviction(self):
+        memberships = MembershipCache(maxsize=2)
+        memberships.set(1, "a")
+        memberships.set(2, "b")
+        memberships.get(1)
+        memberships.set(3, "c")
+
+        self.assertEqual((memberships.get(1), memberships.get(2), memberships.get(3)), ("a", None, "c"))
+
+    def test_entries_expire(self):
+        memberships = MembershipCache(ttl=-1)
+        memberships.set(1, "a")
+        self.assertIsNone(memberships.get(1))
+
+
+class MembershipResolutionTests(ChurchAPITestCase):
+    def test_second_resolution_is_served_from_the_cache(self):
+        with self.assertNumQueries(1):
+            resolve_memberships(self.member.pk)
+        with self.assertNumQueries(0):
+            memberships = resolve_memberships(self.member.pk)
+
+        self.assertEqual([(m.church_id, m.role) for m in memberships], [(self.church.id, "member")])
+
+    def test_membership_writes_invalidate_the_cache(self):
+        resolve_memberships(self.member.pk)
+
+        membership = Membership.objects.get(user=self.member)
+        membership.role = "deacon"
+        membership.save()
+        self.assertEqual(resolve_memberships(self.member.pk)[0].role, "deacon")
+
+        membership.delete()
+        self.assertEqual(resolve_memberships(self.member.pk), ())
+
+    def test_resolved_once_per_request(self):
+        other = Church.objects.create(name="Hope", location="Busan", denomination="Methodist")
+        Membership.objects.create(user=self.member, church=other, role="deacon")
+        membership_cache.clear()
+
+        request = RequestFactory().get("/")
+        request.user = self.member
+        with self.assertNumQueries(1):
+            self.assertEqual(get_membership(request).church_id, self.church.id)
+            self.assertTrue(get_membership(request, church_id=other.id).is_leader)
+            self.assertIsNone(get_membership(request, church_id=other.id + 1))
+
+
+# ======================================================
+# KEYSET PAGINATION
+# ======================================================
+
+class KeysetPaginationTests(ChurchAPITestCase):
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        self.events = [self.create_event(title=f"Event {i}", starts_at=now + timedelta(days=i)) for i in range(5)]
+        self.authenticate(self.member)
+
+    def follow(self, url):
+        items = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            items += response.data["results"]
+            url = response.data["next"]
+        return items
+
+    def test_pages_follow_next(self):
+        events = self.follow("/api/events/?cursor=&page_size=2")
+        self.assertEqual([event["title"] for event in events], [event.title for event in self.events])
+
+    def test_announcements_newest_first(self):
+        created_at = timezone.now()
+        for i in range(3):
+            Announcement.objects.create(church=self.church, title=f"A{i}", body="", created_by=self.pastor)
+        # same created_at: the id breaks the tie
+        Announcement.objects.update(created_at=created_at)
+
+        announcements = self.follow("/api/announcements/?cursor=&page_size=1")
+        self.assertEqual([a["title"] for a in announcements], ["A2", "A1", "A0"])
+
+    def test_without_cursor_the_list_is_unpaginated(self):
+        response = self.client.get("/api/events/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 5)
+
+    def test_tampered_cursor_is_404(self):
+        for value in [
+            "not base64!",
+            cursor(["nope", 1]),
+            cursor(["2026-01-01T00:00:00Z", "abc"]),
+            cursor([{"a": 1}, 1]),
+            cursor([None, 1]),
+            cursor([1]),
+            cursor({"starts_at": 1}),
+        ]:
+            with self.subTest(cursor=value):
+                response = self.client.get("/api/events/", {"cursor": value})
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.data["detail"], "Invalid cursor")
+
+
+# ======================================================
+# QUERY PLANS (explain_queries)
+# ======================================================
+
+class ExplainQueriesTests(ChurchAPITestCase):
+    def setUp(self):
+        super().setUp()
+        event = self.create_event()
+        self.check_in(self.member, event)
+        Announcement.objects.create(church=self.church, title="Welcome", body="Hello", created_by=self.pastor)
+
+    def test_every_endpoint_uses_an_index(self):
+        out = StringIO()
+        call_command("explain_queries", stdout=out)
+
+        for label in ["GET dashboard/ (latest announcements)", "GET search/?q=", "GET churches/?q=",
+                      "GET attendance/export/?from=&to="]:
+            self.assertIn(label, out.getvalue())
+
+    def test_full_scan_fails_the_command(self):
+        # the unfiltered directory scans by design
+        with mock.patch("core.management.commands.explain_queries.ALLOWED_SCANS", set()):
+            with self.assertRaisesMessage(CommandError, "Full table scan in: GET churches/"):
+                call_command("explain_queries", stdout=StringIO())
+
+
+# ======================================================
+# CHURCH DIRECTORY
+# ======================================================
+
+class ChurchDirectoryTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        for name, location in [("Grace Church", "Seoul"), ("Hope Chapel", "Busan"), ("Gracepoint", "Daegu")]:
+            Church.objects.create(name=name, location=location, denomination="Baptist")
+
+    def names(self, **params):
+        response = self.client.get("/api/churches/", params)
+        self.assertEqual(response.status_code, 200)
+        return [church["name"] for church in response.data["results"]]
+
+    def test_substring_search(self):
+        self.assertEqual(self.names(q="grace"), ["Grace Church", "Gracepoint"])
+        self.assertEqual(self.names(q="  BUSAN "), ["Hope Chapel"])
+        self.assertEqual(self.names(q="cepo"), ["Gracepoint"])
+        self.assertEqual(self.names(q="nowhere"), [])
+
+    def test_short_terms(self):
+        self.assertEqual(self.names(q="ho"), ["Hope Chapel"])
+        self.assertEqual(self.names(q="g"), ["Grace Church", "Gracepoint"])
+
+    def test_common_terms_fall_back_to_a_subquery(self):
+        with mock.patch.object(directory, "MAX_CANDIDATES", 1):
+            self.assertEqual(self.names(q="grace"), ["Grace Church", "Gracepoint"])
+
+    def test_blank_search_is_the_full_directory(self):
+        self.assertEqual(len(self.names(q="")), 3)
+
+    def test_renamed_church_is_reindexed(self):
+        church = Church.objects.get(name="Hope Chapel")
+        church.name = "New Life"
+        church.save()
+
+        self.assertEqual(self.names(q="hope"), [])
+        self.assertEqual(self.names(q="life"), ["New Life"])
+
+    def test_anonymous_pages_follow_the_directory_version(self):
+        self.assertEqual(len(self.client.get("/api/churches/").data), 3)
+
+        # a write through another worker: no signal here, only its committed version
+        Church.objects.filter(name="Gracepoint").update(name="Graceway")
+        self.assertNotIn("Graceway", [c["name"] for c in self.client.get("/api/churches/").data])
+
+        bump_version(DIRECTORY_KEY)
+        self.assertIn("Graceway", [c["name"] for c in self.client.get("/api/churches/").data])
+
+
+# ======================================================
+# BULK CHECK-IN
+# ======================================================
+
+class BulkAttendanceTests(ChurchAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.event = self.create_event()
+        self.url = f"/api/events/{self.event.id}/attendance/bulk/"
+        self.outsider = self.create_member(
+            "outsider@example.com", "Outsider", "member",
+            church=Church.objects.create(name="Hope", location="Busan", denomination="Methodist"),
+        )
+
+    def test_members_cannot_bulk_check_in(self):
+        self.authenticate(self.member)
+        response = self.client.post(self.url, {"users": [self.member.id]}, format="json")
+        self.assertEqual(response.status_code, 403)
+
+    def test_mixed_keys(self):
+        self.authenticate(self.pastor)
+        users = [self.member.id, "PASTOR@Example.com", "²", "outsider@example.com"]
+        response = self.client.post(self.url, {"users": users, "status": "in"}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["succeeded"], response.data["failed"]), (2, 2))
+        self.assertEqual(
+            [(result["user"], result["success"]) for result in response.data["results"]],
+            [(str(self.member.id), True), ("PASTOR@Example.com", True), ("²", False), ("outsider@example.com", False)],
+        )
+        self.assertEqual(
+            set(Attendance.objects.filter(event=self.event).values_list("user_id", "status")),
+            {(self.member.id, "in"), (self.pastor.id, "in")},
+        )
+
+    def test_check_out_updates_existing_rows(self):
+        self.check_in(self.member, self.event)
+        self.authenticate(self.pastor)
+
+        response = self.client.post(self.url, {"users": [self.member.id], "status": "out"}, format="json")
+
+        self.assertEqual(response.data["succeeded"], 1)
+        self.assertEqual(Attendance.objects.get(event=self.event, user=self.member).status, "out")
+
+    def test_invalid_body_is_400(self):
+        self.authenticate(self.pastor)
+        for body in [{}, {"users": []}, {"users": [self.member.id], "status": "maybe"}]:
+            with self.subTest(body=body):
+                self.assertEqual(self.client.post(self.url, body, format="json").status_code, 400)
+
+
+# ======================================================
+# ATTENDANCE COUNTERS
+# ======================================================
+
+class AttendanceCounterTests(ChurchAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.first, self.second = self.create_event(), self.create_event(title="Bible Study")
+
+    def counts(self, event):
+        counter = EventAttendanceCounter.objects.get(event=event)
+        return {"checked_in": counter.checked_in, "checked_out": counter.checked_out, "total": counter.total}
+
+    def assertConsistent(self):
+        rebuilt = count_attendance([self.first.id, self.second.id])
+        for event in (self.first, self.second):
+            self.assertEqual(self.counts(event), rebuilt.get(event.id, {"checked_in": 0, "checked_out": 0, "total": 0}))
+
+    def test_check_in_out_and_delete(self):
+        self.check_in(self.member, self.first)
+        self.check_in(self.pastor, self.first)
+        self.check_in(self.member, self.second)
+        self.assertEqual(self.counts(self.first), {"checked_in": 2, "checked_out": 0, "total": 2})
+        self.assertConsistent()
+
+        self.check_in(self.member, self.first, status="out")
+        self.check_in(self.member, self.first, status="out")  # no-op re-save
+        self.assertEqual(self.counts(self.first), {"checked_in": 1, "checked_out": 1, "total": 2})
+        self.assertConsistent()
+
+        Attendance.objects.get(event=self.second, user=self.member).delete()
+        self.assertEqual(self.counts(self.second)["total"], 0)
+        self.assertConsistent()
+
+    def test_counter_moves_with_the_row(self):
+        # a failing follow-up rolls the check-in back with it
+        with mock.patch("core.signals.bump_version", side_effect=DatabaseError("database is locked")):
+            with self.assertRaises(DatabaseError):
+                Attendance.objects.create(event=self.first, user=self.member, status="in")
+
+        self.assertFalse(Attendance.objects.filter(event=self.first).exists())
+        self.assertEqual(self.counts(self.first)["total"], 0)
+
+    def test_bulk_check_in_moves_counters_by_status(self):
+        self.check_in(self.member, self.first, status="out")
+        self.authenticate(self.pastor)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                f"/api/events/{self.first.id}/attendance/bulk/",
+                {"users": [self.member.id, self.pastor.id], "status": "in"}, format="json",
+            )
+
+        self.assertEqual(response.data["succeeded"], 2)
+        counter_queries = [q["sql"] for q in queries if "core_eventattendancecounter" in q["sql"]]
+        self.assertEqual(len(counter_queries), 1)
+        self.assertTrue(counter_queries[0].startswith("UPDATE"))
+        self.assertEqual(self.counts(self.first), {"checked_in": 2, "checked_out": 0, "total": 2})
+        self.assertConsistent()
+
+    def test_rebuild_repairs_missing_counters(self):
+        self.check_in(self.member, self.first)
+        EventAttendanceCounter.objects.all().delete()
+
+        self.assertEqual(rebuild_counters(), 2)
+        self.assertConsistent()
+
+
+# ======================================================
+# DASHBOARD
+# ======================================================
+
+class DashboardTests(ChurchAPITestCase):
+    def test_payload(self):
+        now = timezone.now()
+        self.create_event(title="Past", starts_at=now - timedelta(days=3))
+        upcoming = self.create_event(title="Upcoming", starts_at=now + timedelta(days=2))
+        self.create_event(title="Weekly", starts_at=now - timedelta(days=6, hours=12), recurrence="weekly")
+        for i in range(3):
+            Announcement.objects.create(church=self.church, title=f"A{i}", body="", created_by=self.pastor)
+        self.check_in(self.member, upcoming)
+
+        self.authenticate(self.member)
+        response = self.client.get("/api/dashboard/", {"limit": 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["role"], "member")
+        self.assertEqual(response.data["church"]["name"], "Grace")
+        self.assertEqual(response.data["counts"], {"announcements": 3, "events": 3})
+        self.assertEqual([a["title"] for a in response.data["announcements"]], ["A2", "A1"])
+        # next occurrences of either kind, the recurring one expanded
+        self.assertEqual([e["title"] for e in response.data["events"]], ["Weekly", "Upcoming"])
+        self.assertEqual(response.data["events"][1]["attendance"], {"checked_in": 1, "checked_out": 0, "total": 1})
+
+    def test_query_count_does_not_grow_with_data(self):
+        self.authenticate(self.pastor)
+        for i in range(10):
+            self.create_event(title=f"E{i}", starts_at=timezone.now() + timedelta(days=i + 1))
+            Announcement.objects.create(church=self.church, title=f"A{i}", body="", created_by=self.pastor)
+
+        with CaptureQueriesContext(connection) as few:
+            self.client.get("/api/dashboard/", {"limit": 2})
+        with CaptureQueriesContext(connection) as many:
+            self.client.get("/api/dashboard/", {"limit": 20})
+        self.assertEqual(len(few), len(many))
+
+    def test_without_a_church(self):
+        loner = User.objects.create_user("loner@example.com", "secret-pass", full_name="Loner")
+        self.authenticate(loner)
+
+        response = self.client.get("/api/dashboard/")
+        self.assertEqual(response.data["role"], None)
+        self.assertEqual(response.data["events"], [])
+
+
+# ======================================================
+# CONDITIONAL GET (ETag / 304)
+# ======================================================
+
+class ConditionalGetTests(ChurchAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.event = self.create_event()
+        Announcement.objects.create(church=self.church, title="Welcome", body="Hello", created_by=self.pastor)
+
+    def test_unchanged_list_is_304(self):
+        self.authenticate(self.member)
+        first = self.client.get("/api/announcements/")
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first["ETag"].startswith("W/"))
+
+        with CaptureQueriesContext(connection) as queries:
+            again = self.client.get("/api/announcements/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(again.status_code, 304)
+        # answered from the version row alone
+        self.assertFalse([q for q in queries if "core_announcement" in q["sql"]])
+        self.assertEqual(again["ETag"], first["ETag"])
+
+    def test_write_invalidates_etag(self):
+        self.authenticate(self.pastor)
+        etag = self.client.get("/api/announcements/")["ETag"]
+
+        created = self.client.post("/api/announcements/", {"title": "New", "body": "News"}, format="json")
+        self.assertEqual(created.status_code, 201)
+
+        response = self.client.get("/api/announcements/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.data), 2)
+
+    def test_etag_differs_per_caller_and_query(self):
+        self.authenticate(self.member)
+        member_etag = self.client.get("/api/announcements/")["ETag"]
+        fields_etag = self.client.get("/api/announcements/", {"fields": "id"})["ETag"]
+        self.authenticate(self.pastor)
+        pastor_etag = self.client.get("/api/announcements/")["ETag"]
+
+        self.assertEqual(len({member_etag, fields_etag, pastor_etag}), 3)
+
+    def test_attendance_and_announcements_version_separately(self):
+        self.authenticate(self.pastor)
+        attendance_url = f"/api/events/{self.event.id}/attendance/"
+        attendance_etag = self.client.get(attendance_url)["ETag"]
+
+        # an announcement does not touch attendance...
+        Announcement.objects.create(church=self.church, title="Later", body="", created_by=self.pastor)
+        self.assertEqual(self.client.get(attendance_url, HTTP_IF_NONE_MATCH=attendance_etag).status_code, 304)
+        announcements_etag = self.client.get("/api/announcements/")["ETag"]
+
+        # ...and a check-in does not touch announcements
+        self.check_in(self.member, self.event)
+        self.assertEqual(self.client.get(attendance_url, HTTP_IF_NONE_MATCH=attendance_etag).status_code, 200)
+        self.assertEqual(
+            self.client.get("/api/announcements/", HTTP_IF_NONE_MATCH=announcements_etag).status_code, 304
+        )
+
+
+# ======================================================
+# STREAMING ATTENDANCE EXPORT
+# ======================================================
+
+class AttendanceExportTests(ChurchAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.event = self.create_event(starts_at=timezone.make_aware(timezone.datetime(2026, 3, 1, 10)))
+        self.later = self.create_event(title="Later", starts_at=timezone.make_aware(timezone.datetime(2026, 5, 1, 10)))
+        self.check_in(self.member, self.event)
+        self.check_in(self.pastor, self.event, status="out")
+        self.check_in(self.member, self.later)
+        self.authenticate(self.pastor)
+
+    def body(self, response):
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_event_csv(self):
+        response = self.client.get(f"/api/events/{self.event.id}/attendance/export/", HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn(f'filename="event-{self.event.id}-attendance.csv"', response["Content-Disposition"])
+        # streamed as is: gzip would hold rows back until it fills a block
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+        rows = list(csv.DictReader(self.body(response).splitlines()))
+        self.assertEqual(
+            sorted((row["email"], row["status"], row["event_title"]) for row in rows),
+            [("member@example.com", "in", "Sunday Service"), ("pastor@example.com", "out", "Sunday Service")],
+        )
+
+    def test_church_ndjson_window(self):
+        response = self.client.get("/api/attendance/export/", {"type": "ndjson", "from": "2026-04-01"})
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in self.body(response).splitlines()]
+        self.assertEqual([(row["event_id"], row["user_id"]) for row in rows], [(self.later.id, self.member.id)])
+
+    def test_leaders_only(self):
+        self.authenticate(self.member)
+        self.assertEqual(self.client.get(f"/api/events/{self.event.id}/attendance/export/").status_code, 403)
+        self.assertEqual(self.client.get("/api/attendance/export/").status_code, 403)
+
+    def test_bad_parameters(self):
+        self.assertEqual(self.client.get("/api/attendance/export/", {"type": "xlsx"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/attendance/export/", {"from": "soon"}).status_code, 400)
+
+    def test_async_chunks(self):
+        async def collect():
+            return [chunk async for chunk in async_chunks(iter(["a\n", "b\n", "c\n"]), size=2)]
+
+        self.assertEqual(asyncio.run(collect()), ["a\nb\n", "c\n"])
+
+
+# ======================================================
+# BULK MEMBER IMPORT
+# ======================================================
+
+class MemberImportTests(ChurchAPITestCase):
+    url = "/api/members/import/"
+
+    def setUp(self):
+        super().setUp()
+        self.authenticate(self.pastor)
+
+    def import_members(self, members):
+        response = self.client.post(self.url, {"members": members}, format="json")
+        return response, {row["row"]: row for row in response.data["rows"]}
+
+    def test_import_report(self):
+        response, rows = self.import_members([
+            {"email": "Imp0@X.com", "full_name": "Imported", "password": "pw-imported-0"},
+            {"email": "imp0@x.COM"},
+            {"email": "MEMBER@example.com"},
+            {"email": "not an email"},
+            {"email": "deacon@x.com", "role": "deacon"},
+            {"email": "pastor2@x.com", "role": "pastor"},
+            {"email": "long@x.com", "full_name": "x" * 101},
+            "nope",
+        ])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data["created"], response.data["skipped"], response.data["failed"]), (2, 2, 4))
+        self.assertEqual(rows[2]["error"], "Duplicate in file")
+        self.assertEqual(rows[3]["error"], "Already registered")
+        self.assertEqual(rows[7]["error"], "full_name is longer than 100 characters")
+        self.assertEqual(
+            set(Membership.objects.filter(church=self.church, user__email__in=["Imp0@x.com", "deacon@x.com"])
+                .values_list("user__email", "role")),
+            {("Imp0@x.com", "member"), ("deacon@x.com", "deacon")},
+        )
+
+    def test_imported_member_logs_in_with_the_address_given(self):
+        self.import_members([{"email": "Imp0@X.com", "full_name": "Imported", "password": "pw-imported-0"}])
+
+        self.client.credentials()
+        response = self.client.post("/api/token/", {"email": "Imp0@x.com", "password": "pw-imported-0"}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+    def test_csv_upload(self):
+        upload = SimpleUploadedFile("members.csv", b"Email,Full_Name,Role\nnew@x.com,New One,member\n")
+        response = self.client.post(self.url, {"file": upload}, format="multipart")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(User.objects.get(email="new@x.com").full_name, "New One")
+        self.assertFalse(User.objects.get(email="new@x.com").has_usable_password())
+
+    def test_leaders_only_and_bad_bodies(self):
+        self.assertEqual(self.client.post(self.url, {"members": []}, format="json").status_code, 400)
+
+        self.authenticate(self.member)
+        self.assertEqual(self.client.post(self.url, {"members": [{"email": "a@x.com"}]}, format="json").status_code, 403)
+
+    def test_parallel_hashing(self):
+        passwords = [f"password-{i}" for i in range(4)]
+        with mock.patch.object(importer, "PARALLEL_THRESHOLD", 2):
+            hashes = importer.hash_passwords(passwords, workers=2)
+
+        self.assertTrue(all(check_password(p, h) for p, h in zip(passwords, hashes)))
+
+
+# ======================================================
+# MEMBERSHIP CLAIMS
+# ======================================================
+
+class ClaimsTests(ChurchAPITestCase):
+    url = "/api/announcements/"
+
+    def post_announcement(self):
+        return self.client.post(self.url, {"title": "Retreat", "body": "Saturday"}, format="json")
+
+    def test_role_comes_from_the_token(self):
+        self.authenticate(self.member)
+        self.assertEqual(self.post_announcement().status_code, 403)
+
+        self.authenticate(self.pastor)
+        self.assertEqual(self.post_announcement().status_code, 201)
+
+    def test_role_change_revokes_outstanding_tokens(self):
+        self.authenticate(self.member)
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Membership.objects.filter(user=self.member).update(role="deacon")
+            Membership.objects.get(user=self.member).save()
+
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+        self.authenticate(self.member)
+        self.assertEqual(self.post_announcement().status_code, 201)
+
+    def test_reads_make_no_auth_queries_once_cached(self):
+        self.authenticate(self.pastor)
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertFalse([q for q in queries if "core_claimsrevocation" in q["sql"] or 'FROM "core_user"' in q["sql"]])
+
+
+# ======================================================
+# LIVE ATTENDANCE FEED
+# ======================================================
+
+class LiveAttendanceTests(ChurchAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.event = self.create_event()
+        self.url = f"/api/events/{self.event.id}/attendance/stream/"
+
+    def token(self, user):
+        return str(ChurchRefreshToken.for_user(user).access_token)
+
+    def check_in_committed(self, user, status="in"):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.check_in(user, self.event, status)
+
+    def read_stream(self, frames, then=None, **params):
+        """The response and its first `frames` SSE frames; `then()` runs after the first."""
+        async def read():
+            response = await self.async_client.get(self.url, params)
+            if not response.streaming:
+                return response, []
+
+            received = []
+            content = aiter(response.streaming_content)
+            while len(received) < frames:
+                frame = await anext(content)
+                if not frame.startswith(b":"):
+                    received.append(frame.decode())
+                if then and len(received) == 1:
+                    await sync_to_async(then)()
+            await content.aclose()
+            return response, received
+
+        return async_to_sync(read)()
+
+    def test_query_token_streams_deltas(self):
+        response, frames = self.read_stream(
+            2, then=lambda: self.check_in_committed(self.member), token=self.token(self.pastor)
+        )
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertIn("event: ready", frames[0])
+        self.assertIn("event: attendance", frames[1])
+        self.assertEqual(json.loads(frames[1].split("data: ", 1)[1])["user"]["email"], "member@example.com")
+
+    def test_resumes_after_last_event_id(self):
+        token = self.token(self.pastor)
+        _, frames = self.read_stream(3, then=lambda: [self.check_in_committed(self.member, s) for s in ("in", "out")],
+                                     token=token)
+        first_id = frames[1].split("id: ", 1)[1].split("\n", 1)[0]
+
+        _, frames = self.read_stream(2, token=token, last_event_id=first_id)
+        self.assertIn('"status":"out"', frames[0])
+        self.assertIn("event: ready", frames[1])
+
+    def test_leaders_only(self):
+        response, _ = self.read_stream(0, token=self.token(self.member))
+        self.assertEqual(response.status_code, 403)
+
+    def test_stale_tokens_are_rejected(self):
+        response, _ = self.read_stream(0)
+        self.assertEqual(response.status_code, 401)
+
+        token = self.token(self.pastor)
+        with self.captureOnCommitCallbacks(execute=True):
+            Membership.objects.get(user=self.pastor).save()
+        # streams authenticate on another thread, which can't read this test's
+        # uncommitted rows: load the new epoch into the cache from here
+        claims_epoch(self.pastor.id)
+        response, _ = self.read_stream(0, token=token)
+        self.assertEqual(response.status_code, 401)
+
+        response, _ = self.read_stream(1, token=self.token(self.pastor))
+        self.assertEqual(response.status_code, 200)
+
+
+# ======================================================
+# COMMUNITY CHAT
+# ======================================================
+
+class ChatTests(ChurchAPITestCase):
+    def setUp(self):
+        super().setUp()
+        # a fresh broadcaster per test, flushed and relayed by hand on this
+        # thread (the worker's connection can't see the test transaction)
+        self.broadcaster = chat.ChatBroadcaster(history_size=3)
+        for patch in (mock.patch.object(chat, "_broadcaster", self.broadcaster),
+                      mock.patch.object(chat.ChatBroadcaster, "_ensure_worker")):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def post(self, body, user=None):
+        user = user or self.member
+        return self.broadcaster.post(self.church.id, user.id, user.full_name, body)
+
+    def test_posts_are_stored_in_one_flush(self):
+        futures = [self.post(f"hello {i}") for i in range(2)]
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.broadcaster.flush(), 2)
+        self.assertEqual(len([q for q in queries if q["sql"].startswith("INSERT")]), 1)
+
+        message = futures[1].result(timeout=0)
+        self.assertEqual(message["body"], "hello 1")
+        self.assertEqual(message["user"], {"id": self.member.id, "full_name": "Member Lee"})
+        self.assertEqual([m["id"] for m in self.broadcaster.history(self.church.id)],
+                         list(ChatMessage.objects.order_by("id").values_list("id", flat=True)))
+
+    def test_a_bad_row_fails_only_its_post(self):
+        good, bad = self.post("fine"), self.post(None)
+        with self.assertLogs("core.chat", "ERROR"):
+            self.assertEqual(self.broadcaster.flush(), 1)
+
+        self.assertEqual(good.result(timeout=0)["body"], "fine")
+        with self.assertRaises(chat.MessageNotSaved):
+            bad.result(timeout=0)
+
+    def test_history_pages_past_the_ring(self):
+        for i in range(5):
+            self.post(f"m{i}")
+        self.broadcaster.flush()
+
+        newest = self.broadcaster.history(self.church.id, limit=2)
+        self.assertEqual([m["body"] for m in newest], ["m3", "m4"])
+        older = self.broadcaster.history(self.church.id, before=newest[0]["id"], limit=3)
+        self.assertEqual([m["body"] for m in older], ["m0", "m1", "m2"])
+
+    def test_relay_picks_up_other_workers_rows(self):
+        self.broadcaster.warm(self.church.id)
+        ChatMessage.objects.create(church=self.church, user=self.pastor, body="from elsewhere")
+
+        self.assertEqual(self.broadcaster.relay(), 1)
+        self.assertEqual(self.broadcaster.relay(), 0)
+        self.assertEqual(self.broadcaster.history(self.church.id)[-1]["body"], "from elsewhere")
+
+    def test_messages_view(self):
+        self.post("hello")
+        self.broadcaster.flush()
+        token = str(ChurchRefreshToken.for_user(self.member).access_token)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        async def requests():
+            return (
+                await self.async_client.get("/api/chat/messages/", headers=headers),
+                await self.async_client.get("/api/chat/messages/", {"before": "x"}, headers=headers),
+                await self.async_client.post("/api/chat/messages/", {"body": "  "},
+                                             content_type="application/json", headers=headers),
+            )
+
+        history, bad_before, blank = async_to_sync(requests)()
+        self.assertEqual([m["body"] for m in history.json()["results"]], ["hello"])
+        self.assertEqual(bad_before.status_code, 400)
+        self.assertEqual(blank.status_code, 400)
+
+    def test_stream_delivers_posts(self):
+        token = str(ChurchRefreshToken.for_user(self.member).access_token)
+
+        async def read():
+            response = await self.async_client.get("/api/chat/stream/", {"token": token})
+            content = aiter(response.streaming_content)
+            ready = await anext(content)
+            await sync_to_async(lambda: (self.post("live"), self.broadcaster.flush()))()
+            message = await anext(content)
+            await content.aclose()
+            return ready.decode(), message.decode()
+
+        ready, message = async_to_sync(read)()
+        self.assertIn("event: ready", ready)
+        self.assertIn("event: message", message)
+        self.assertIn('"body":"live"', message)
+
+
+# ======================================================
+# READ REPLICAS
+# ======================================================
+
+@override_settings(REPLICA_DATABASES=["replica1"])
+class ReplicaRoutingTests(SimpleTestCase):
+    """Routing decisions only; outside TestCase's transaction, which pins reads to the primary."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User(id=7, email="reader@example.com")
+
+        location = tempfile.TemporaryDirectory()
+        self.addCleanup(location.cleanup)
+        # shared by workers on one host, unlike the tests' LocMemCache
+        self.shared_cache = {"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                                         "LOCATION": location.name}}
+
+    def request(self, method="get"):
+        request = getattr(RequestFactory(), method)("/api/events/")
+        request.user = self.user
+        return request
+
+    def route(self, request, model=Event):
+        token = db._current_request.set(db.ReadState(request))
+        try:
+            return db.ReplicaRouter().db_for_read(model)
+        finally:
+            db._current_request.reset(token)
+
+    def test_safe_reads_go_to_a_replica(self):
+        self.assertEqual(self.route(self.request()), "replica1")
+        self.assertIsNone(self.route(self.request("post")))
+        self.assertIsNone(self.route(self.request(), model=Membership))
+
+    def test_no_request_and_no_replicas_read_the_primary(self):
+        self.assertIsNone(db.ReplicaRouter().db_for_read(Event))
+        with override_settings(REPLICA_DATABASES=[]):
+            self.assertIsNone(self.route(self.request()))
+
+    def test_writers_stick_to_the_primary(self):
+        with override_settings(CACHES=self.shared_cache):
+            middleware = db.ReplicaRoutingMiddleware(lambda request: HttpResponse(status=201))
+            middleware(self.request("post"))
+
+            self.assertIsNone(self.route(self.request()))
+            self.user.id = 8
+            self.assertEqual(self.route(self.request()), "replica1")
+
+    def test_failed_writes_do_not_stick(self):
+        with override_settings(CACHES=self.shared_cache):
+            middleware = db.ReplicaRoutingMiddleware(lambda request: HttpResponse(status=400))
+            middleware(self.request("post"))
+
+            self.assertEqual(self.route(self.request()), "replica1")
+
+    def test_requires_a_shared_cache(self):
+        with self.assertRaises(ImproperlyConfigured):
+            db.ReplicaRoutingMiddleware(lambda request: HttpResponse())
+
+
+# ======================================================
+# EVENT WINDOWS AND RECURRENCE
+# ======================================================
+
+class EventWindowTests(ChurchAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.authenticate(self.pastor)
+
+    def at(self, day, hour=10):
+        return timezone.make_aware(timezone.datetime(2026, 1, day, hour))
+
+    def window(self, start="2026-01-01", end="2026-02-01"):
+        response = self.client.get("/api/events/", {"from": start, "to": end})
+        self.assertEqual(response.status_code, 200)
+        return [(occurrence["title"], occurrence["starts_at"][:10]) for occurrence in response.data]
+
+    def test_invalid_windows_are_400(self):
+        for params in [
+            {"from": "2026-01-01"},
+            {"to": "2026-01-01"},
+            {"from": "2026-02-01", "to": "2026-01-01"},
+            {"from": "2026-01-01", "to": "2026-01-01"},
+            {"from": "2026-01-01", "to": "2027-01-03"},
+            {"from": "yesterday", "to": "2026-01-01"},
+        ]:
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get("/api/events/", params).status_code, 400)
+
+    def test_weekly_event_is_expanded(self):
+        event = self.create_event(starts_at=self.at(4), recurrence="weekly", recurrence_exceptions=["2026-01-11"])
+
+        response = self.client.get("/api/events/", {"from": "2026-01-01", "to": "2026-02-01"})
+
+        self.assertEqual({occurrence["id"] for occurrence in response.data}, {event.id})
+        self.assertEqual(self.window(), [("Sunday Service", "2026-01-04"), ("Sunday Service", "2026-01-18"),
+                                         ("Sunday Service", "2026-01-25")])
+
+    def test_one_offs_and_rules_are_merged_by_start(self):
+        self.create_event(title="Before", starts_at=self.at(1, 8) - timedelta(days=2))
+        self.create_event(title="Overnight", starts_at=self.at(1, 0) - timedelta(hours=1))
+        self.create_event(title="Retreat", starts_at=self.at(10))
+        self.create_event(title="After", starts_at=self.at(31) + timedelta(days=2))
+        self.create_event(title="Prayer", starts_at=self.at(8), recurrence="weekly", recurrence_interval=2,
+                          recurrence_until=self.at(22))
+        self.create_event(title="Finished", starts_at=self.at(1) - timedelta(days=60), recurrence="weekly",
+                          recurrence_until=self.at(1) - timedelta(days=30))
+
+        self.assertEqual(self.window(), [
+            ("Overnight", "2025-12-31"),
+            ("Prayer", "2026-01-08"),
+            ("Retreat", "2026-01-10"),
+            ("Prayer", "2026-01-22"),
+        ])
+
+    def test_invalid_rules_are_400(self):
+        starts_at = timezone.now() + timedelta(days=1)
+        valid = {
+            "title": "Prayer",
+            "starts_at": starts_at.isoformat(),
+            "ends_at": (starts_at + timedelta(hours=1)).isoformat(),
+            "recurrence": "weekly",
+        }
+        for field, value in [
+            ("ends_at", (starts_at - timedelta(hours=1)).isoformat()),
+            ("recurrence_until", (starts_at - timedelta(days=7)).isoformat()),
+            ("recurrence_interval", 0),
+        ]:
+            with self.subTest(field=field):
+                response = self.client.post("/api/events/", {**valid, field: value}, format="json")
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(field, response.data)
+
+        self.assertEqual(self.client.post("/api/events/", valid, format="json").status_code, 201)
+
+
+# ======================================================
+# FULL-TEXT SEARCH
+# ======================================================
+
+class SearchTests(ChurchAPITestCase):
+    url = "/api/search/"
+
+    def setUp(self):
+        super().setUp()
+        self.authenticate(self.member)
+
+    def announce(self, title, body="", church=None):
+        return Announcement.objects.create(church=church or self.church, title=title, body=body,
+                                           created_by=self.pastor)
+
+    def found(self, q, **params):
+        response = self.client.get(self.url, {"q": q, **params})
+        self.assertEqual(response.status_code, 200)
+        return [(hit["type"], hit["id"]) for hit in response.data["results"]]
+
+    def test_index_follows_saves_and_deletes(self):
+        announcement = self.announce("Spring picnic", "Bring a blanket")
+        self.assertEqual(self.found("pic"), [("announcement", announcement.id)])
+
+        announcement.title = "Spring retreat"
+        announcement.save()
+        self.assertEqual(self.found("picnic"), [])
+        self.assertEqual(self.found("retreat spring"), [("announcement", announcement.id)])
+
+        announcement.delete()
+        self.assertEqual(self.found("retreat"), [])
+
+    def test_results_are_ranked_and_scoped(self):
+        in_body = self.announce("Notice", "The choir meets at six")
+        in_title = self.announce("Choir practice")
+        event = self.create_event(title="Choir concert")
+        other = Church.objects.create(name="Hope", location="Busan", denomination="Baptist")
+        self.announce("Choir practice", church=other)
+
+        self.assertEqual(self.found("choir", type="announcement"),
+                         [("announcement", in_title.id), ("announcement", in_body.id)])
+        self.assertEqual(self.found("choir", type="event"), [("event", event.id)])
+        self.assertEqual(len(self.found("choir")), 3)
+
+    def test_bad_queries_are_400(self):
+        for params in [{}, {"q": "  !! "}, {"q": "choir", "type": "sermon"}]:
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(self.url, params).status_code, 400)
+
+    def test_backend_selection(self):
+        self.assertIsInstance(search.backend_for(connection), search.SQLiteIndex)
+        with self.assertRaises(ImproperlyConfigured):
+            search.backend_for(mock.Mock(vendor="oracle"))
+
+    def test_unsupported_databases_skip_indexing_with_one_warning(self):
+        with mock.patch.object(search, "_unindexed_vendors", set()):
+            with self.assertLogs("core.search", "WARNING"):
+                self.assertIsNone(search.index_backend(mock.Mock(vendor="oracle")))
+            with self.assertNoLogs("core.search", "WARNING"):
+                self.assertIsNone(search.index_backend(mock.Mock(vendor="oracle")))
+
+
+# ======================================================
+# ATTENDANCE ANALYTICS ROLLUPS
+# ======================================================
+
+class AnalyticsRollupTests(ChurchAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.deacon = self.create_member("deacon@example.com", "Deacon Park", "deacon")
+        self.now = timezone.now()
+
+    def attend(self, user, days_ago):
+        event = self.create_event(starts_at=self.now - timedelta(days=days_ago))
+        return Attendance.objects.create(event=event, user=user, status="in",
+                                         timestamp=self.now - timedelta(days=days_ago))
+
+    def rollups(self):
+        return (
+            set(ChurchWeeklyAttendance.objects.values_list("church_id", "week", "check_ins", "first_timers")),
+            set(MemberMonthlyAttendance.objects.values_list("church_id", "user_id", "month", "check_ins")),
+        )
+
+    def test_incremental_rollups_match_a_backfill(self):
+        first = self.attend(self.member, 40)
+        self.attend(self.member, 10)
+        self.attend(self.deacon, 10)
+        checked_out = self.attend(self.pastor, 3)
+        checked_out.status = "out"
+        checked_out.save()
+
+        self.authenticate(self.pastor)
+        event = self.create_event()
+        response = self.client.post(f"/api/events/{event.id}/attendance/bulk/",
+                                    {"users": [str(self.member.id), str(self.deacon.id)]}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+        # the member's first check-in goes: their next one becomes the first
+        first.delete()
+
+        incremental = self.rollups()
+        analytics.backfill_rollups([self.church.id])
+        self.assertEqual(self.rollups(), incremental)
+
+    def test_trend_and_member_activity(self):
+        # in check-in order: timestamps are always "now" when rows are written
+        self.attend(self.member, 7)
+        self.attend(self.member, 0)
+        self.attend(self.deacon, 0)
+        self.authenticate(self.pastor)
+
+        weeks = self.client.get("/api/analytics/attendance/", {"weeks": 2}).data["weeks"]
+        self.assertEqual([(w["check_ins"], w["first_timers"]) for w in weeks], [(1, 1), (2, 1)])
+
+        members = self.client.get("/api/analytics/members/", {"months": 2}).data["members"]
+        self.assertEqual([(m["email"], m["total"]) for m in members],
+                         [("member@example.com", 2), ("deacon@example.com", 1), ("pastor@example.com", 0)])
+
+    def test_leaders_only(self):
+        self.authenticate(self.member)
+        self.assertEqual(self.client.get("/api/analytics/attendance/").status_code, 403)
+        self.assertEqual(self.client.get("/api/analytics/members/").status_code, 403)
+
+
+# ======================================================
+# CHECK-IN LOG AND COMPACTION
+# ======================================================
+
+@override_settings(CHECKIN_LOG={"enabled": True, "settle_seconds": 0})
+class CheckInLogTests(ChurchAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.event = self.create_event()
+        # compacted by hand, on this test's connection
+        patch = mock.patch.object(checkins.Compactor, "ensure_running")
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def counter(self):
+        return EventAttendanceCounter.objects.filter(event=self.event).values_list("checked_in", flat=True).first()
+
+    def test_check_in_is_logged_then_compacted(self):
+        self.authenticate(self.member)
+        url = f"/api/events/{self.event.id}/attendance/"
+        self.assertEqual(self.client.post(url).data, {"success": True, "status": "in"})
+
+        self.assertFalse(Attendance.objects.exists())
+        self.assertEqual(self.client.get(url).data["status"], "in")
+
+        self.assertEqual(checkins.compact_all(), 1)
+        self.assertEqual(Attendance.objects.get().user, self.member)
+        self.assertEqual(self.counter(), 1)
+        self.assertFalse(CheckInLog.objects.filter(compacted=False).exists())
+
+    def test_entries_fold_in_order(self):
+        first_at = checkins.append(self.event.id, [self.member.id, self.pastor.id])
+        checkins.append(self.event.id, [self.member.id], "out")
+
+        self.assertEqual(checkins.compact_all(), 3)
+        member = Attendance.objects.get(user=self.member)
+        self.assertEqual((member.status, member.timestamp), ("out", first_at))
+        self.assertEqual(self.counter(), 1)
+        self.assertEqual(count_attendance([self.event.id])[self.event.id],
+                         {"checked_in": 1, "checked_out": 1, "total": 2})
+
+    def test_settling_entries_wait_a_round(self):
+        checkins.append(self.event.id, [self.member.id])
+        self.assertEqual(checkins.compact(settle_seconds=60), 0)
+        self.assertEqual(checkins.compact(settle_seconds=0), 1)
+
+    def test_entries_of_deleted_events_are_history_only(self):
+        checkins.append(self.event.id, [self.member.id])
+        self.event.delete()
+
+        self.assertEqual(checkins.compact_all(), 1)
+        self.assertFalse(Attendance.objects.exists())
+
+    def test_apply_is_idempotent(self):
+        state = {(self.event.id, self.member.id): ("in", timezone.now())}
+        self.assertEqual(checkins.apply(state), 1)
+        self.assertEqual(checkins.apply(state), 0)
+        self.assertEqual(self.counter(), 1)
+
+    def test_prune_keeps_the_uncompacted_tail(self):
+        checkins.append(self.event.id, [self.member.id])
+        checkins.compact_all()
+        checkins.append(self.event.id, [self.pastor.id])
+
+        self.assertEqual(checkins.prune(timezone.now() + timedelta(seconds=1)), 1)
+        self.assertEqual(CheckInLog.objects.get().user_id, self.pastor.id)
+
+
+# ======================================================
+# ASYNC ATTENDANCE + DASHBOARD VIEWS
+# ======================================================
+
+class AsyncViewTests(ChurchAPITestCase):
+    """The async views (routed under ASYNC_VIEWS) answer like the APIViews mounted here."""
+
+    def setUp(self):
+        super().setUp()
+        self.event = self.create_event()
+        self.check_in(self.pastor, self.event)
+        self.factory = AsyncRequestFactory()
+
+    def call(self, view, user, method="get", path="/api/", data=None, **kwargs):
+        headers = {}
+        if user:
+            headers["Authorization"] = f"Bearer {ChurchRefreshToken.for_user(user).access_token}"
+        request = getattr(self.factory, method)(path, data, headers=headers)
+        return async_to_sync(view)(request, **kwargs)
+
+    def assertSameResponse(self, sync_response, async_response):
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(async_response.content, sync_response.content)
+        self.assertEqual(async_response.get("ETag"), sync_response.get("ETag"))
+
+    def test_event_attendance(self):
+        url = f"/api/events/{self.event.id}/attendance/"
+        for user in (self.pastor, self.member):
+            with self.subTest(user=user.email):
+                self.authenticate(user)
+                self.assertSameResponse(
+                    self.client.get(url),
+                    self.call(views.event_attendance, user, path=url, event_id=self.event.id),
+                )
+
+    def test_check_in(self):
+        response = self.call(views.event_attendance, self.member, "post", event_id=self.event.id)
+
+        self.assertEqual(json.loads(response.content), {"success": True, "status": "in"})
+        self.assertEqual(Attendance.objects.get(user=self.member).status, "in")
+        self.assertEqual(EventAttendanceCounter.objects.get(event=self.event).checked_in, 2)
+
+    def test_dashboard(self):
+        self.authenticate(self.member)
+        self.assertSameResponse(self.client.get("/api/dashboard/"),
+                                self.call(views.dashboard, self.member, path="/api/dashboard/"))
+
+    def test_errors(self):
+        self.assertEqual(self.call(views.dashboard, None).status_code, 401)
+        self.assertEqual(self.call(views.dashboard, self.member, "post").status_code, 405)
+        self.assertEqual(self.call(views.event_attendance, self.member, event_id=0).status_code, 404)
+
+        outsider = User.objects.create_user("out@example.com", "secret-pass", full_name="Out Sider")
+        self.assertEqual(self.call(views.event_attendance, outsider, event_id=self.event.id).status_code, 403)
+
+
+# ======================================================
+# WRITE-BEHIND CHECK-IN BUFFER
+# ======================================================
+
+class CheckInBufferTests(ChurchAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.event = self.create_event()
+
+        journal_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(journal_dir.cleanup)
+        self.journal_dir = Path(journal_dir.name)
+        enabled = override_settings(CHECKIN_BUFFER={"enabled": True, "journal_dir": self.journal_dir, "fsync": False})
+        enabled.enable()
+        self.addCleanup(enabled.disable)
+        # flushed by hand, on this test's connection
+        patch = mock.patch.object(checkin_buffer.CheckInBuffer, "_ensure_flusher")
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def buffer(self):
+        return checkin_buffer.CheckInBuffer(**checkin_buffer.options())
+
+    def orphan(self, name, *users, torn=False):
+        at = timezone.now().isoformat()
+        lines = "".join(json.dumps([self.event.id, user.id, "in", at]) + "\n" for user in users)
+        path = self.journal_dir / name
+        path.write_text(lines + ('[1, 2, "in"' if torn else ""))
+        return path
+
+    def test_segments_are_locked_from_the_start(self):
+        buffer = self.buffer()
+        buffer.append(self.event.id, [self.member.id])
+
+        [segment] = self.journal_dir.iterdir()
+        self.assertEqual(segment.suffix, ".jsonl")
+        with open(segment) as other:
+            self.assertFalse(checkin_buffer._try_lock(other))
+        self.assertEqual(self.buffer().replay_orphans(), 0)
+
+        self.assertEqual(checkin_buffer.pending(self.event.id)[self.member.id][0], "in")
+        self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(Attendance.objects.get().user, self.member)
+        self.assertEqual(list(self.journal_dir.iterdir()), [])
+        buffer.close()
+
+    def test_orphaned_segments_are_replayed(self):
+        self.orphan("dead-1.jsonl", self.member, torn=True)
+        self.orphan("dead-2.jsonl", self.pastor)
+
+        self.assertEqual(self.buffer().replay_orphans(), 2)
+        self.assertEqual(set(Attendance.objects.values_list("user_id", flat=True)), {self.member.id, self.pastor.id})
+        self.assertEqual(EventAttendanceCounter.objects.get(event=self.event).checked_in, 2)
+        self.assertEqual(list(self.journal_dir.iterdir()), [])
+
+    def test_locked_segments_are_left_alone(self):
+        path = self.orphan("live-1.jsonl", self.member)
+        with open(path) as live:
+            self.assertTrue(checkin_buffer._try_lock(live))
+            self.assertEqual(self.buffer().replay_orphans(), 0)
+
+        self.assertTrue(path.exists())
+        self.assertFalse(Attendance.objects.exists())
+
+
+# ======================================================
+# VALUES SERIALIZERS
+# ======================================================
+
+class ValuesSerializerTests(ChurchAPITestCase):
+    """Each ValuesSerializer renders to the same bytes as the ModelSerializer it mirrors."""
+
+    def assertSameBytes(self, serializer_class, values_class, queryset):
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        actual = JSONRenderer().render(values_class.many(values_class.values(queryset)))
+        self.assertEqual(actual, expected)
+
+    def test_announcements(self):
+        Announcement.objects.create(church=self.church, title="Retreat", body="Ünïcode — ok", created_by=self.pastor)
+        Announcement.objects.create(church=self.church, title="Orphaned", body="", created_by=None)
+
+        self.assertSameBytes(AnnouncementSerializer, AnnouncementValuesSerializer,
+                             Announcement.objects.order_by("id").select_related("created_by"))
+
+    def test_events(self):
+        starts_at = timezone.now().replace(microsecond=123456)
+        self.create_event(starts_at=starts_at, location="Hall")
+        self.create_event(starts_at=starts_at.replace(microsecond=0), recurrence="weekly", recurrence_interval=2,
+                          recurrence_until=starts_at + timedelta(weeks=8), recurrence_exceptions=["2026-01-11"])
+
+        events = Event.objects.order_by("id").select_related("created_by")
+        for zone in ("UTC", "America/New_York", "Asia/Seoul"):
+            with self.subTest(zone=zone), timezone.override(zone):
+                self.assertSameBytes(EventSerializer, EventValuesSerializer, events)
+
+    def test_attendance(self):
+        event = self.create_event()
+        self.check_in(self.member, event)
+        self.check_in(self.pastor, event, status="out")
+
+        self.assertSameBytes(AttendanceSerializer, AttendanceValuesSerializer,
+                             Attendance.objects.filter(event=event).select_related("user"))
+
+
+# ======================================================
+# SPARSE FIELDSETS, JSON RENDERING AND COMPRESSION
+# ======================================================
+
+class SparseFieldsTests(ChurchAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.announcement = Announcement.objects.create(church=self.church, title="Retreat", body="Saturday",
+                                                        created_by=self.pastor)
+        self.event = self.create_event()
+        self.authenticate(self.member)
+
+    def test_only_requested_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/announcements/", {"fields": "title,id"})
+
+        self.assertEqual(response.data, [{"id": self.announcement.id, "title": "Retreat"}])
+        [select] = [q["sql"] for q in queries if 'FROM "core_announcement"' in q["sql"]]
+        self.assertNotIn('"body"', select)
+
+    def test_relations_are_ids_unless_expanded(self):
+        url = f"/api/events/{self.event.id}/"
+        self.assertEqual(self.client.get(url, {"fields": "created_by"}).data, {"created_by": self.pastor.id})
+        self.assertEqual(
+            self.client.get(url, {"fields": "title", "expand": "created_by"}).data,
+            {"title": "Sunday Service",
+             "created_by": {"id": self.pastor.id, "email": "pastor@example.com", "full_name": "Pastor Kim"}},
+        )
+
+        paged = self.client.get("/api/announcements/", {"fields": "id,created_by", "cursor": ""}).data
+        self.assertEqual(paged["results"], [{"id": self.announcement.id, "created_by": self.pastor.id}])
+
+    def test_unknown_names_are_400(self):
+        for params in [{"fields": "id,secret"}, {"fields": "id", "expand": "title"}, {"expand": "church"}]:
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get("/api/events/", params).status_code, 400)
+
+
+class FastJSONRendererTests(TestCase):
+    payload = {
+        "when": timezone.now(),
+        "day": timezone.localdate(),
+        "amount": Decimal("12.50"),
+        "text": "line\u2028separator\u2029 — Ünïcode",
+        "big": 2 ** 70,
+        "nested": [{"id": 1, "none": None, "ok": True}],
+    }
+
+    def test_same_bytes_as_drf(self):
+        expected = JSONRenderer().render(self.payload)
+        self.assertEqual(FastJSONRenderer().render(self.payload), expected)
+        self.assertIn(b"\\u2028", expected)
+
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(FastJSONRenderer().render(self.payload), expected)
+
+    def test_indented_output_falls_back(self):
+        rendered = FastJSONRenderer().render({"id": 1}, "application/json; indent=2")
+        self.assertEqual(rendered, JSONRenderer().render({"id": 1}, "application/json; indent=2"))
+
+
+class CompressionTests(ChurchAPITestCase):
+    def setUp(self):
+        super().setUp()
+        for n in range(20):
+            Announcement.objects.create(church=self.church, title=f"Announcement {n}", body="x" * 100,
+                                        created_by=self.pastor)
+        self.authenticate(self.member)
+
+    def get(self, **params):
+        return self.client.get("/api/announcements/", params, HTTP_ACCEPT_ENCODING="gzip")
+
+    def test_only_large_responses_are_gzipped(self):
+        self.assertEqual(self.get()["Content-Encoding"], "gzip")
+        self.assertFalse(self.get(fields="id", page_size=1, cursor="").has_header("Content-Encoding"))
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
@@ -9,8 +10,27 @@ from .views import (
     RegisterChurchView,
     RegisterMemberView,
     EventAttendanceView,   # <-- normal APIView, NOT in router
+    EventBulkAttendanceView,
+    DashboardView,
+    SearchView,
+    EventAttendanceExportView,
+    AttendanceTrendView,
+    MemberActivityView,
+    ChurchAttendanceExportView,
+    MemberImportView,
+    event_attendance,
+    dashboard,
+    event_attendance_stream,
+    chat_messages,
+    chat_stream,
 )
 
+# async (event loop) or APIView versions of the hottest endpoints
+if settings.ASYNC_VIEWS:
+    attendance_view, dashboard_view = event_attendance, dashboard
+else:
+    attendance_view, dashboard_view = EventAttendanceView.as_view(), DashboardView.as_view()
+
 router = DefaultRouter()
 router.register("churches", ChurchViewSet)
 router.register("announcements", AnnouncementViewSet)
@@ -24,8 +44,29 @@ urlpatterns = [
     path("auth/register_church/", RegisterChurchView.as_view(), name="register_church"),
     path("auth/register_member/", RegisterMemberView.as_view(), name="register_member"),
 
+    # BULK MEMBER IMPORT (leaders)
+    path("members/import/", MemberImportView.as_view(), name="member_import"),
+
+    # DASHBOARD
+    path("dashboard/", dashboard_view, name="dashboard"),
+
+    # SEARCH (announcements + events)
+    path("search/", SearchView.as_view(), name="search"),
+
     # ATTENDANCE (normal APIView, NOT router)
-    path("events/<int:event_id>/attendance/", EventAttendanceView.as_view()),
+    path("events/<int:event_id>/attendance/", attendance_view),
+    path("events/<int:event_id>/attendance/bulk/", EventBulkAttendanceView.as_view()),
+    path("events/<int:event_id>/attendance/export/", EventAttendanceExportView.as_view()),
+    path("events/<int:event_id>/attendance/stream/", event_attendance_stream),
+    path("attendance/export/", ChurchAttendanceExportView.as_view()),
+
+    # ANALYTICS (leaders, from rollups)
+    path("analytics/attendance/", AttendanceTrendView.as_view(), name="analytics_attendance"),
+    path("analytics/members/", MemberActivityView.as_view(), name="analytics_members"),
+
+    # COMMUNITY CHAT (async)
+    path("chat/messages/", chat_messages, name="chat_messages"),
+    path("chat/stream/", chat_stream, name="chat_stream"),
 
     # ROUTER
     path("", include(router.urls)),
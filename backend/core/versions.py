@@ -0,0 +1,150 @@
+import hashlib
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags, quote_etag
+from rest_framework.response import Response
+
+from .membership import aget_membership, get_membership
+from .models import ChangeVersion
+
+DIRECTORY_KEY = "churches"
+
+
+def church_key(church_id):
+    return f"church:{church_id}"
+
+
+def attendance_key(event_id):
+    return f"attendance:{event_id}"
+
+
+# ======================================================
+# VERSION COUNTERS
+# ======================================================
+
+def bump_version(key):
+    now = timezone.now()
+    updated = ChangeVersion.objects.filter(key=key).update(version=F("version") + 1, updated_at=now)
+    if updated:
+        return
+
+    try:
+        with transaction.atomic():
+            ChangeVersion.objects.create(key=key, version=1, updated_at=now)
+    except IntegrityError:
+        # another writer created it first
+        ChangeVersion.objects.filter(key=key).update(version=F("version") + 1, updated_at=now)
+
+
+def get_version(key):
+    """
+    (version, updated_at) for a scope; (0, None) if it was never written.
+    """
+    row = ChangeVersion.objects.filter(key=key).values_list("version", "updated_at").first()
+    return row or (0, None)
+
+
+async def aget_version(key):
+    row = await ChangeVersion.objects.filter(key=key).values_list("version", "updated_at").afirst()
+    return row or (0, None)
+
+
+# ======================================================
+# CONDITIONAL GET
+# ======================================================
+
+def make_etag(request, key, version):
+    """
+    Weak ETag over the scope version plus everything else the response
+    depends on: path + query, caller, role and negotiated media type.
+    """
+    return _etag(request, key, version, get_membership(request))
+
+
+def _etag(request, key, version, membership):
+    parts = [
+        key,
+        str(version),
+        request.get_full_path(),
+        str(request.user.pk) if request.user.is_authenticated else "",
+        membership.role if membership else "",
+        getattr(request, "accepted_media_type", "") or "",
+    ]
+    digest = hashlib.md5("|".join(parts).encode(), usedforsecurity=False).hexdigest()
+    return "W/" + quote_etag(digest)
+
+
+def is_not_modified(request, etag):
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+
+    wanted = parse_etags(header)
+    return "*" in wanted or etag in wanted or etag[2:] in wanted
+
+
+def set_conditional_headers(response, etag, updated_at):
+    response["ETag"] = etag
+    if updated_at is not None:
+        response["Last-Modified"] = http_date(updated_at.timestamp())
+    response["Cache-Control"] = "private, no-cache"
+    patch_vary_headers(response, ("Authorization", "Accept"))
+    return response
+
+
+def conditional_response(request, key, handler):
+    """
+    Answer If-None-Match with 304 before `handler` runs any queryset or
+    serializer work; otherwise call it and stamp ETag/Last-Modified.
+    """
+    version, updated_at = get_version(key)
+    etag = make_etag(request, key, version)
+
+    if is_not_modified(request, etag):
+        return set_conditional_headers(Response(status=304), etag, updated_at)
+
+    response = handler()
+    if response.status_code == 200:
+        set_conditional_headers(response, etag, updated_at)
+    return response
+
+
+async def aconditional_response(request, key, handler):
+    """conditional_response() for async views; `handler` is a coroutine function."""
+    version, updated_at = await aget_version(key)
+    etag = _etag(request, key, version, await aget_membership(request))
+
+    if is_not_modified(request, etag):
+        return set_conditional_headers(HttpResponse(status=304), etag, updated_at)
+
+    response = await handler()
+    if response.status_code == 200:
+        set_conditional_headers(response, etag, updated_at)
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified on list and retrieve, driven by ChangeVersion.
+    Views implement get_version_key(request) → key or None (no caching).
+    """
+
+    def get_version_key(self, request):
+        return None
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(request, super().retrieve, *args, **kwargs)
+
+    def _conditional(self, request, handler, *args, **kwargs):
+        key = self.get_version_key(request)
+        if key is None:
+            return handler(request, *args, **kwargs)
+
+        return conditional_response(request, key, lambda: handler(request, *args, **kwargs))
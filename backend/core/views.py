@@ -1,12 +1,28 @@
+import asyncio
+import functools
+import json
+from datetime import datetime, time
+from itertools import chain, islice
+
 from rest_framework import viewsets
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.views import APIView
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.conf import settings
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
 
 from rest_framework_simplejwt.views import TokenObtainPairView
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import InvalidToken
 
 from .models import Church, Membership, Announcement, Event, Attendance, User
 from .serializers import (
@@ -14,12 +30,49 @@ from .serializers import (
     ChurchSerializer,
     AnnouncementSerializer,
     EventSerializer,
+    DashboardEventSerializer,
     AttendanceSerializer,
+    BulkCheckInSerializer,
     EmailLoginTokenSerializer,
     RegisterChurchSerializer,
     RegisterMemberSerializer,
+    SearchResultSerializer,
+)
+from .read_serializers import (
+    AnnouncementValuesSerializer,
+    AttendanceValuesSerializer,
+    EventValuesSerializer,
+    ValuesListMixin,
 )
+from .renderers import FastJSONRenderer
+from .sparse import SparseFieldsMixin
 from .permissions import LeadersOnly
+from .membership import aget_membership, get_membership
+from .counters import apply_attendance_changes
+from .versions import (
+    DIRECTORY_KEY,
+    ConditionalGetMixin,
+    aconditional_response,
+    attendance_key,
+    bump_version,
+    church_key,
+    conditional_response,
+)
+from .pagination import AnnouncementCursorPagination, ChurchDirectoryPagination, EventCursorPagination
+from . import analytics, checkin_buffer, checkins, directory, recurrence, search
+from .exports import ENCODERS, attendance_export_response
+from .importer import import_members, parse_csv
+from .authentication import ChurchRefreshToken, authenticate_raw_token
+from .live import attendance_channel, attendance_delta, get_fanout, sse_stream
+from .chat import MAX_BODY, MessageNotSaved, chat_channel, get_broadcaster
+
+
+def bounded_int(value, default, maximum):
+    try:
+        value = int(value) if value is not None else default
+    except ValueError:
+        value = default
+    return max(1, min(value, maximum))
 
 
 # =======================================================
@@ -34,9 +87,38 @@ class MyTokenObtainPairView(TokenObtainPairView):
 # CHURCH VIEWSET
 # =======================================================
 
-class ChurchViewSet(viewsets.ModelViewSet):
+class ChurchViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Church.objects.all()
     serializer_class = ChurchSerializer
+    pagination_class = ChurchDirectoryPagination
+
+    def get_version_key(self, request):
+        return DIRECTORY_KEY
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+
+        q = self.request.query_params.get("q")
+        if self.action == "list" and q:
+            qs = directory.search_churches(qs, q)
+
+        return qs
+
+    def list(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().list(request, *args, **kwargs)
+
+        # Anonymous directory (signup) — shared cache, invalidated on Church writes
+        return self._conditional(request, self.cached_list, *args, **kwargs)
+
+    def cached_list(self, request, *args, **kwargs):
+        data = directory.get_cached(request)
+        if data is not None:
+            return Response(data)
+
+        response = viewsets.ModelViewSet.list(self, request, *args, **kwargs)
+        directory.set_cached(request, response.data)
+        return response
 
     def get_permissions(self):
         if self.action in ["list", "retrieve"]:
@@ -46,7 +128,7 @@ class ChurchViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["get"])
     def my_role(self, request, pk=None):
         church = self.get_object()
-        membership = Membership.objects.filter(user=request.user, church=church).first()
+        membership = get_membership(request, church_id=church.id)
         return Response({"role": membership.role if membership else None})
 
 
@@ -54,55 +136,232 @@ class ChurchViewSet(viewsets.ModelViewSet):
 # ANNOUNCEMENT VIEWSET
 # =======================================================
 
-class AnnouncementViewSet(viewsets.ModelViewSet):
+class AnnouncementViewSet(ConditionalGetMixin, SparseFieldsMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Announcement.objects.all()
     serializer_class = AnnouncementSerializer
+    values_serializer_class = AnnouncementValuesSerializer
     permission_classes = [IsAuthenticated, LeadersOnly]
+    pagination_class = AnnouncementCursorPagination
+
+    def get_version_key(self, request):
+        membership = get_membership(request)
+        return church_key(membership.church_id) if membership else None
 
     def get_queryset(self):
-        user = self.request.user
-        membership = Membership.objects.filter(user=user).first()
+        membership = get_membership(self.request)
         if not membership:
             return Announcement.objects.none()
 
         return Announcement.objects.filter(
-            church=membership.church
+            church_id=membership.church_id
         ).select_related("church", "created_by")
 
     def perform_create(self, serializer):
         user = self.request.user
-        membership = Membership.objects.filter(user=user).first()
-        serializer.save(created_by=user, church=membership.church)
+        membership = get_membership(self.request)
+        serializer.save(created_by_id=user.pk, church_id=membership.church_id)
 
 
 # =======================================================
 # EVENT VIEWSET
 # =======================================================
 
-class EventViewSet(viewsets.ModelViewSet):
+def parse_bound(value):
+    """?from= / ?to= value: ISO date or datetime (naive = server time zone)."""
+    if not value:
+        return None
+
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        parsed = datetime.combine(day, time.min)
+
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class EventViewSet(ConditionalGetMixin, SparseFieldsMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Event.objects.all()
     serializer_class = EventSerializer
+    values_serializer_class = EventValuesSerializer
     permission_classes = [IsAuthenticated, LeadersOnly]
+    pagination_class = EventCursorPagination
+
+    def get_version_key(self, request):
+        membership = get_membership(request)
+        return church_key(membership.church_id) if membership else None
+
+    def list(self, request, *args, **kwargs):
+        """
+        ?from=&to= → occurrences overlapping the window, recurring events
+        expanded (one entry per occurrence, same id), ordered by start.
+        Without them: the stored events, as before.
+        """
+        params = request.query_params
+        if "from" not in params and "to" not in params:
+            return super().list(request, *args, **kwargs)
+
+        try:
+            start, end = parse_bound(params.get("from")), parse_bound(params.get("to"))
+        except ValueError:
+            return Response({"error": "from/to must be ISO dates or datetimes"}, status=400)
+
+        if not start or not end or end <= start:
+            return Response({"error": "from and to are both required, with from < to"}, status=400)
+        if end - start > recurrence.MAX_WINDOW:
+            return Response({"error": f"The window can span at most {recurrence.MAX_WINDOW.days} days"}, status=400)
+
+        return self._conditional(request, self.window_list, start, end)
+
+    def get_sparse_required_fields(self):
+        params = self.request.query_params
+        if self.action == "list" and ("from" in params or "to" in params):
+            # recurrence.expand() reads the whole rule
+            return ("id", "starts_at", "ends_at", "recurrence", "recurrence_interval", "recurrence_until",
+                    "recurrence_exceptions")
+        return super().get_sparse_required_fields()
+
+    def window_list(self, request, start, end):
+        one_off, rules = recurrence.overlapping(self.filter_queryset(self.get_queryset()), start, end)
+        occurrences = recurrence.expand(chain(one_off, rules), start, end)
+        return Response(self.get_serializer(occurrences, many=True).data)
 
     def get_queryset(self):
         user = self.request.user
-        membership = Membership.objects.filter(user=user).first()
+        membership = get_membership(self.request)
         if not membership:
             return Event.objects.none()
 
         qs = Event.objects.filter(
-            church=membership.church
+            church_id=membership.church_id
         ).select_related("church", "created_by")
 
         if self.request.query_params.get("mine") not in [None, "0"]:
-            qs = qs.filter(created_by=user)
+            qs = qs.filter(created_by_id=user.pk)
 
         return qs
 
     def perform_create(self, serializer):
         user = self.request.user
-        membership = Membership.objects.filter(user=user).first()
-        serializer.save(created_by=user, church=membership.church)
+        membership = get_membership(self.request)
+        serializer.save(created_by_id=user.pk, church_id=membership.church_id)
+
+
+# =======================================================
+# DASHBOARD (ONE ROUND TRIP FOR THE LANDING PAGE)
+# =======================================================
+
+class DashboardView(APIView):
+    """
+    Latest announcements, upcoming events with attendance counts, and the
+    caller's role/church. Query count is fixed regardless of data size.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    default_limit = 5
+    max_limit = 20
+
+    def get(self, request):
+        limit = bounded_int(request.query_params.get("limit"), self.default_limit, self.max_limit)
+
+        membership = get_membership(request)
+        if not membership:
+            return Response(EMPTY_DASHBOARD)
+
+        church = Church.objects.get(id=membership.church_id)
+        announcements, events, latest, one_off, rules = dashboard_querysets(church.id, limit)
+
+        return Response(dashboard_payload(
+            membership, church, announcements.count(), events.count(), latest, [*one_off, *rules], limit
+        ))
+
+
+EMPTY_DASHBOARD = {
+    "role": None,
+    "church": None,
+    "counts": {"announcements": 0, "events": 0},
+    "announcements": [],
+    "events": [],
+}
+
+
+def dashboard_querysets(church_id, limit):
+    """(announcements, events, latest, one_off, rules) — shared with the async dashboard."""
+    announcements = Announcement.objects.filter(church_id=church_id)
+    events = Event.objects.filter(church_id=church_id)
+
+    latest = (
+        announcements.select_related("created_by")
+        .order_by("-created_at", "-id")[:limit]
+    )
+    now = timezone.now()
+    with_counts = events.select_related("created_by", "attendance_counter")
+    one_off = with_counts.filter(recurrence="", starts_at__gte=now).order_by("starts_at", "id")[:limit]
+    rules = with_counts.filter(recurrence__in=["weekly", "monthly"]).filter(
+        Q(recurrence_until__isnull=True) | Q(recurrence_until__gte=now)
+    )
+    return announcements, events, latest, one_off, rules
+
+
+def dashboard_payload(membership, church, announcement_count, event_count, latest, candidates, limit):
+    # next `limit` occurrences of either kind; rules expand lazily
+    now = timezone.now()
+    upcoming = islice(recurrence.expand(candidates, now, now + recurrence.MAX_WINDOW), limit)
+
+    return {
+        "role": membership.role,
+        "church": ChurchSerializer(church).data,
+        "counts": {
+            "announcements": announcement_count,
+            "events": event_count,
+        },
+        "announcements": AnnouncementSerializer(latest, many=True).data,
+        "events": DashboardEventSerializer(upcoming, many=True).data,
+    }
+
+
+# =======================================================
+# SEARCH (ANNOUNCEMENTS + EVENTS, FULL-TEXT)
+# =======================================================
+
+class SearchView(APIView):
+    """
+    GET ?q=words[&type=announcement|event][&limit=N] → the caller's
+    church's announcements and events matching every word (as a prefix),
+    best first. Served from the core.search index, never a table scan.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    default_limit = 20
+    max_limit = 50
+
+    def get(self, request):
+        params = request.query_params
+        if not search.terms(params.get("q")):
+            return Response({"error": "q must contain at least one word"}, status=400)
+
+        kinds = tuple(search.KINDS)
+        if params.get("type"):
+            kinds = tuple(k for k in params["type"].split(",") if k in search.KINDS)
+            if not kinds:
+                return Response({"error": f"type must be one of {', '.join(search.KINDS)}"}, status=400)
+
+        limit = bounded_int(params.get("limit"), self.default_limit, self.max_limit)
+
+        membership = get_membership(request)
+        if not membership:
+            return Response({"count": 0, "results": []})
+
+        def respond():
+            hits = search.search(membership.church_id, params["q"], kinds, limit)
+            return Response({"count": len(hits), "results": SearchResultSerializer(hits, many=True).data})
+
+        return conditional_response(request, church_key(membership.church_id), respond)
 
 
 # =======================================================
@@ -113,36 +372,46 @@ class EventAttendanceView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, event_id):
-        user = request.user
-
         # Get event or 404
         event = get_object_or_404(Event, id=event_id)
 
         # User's membership in church
-        membership = Membership.objects.filter(user=user, church=event.church).first()
+        membership = get_membership(request, church_id=event.church_id)
         if not membership:
             return Response({"error": "Not part of this church"}, status=403)
 
+        if checkin_buffer.deferred():
+            # check-ins not flushed/compacted yet: attendance versions only move
+            # when they reach Attendance, so this response can't carry an ETag
+            pending = checkin_buffer.pending(event.id, None if membership.is_leader else request.user.pk)
+            if pending:
+                return self.attendance_response(request, event, membership, pending)
+
+        return conditional_response(
+            request,
+            attendance_key(event.id),
+            lambda: self.attendance_response(request, event, membership),
+        )
+
+    def attendance_response(self, request, event, membership, pending=None):
+        user = request.user
+
         # Leaders → return FULL attendance list (flat array)
-        if membership.role in ["pastor", "deacon"]:
-            rows = Attendance.objects.filter(event=event).select_related("user")
+        if membership.is_leader:
+            rows = Attendance.objects.filter(event=event)
+            if not pending:
+                return Response(AttendanceValuesSerializer.many(AttendanceValuesSerializer.values(rows)))
+
+            rows = checkins.merge(event, list(rows.select_related("user")), pending)
             serializer = AttendanceSerializer(rows, many=True)
             return Response(serializer.data)
 
         # Members → return ONLY their own record
-        record = Attendance.objects.filter(event=event, user=user).first()
-        if not record:
-            return Response({
-                "signed_up": False,
-                "status": None,
-                "timestamp": None
-            })
-
-        return Response({
-            "signed_up": True,
-            "status": record.status,
-            "timestamp": record.timestamp
-        })
+        record = Attendance.objects.filter(event=event, user_id=user.pk).first()
+        if pending:
+            merged = checkins.merge(event, [record] if record else [], pending)
+            record = merged[0] if merged else None
+        return Response(member_attendance(record))
 
     def post(self, request, event_id):
         user = request.user
@@ -151,13 +420,24 @@ class EventAttendanceView(APIView):
         event = get_object_or_404(Event, id=event_id)
 
         # ensure user belongs to church
-        membership = Membership.objects.filter(user=user, church=event.church).first()
+        membership = get_membership(request, church_id=event.church_id)
         if not membership:
             return Response({"error": "Not part of this church"}, status=403)
 
+        if checkin_buffer.deferred():
+            # journaled (buffer) or one INSERT (log); Attendance, counters and
+            # rollups follow at the next flush/compaction
+            checked_in_at = checkin_buffer.append(event.id, [user.pk])
+            key = attendance_channel(event.id)
+            fanout = get_fanout()
+            if fanout.is_open(key):
+                email, full_name = User.objects.values_list("email", "full_name").get(pk=user.pk)
+                fanout.publish(key, attendance_delta(event.id, user.pk, email, full_name, "in", checked_in_at))
+            return Response({"success": True, "status": "in"})
+
         # Update or create the attendance record
         record, created = Attendance.objects.update_or_create(
-            user=user,
+            user_id=user.pk,
             event=event,
             defaults={"status": "in"}
         )
@@ -165,6 +445,556 @@ class EventAttendanceView(APIView):
         return Response({"success": True, "status": record.status})
 
 
+def member_attendance(record):
+    if not record:
+        return {
+            "signed_up": False,
+            "status": None,
+            "timestamp": None
+        }
+
+    return {
+        "signed_up": True,
+        "status": record.status,
+        "timestamp": record.timestamp
+    }
+
+
+# =======================================================
+# ASYNC VIEW HELPERS (ASGI)
+# =======================================================
+
+async def _authenticate_async(request):
+    """
+    (user, None) or (None, 401 response) for plain async views; sets
+    request.user. Auth: Bearer header or ?token= (EventSource cannot set
+    headers). Tokens carry their claims; the revocation check reads a
+    cached epoch, on a worker thread that does not block the loop.
+    """
+    header = request.headers.get("Authorization", "")
+    raw = header[7:] if header.startswith("Bearer ") else request.GET.get("token")
+    if not raw:
+        return None, JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+
+    try:
+        user = await sync_to_async(authenticate_raw_token, thread_sensitive=False)(raw)
+    except InvalidToken:
+        return None, JsonResponse({"detail": "Given token not valid for any token type"}, status=401)
+
+    request.user = user
+    return user, None
+
+
+def async_api_view(methods, permission_classes=()):
+    """
+    Async function views with APIView's contract: 405 for other methods,
+    401 without a valid token, then `permission_classes` — awaiting their
+    ahas_permission() where defined (LeadersOnly), else has_permission()
+    on a DB thread. CSRF-exempt like APIView: auth is a header, not a cookie.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return JsonResponse({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+
+            _, error = await _authenticate_async(request)
+            if error:
+                return error
+            # what DRF's negotiation picks for these JSON-only views; ETags include it
+            request.accepted_media_type = FastJSONRenderer.media_type
+
+            for permission in (permission_class() for permission_class in permission_classes):
+                if hasattr(permission, "ahas_permission"):
+                    allowed = await permission.ahas_permission(request, view)
+                else:
+                    allowed = await sync_to_async(permission.has_permission)(request, view)
+                if not allowed:
+                    message = getattr(permission, "message", PermissionDenied.default_detail)
+                    return render_async({"detail": message}, status=403)
+
+            return await view(request, *args, **kwargs)
+
+        wrapper.csrf_exempt = True
+        return wrapper
+
+    return decorator
+
+
+def render_async(data, status=200):
+    """Same bytes as a DRF Response with FastJSONRenderer (datetimes included)."""
+    return HttpResponse(FastJSONRenderer().render(data), content_type="application/json", status=status)
+
+
+# =======================================================
+# ASYNC ATTENDANCE + DASHBOARD (ASGI, SEE settings.ASYNC_VIEWS)
+# =======================================================
+
+@async_api_view(["GET", "POST"])
+async def event_attendance(request, event_id):
+    """
+    EventAttendanceView on the event loop: same responses, ETags and
+    check-in log handling. Queries go through the async ORM.
+    """
+    event = await Event.objects.only("id", "church_id").filter(id=event_id).afirst()
+    if event is None:
+        return render_async({"detail": "No Event matches the given query."}, status=404)
+
+    membership = await aget_membership(request, church_id=event.church_id)
+    if not membership:
+        return render_async({"error": "Not part of this church"}, status=403)
+
+    if request.method == "POST":
+        return await _check_in_async(request, event)
+
+    if checkin_buffer.deferred():
+        pending = await sync_to_async(checkin_buffer.pending)(event.id, None if membership.is_leader else request.user.pk)
+        if pending:
+            return await _attendance_async(request, event, membership, pending)
+
+    return await aconditional_response(
+        request,
+        attendance_key(event.id),
+        lambda: _attendance_async(request, event, membership),
+    )
+
+
+async def _attendance_async(request, event, membership, pending=None):
+    if membership.is_leader:
+        rows = Attendance.objects.filter(event=event)
+        if not pending:
+            values = AttendanceValuesSerializer.values(rows)
+            return render_async(AttendanceValuesSerializer.many([row async for row in values]))
+
+        rows = [row async for row in rows.select_related("user")]
+        rows = await sync_to_async(checkins.merge)(event, rows, pending)
+        return render_async(AttendanceSerializer(rows, many=True).data)
+
+    record = await Attendance.objects.filter(event=event, user_id=request.user.pk).afirst()
+    if pending:
+        merged = await sync_to_async(checkins.merge)(event, [record] if record else [], pending)
+        record = merged[0] if merged else None
+    return render_async(member_attendance(record))
+
+
+async def _check_in_async(request, event):
+    user = request.user
+
+    if checkin_buffer.deferred():
+        checked_in_at = await sync_to_async(checkin_buffer.append)(event.id, [user.pk])
+        key = attendance_channel(event.id)
+        fanout = get_fanout()
+        if fanout.is_open(key):
+            email, full_name = await User.objects.values_list("email", "full_name").aget(pk=user.pk)
+            fanout.publish(key, attendance_delta(event.id, user.pk, email, full_name, "in", checked_in_at))
+        return render_async({"success": True, "status": "in"})
+
+    record, _ = await Attendance.objects.aupdate_or_create(
+        user_id=user.pk,
+        event=event,
+        defaults={"status": "in"}
+    )
+    return render_async({"success": True, "status": record.status})
+
+
+@async_api_view(["GET"])
+async def dashboard(request):
+    """DashboardView on the event loop; same payload and query count."""
+    limit = bounded_int(request.GET.get("limit"), DashboardView.default_limit, DashboardView.max_limit)
+
+    membership = await aget_membership(request)
+    if not membership:
+        return render_async(EMPTY_DASHBOARD)
+
+    church = await Church.objects.aget(id=membership.church_id)
+    announcements, events, latest, one_off, rules = dashboard_querysets(church.id, limit)
+
+    return render_async(dashboard_payload(
+        membership,
+        church,
+        await announcements.acount(),
+        await events.acount(),
+        [announcement async for announcement in latest],
+        [event async for event in one_off] + [event async for event in rules],
+        limit,
+    ))
+
+
+# =======================================================
+# LIVE ATTENDANCE FEED (SERVER-SENT EVENTS, ASGI ONLY)
+# =======================================================
+
+@async_api_view(["GET"])
+async def event_attendance_stream(request, event_id):
+    """
+    text/event-stream of check-in/out deltas for leaders of the event's
+    church. Auth: Bearer header or ?token= (EventSource cannot set headers).
+    Resumes from the Last-Event-ID header the browser sends on reconnect.
+    Each connection is an idle asyncio task, not a thread.
+    """
+    church_id = await Event.objects.filter(id=event_id).values_list("church_id", flat=True).afirst()
+    if church_id is None:
+        return JsonResponse({"detail": "Not found."}, status=404)
+
+    membership = await aget_membership(request, church_id)
+    if not membership or not membership.is_leader:
+        return JsonResponse({"error": "Only pastors and deacons can follow attendance"}, status=403)
+
+    return _sse_response(request, attendance_channel(event_id), event="attendance")
+
+
+def _sse_response(request, key, event):
+    try:
+        last_event_id = int(request.headers.get("Last-Event-ID") or request.GET.get("last_event_id") or 0) or None
+    except ValueError:
+        last_event_id = None
+
+    response = StreamingHttpResponse(
+        sse_stream(
+            key,
+            last_event_id=last_event_id,
+            max_seconds=getattr(settings, "LIVE_STREAM_MAX_SECONDS", 300),
+            event=event,
+        ),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+# =======================================================
+# COMMUNITY CHAT (ASGI ONLY)
+# =======================================================
+
+@async_api_view(["GET", "POST"])
+async def chat_messages(request):
+    """
+    GET  ?before=<id>&limit=  → {"results": [...oldest first], "next_before"}
+    POST {"body": "..."}      → the stored message (201)
+    Scoped to the caller's church. History comes from the in-memory ring;
+    posts are written to the DB in batches and broadcast once stored.
+    """
+    user = request.user
+    membership = await aget_membership(request)
+    if not membership:
+        return render_async({"error": "User has no church"}, status=400)
+
+    broadcaster = get_broadcaster()
+
+    if request.method == "GET":
+        try:
+            before = int(request.GET["before"]) if request.GET.get("before") else None
+            limit = min(max(int(request.GET.get("limit", 50)), 1), broadcaster.history_size)
+        except ValueError:
+            return render_async({"error": "before and limit must be integers"}, status=400)
+
+        results = await sync_to_async(broadcaster.history)(membership.church_id, before, limit)
+        next_before = results[0]["id"] if len(results) == limit else None
+        return render_async({"results": results, "next_before": next_before})
+
+    try:
+        body = (json.loads(request.body or b"{}").get("body") or "").strip()
+    except (ValueError, AttributeError):
+        return render_async({"error": "Invalid JSON"}, status=400)
+
+    if not body:
+        return render_async({"body": ["This field may not be blank."]}, status=400)
+    if len(body) > MAX_BODY:
+        return render_async({"body": [f"Ensure this field has no more than {MAX_BODY} characters."]}, status=400)
+
+    full_name = await User.objects.filter(id=user.pk).values_list("full_name", flat=True).afirst()
+    stored = await sync_to_async(broadcaster.post)(membership.church_id, user.pk, full_name, body)
+    try:
+        message = await asyncio.wrap_future(stored)
+    except MessageNotSaved:
+        return render_async({"error": "Message could not be saved, try again"}, status=503)
+    return render_async(message, status=201)
+
+
+@async_api_view(["GET"])
+async def chat_stream(request):
+    """
+    text/event-stream of new messages ("message" events) in the caller's
+    church. Same auth and resume rules as the attendance feed.
+    """
+    membership = await aget_membership(request)
+    if not membership:
+        return render_async({"error": "User has no church"}, status=400)
+
+    # a warm room is relayed: messages posted to other workers reach this one
+    await sync_to_async(get_broadcaster().warm)(membership.church_id)
+    return _sse_response(request, chat_channel(membership.church_id), event="message")
+
+
+# =======================================================
+# BULK CHECK-IN (USHERS / KIOSKS, LEADERS ONLY)
+# =======================================================
+
+def parse_user_key(key):
+    """
+    Bulk check-in key → ("id", n) or ("email", lowercased). Ids are ASCII
+    decimals: "²".isdigit() is true but int() rejects it. Ids past
+    BigAutoField's range can't match anyone.
+    """
+    if key.isascii() and key.isdecimal():
+        user_id = int(key)
+        return ("id", user_id) if user_id < 2 ** 63 else ("invalid", key)
+    return ("email", key.lower())
+
+
+class EventBulkAttendanceView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, event_id):
+        event = get_object_or_404(Event.objects.only("id", "church_id"), id=event_id)
+
+        membership = get_membership(request, church_id=event.church_id)
+        if not membership or not membership.is_leader:
+            return Response({"error": "Only pastors and deacons can check in others"}, status=403)
+
+        serializer = BulkCheckInSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        keys = serializer.validated_data["users"]
+        status = serializer.validated_data["status"]
+
+        parsed = {key: parse_user_key(key) for key in keys}
+        ids = {value for kind, value in parsed.values() if kind == "id"}
+        emails = {value for kind, value in parsed.values() if kind == "email"}
+
+        # One query: which of the requested users belong to this church
+        members = (
+            Membership.objects.filter(church_id=event.church_id)
+            .annotate(email_lower=Lower("user__email"))
+            .filter(Q(user_id__in=ids) | Q(email_lower__in=emails))
+            .values_list("user_id", "user__email", "user__full_name")
+        )
+
+        found = {}
+        profiles = {}
+        for user_id, email, full_name in members:
+            found["id", user_id] = user_id
+            found["email", email.lower()] = user_id
+            profiles[user_id] = (email, full_name)
+
+        results = []
+        to_upsert = {}
+        for key in keys:
+            user_id = found.get(parsed[key])
+            if user_id is None:
+                results.append({"user": key, "success": False, "error": "Not part of this church"})
+                continue
+
+            to_upsert[user_id] = Attendance(event_id=event.id, user_id=user_id, status=status)
+            results.append({"user": key, "user_id": user_id, "success": True, "status": status})
+
+        if checkins.log_enabled():
+            checkins.append(event.id, list(to_upsert), status)
+        else:
+            self.upsert(event, to_upsert)
+
+        key = attendance_channel(event.id)
+        fanout = get_fanout()
+        if fanout.is_open(key):
+            now = timezone.now()
+            for user_id in to_upsert:
+                email, full_name = profiles[user_id]
+                fanout.publish(key, attendance_delta(event.id, user_id, email, full_name, status, now))
+
+        succeeded = sum(r["success"] for r in results)
+        return Response({
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "results": results,
+        })
+
+    def upsert(self, event, to_upsert):
+        # One statement: INSERT ... ON CONFLICT (event, user) DO UPDATE SET status
+        with transaction.atomic():
+            existing = dict(
+                Attendance.objects.filter(event_id=event.id, user_id__in=to_upsert)
+                .values_list("user_id", "status")
+            )
+            Attendance.objects.bulk_create(
+                to_upsert.values(),
+                update_conflicts=True,
+                unique_fields=["event", "user"],
+                update_fields=["status"],
+            )
+            # bulk_create skips post_save: move the counters by the status
+            # changes and roll up only the rows that are new
+            apply_attendance_changes(
+                (event.id, existing.get(user_id), attendance.status) for user_id, attendance in to_upsert.items()
+            )
+            analytics.record_check_ins(event.church_id, [
+                (user_id, attendance.timestamp)
+                for user_id, attendance in to_upsert.items() if user_id not in existing
+            ])
+            bump_version(attendance_key(event.id))
+
+
+# =======================================================
+# ATTENDANCE ANALYTICS (LEADERS ONLY, FROM ROLLUPS)
+# =======================================================
+
+class AttendanceTrendView(APIView):
+    """
+    GET ?weeks=N → check-ins and first-time visitors per week for the last
+    N weeks. Reads at most N rollup rows, however much attendance exists.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    default_weeks = 12
+    max_weeks = 104
+
+    def get(self, request):
+        membership = get_membership(request)
+        if not membership or not membership.is_leader:
+            return Response({"error": "Only pastors and deacons can view analytics"}, status=403)
+
+        # no ETag: the window moves with the calendar, not with church writes
+        weeks = bounded_int(request.query_params.get("weeks"), self.default_weeks, self.max_weeks)
+        return Response({"weeks": analytics.weekly_trend(membership.church_id, weeks)})
+
+
+class MemberActivityView(APIView):
+    """
+    GET ?months=N → every member's check-ins per month for the last N
+    months, total and current monthly streak, longest streak first.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    default_months = 12
+    max_months = 36
+
+    def get(self, request):
+        membership = get_membership(request)
+        if not membership or not membership.is_leader:
+            return Response({"error": "Only pastors and deacons can view analytics"}, status=403)
+
+        months = bounded_int(request.query_params.get("months"), self.default_months, self.max_months)
+        members = Membership.objects.filter(church_id=membership.church_id).values_list(
+            "user_id", "user__email", "user__full_name"
+        )
+        window, activity = analytics.member_activity(membership.church_id, members, months)
+        return Response({"months": window, "members": activity})
+
+
+# =======================================================
+# STREAMING ATTENDANCE EXPORT (LEADERS ONLY)
+# =======================================================
+
+class AttendanceExportView(APIView):
+    """
+    Streams CSV (default) or NDJSON with ?type=ndjson. Rows go straight from
+    the DB cursor to the socket, so memory stays flat for any export size.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def perform_content_negotiation(self, request, force=False):
+        # the body is CSV/NDJSON whatever the Accept header says
+        return super().perform_content_negotiation(request, force=True)
+
+    def get_export_type(self, request):
+        export_type = request.query_params.get("type", "csv")
+        return export_type if export_type in ENCODERS else None
+
+
+class EventAttendanceExportView(AttendanceExportView):
+    def get(self, request, event_id):
+        event = get_object_or_404(Event.objects.only("id", "church_id"), id=event_id)
+
+        membership = get_membership(request, church_id=event.church_id)
+        if not membership or not membership.is_leader:
+            return Response({"error": "Only pastors and deacons can export attendance"}, status=403)
+
+        export_type = self.get_export_type(request)
+        if not export_type:
+            return Response({"error": "type must be csv or ndjson"}, status=400)
+
+        return attendance_export_response(
+            request,
+            Attendance.objects.filter(event_id=event.id),
+            export_type,
+            f"event-{event.id}-attendance",
+        )
+
+
+class ChurchAttendanceExportView(AttendanceExportView):
+    """
+    Whole church, optionally limited to events starting in [from, to).
+    """
+
+    def get(self, request):
+        membership = get_membership(request)
+        if not membership or not membership.is_leader:
+            return Response({"error": "Only pastors and deacons can export attendance"}, status=403)
+
+        export_type = self.get_export_type(request)
+        if not export_type:
+            return Response({"error": "type must be csv or ndjson"}, status=400)
+
+        try:
+            start = parse_bound(request.query_params.get("from"))
+            end = parse_bound(request.query_params.get("to"))
+        except ValueError:
+            return Response({"error": "from/to must be ISO dates or datetimes"}, status=400)
+
+        qs = Attendance.objects.filter(event__church_id=membership.church_id)
+        if start:
+            qs = qs.filter(event__starts_at__gte=start)
+        if end:
+            qs = qs.filter(event__starts_at__lt=end)
+
+        return attendance_export_response(request, qs, export_type, f"church-{membership.church_id}-attendance")
+
+
+# =======================================================
+# BULK MEMBER IMPORT (LEADERS ONLY)
+# =======================================================
+
+class MemberImportView(APIView):
+    """
+    JSON body {"members": [{email, full_name, password?, role?}, ...]}
+    or multipart upload `file` (CSV with a header row, or a JSON list).
+    Imports into the caller's church.
+    """
+
+    permission_classes = [IsAuthenticated]
+    parser_classes = [JSONParser, MultiPartParser]
+
+    def post(self, request):
+        membership = get_membership(request)
+        if not membership or not membership.is_leader:
+            return Response({"error": "Only pastors and deacons can import members"}, status=403)
+
+        upload = request.FILES.get("file")
+        if upload:
+            try:
+                text = upload.read().decode("utf-8-sig")
+            except UnicodeDecodeError:
+                return Response({"error": "File must be UTF-8"}, status=400)
+
+            if upload.name.lower().endswith(".json"):
+                try:
+                    rows = json.loads(text)
+                except ValueError:
+                    return Response({"error": "Invalid JSON file"}, status=400)
+            else:
+                rows = parse_csv(text)
+        else:
+            rows = request.data.get("members")
+
+        if not isinstance(rows, list) or not rows:
+            return Response({"error": "Provide a non-empty members list or a file"}, status=400)
+
+        report = import_members(membership.church_id, rows)
+        return Response(report, status=201 if report["created"] else 200)
+
+
 # =======================================================
 # REGISTER CHURCH (CREATES CHURCH + PASTOR ACCOUNT)
 # =======================================================
@@ -177,7 +1007,7 @@ class RegisterChurchView(APIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
 
-        refresh = RefreshToken.for_user(user)
+        refresh = ChurchRefreshToken.for_user(user)
         return Response({
             "user": UserSerializer(user).data,
             "access": str(refresh.access_token),
@@ -197,7 +1027,7 @@ class RegisterMemberView(APIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
 
-        refresh = RefreshToken.for_user(user)
+        refresh = ChurchRefreshToken.for_user(user)
         return Response({
             "user": UserSerializer(user).data,
             "access": str(refresh.access_token),
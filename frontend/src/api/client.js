@@ -1,5 +1,6 @@
 // src/api/client.js
 import axios from "axios";
+import { openLiveStream } from "./liveStream";
 
 // Prefer environment variable; fallback to local dev API URL
 const BASE_URL = import.meta.env.VITE_API_BASE || "http://127.0.0.1:8000/api/";
@@ -19,19 +20,36 @@ client.interceptors.request.use((config) => {
 });
 
 // ========= TOKEN REFRESH LOGIC ========= //
-let isRefreshing = false;
-let queuedRequests = [];
+let refreshing = null;
 
-// Add a request to queue (waiting for new token)
-const subscribeToRefresh = (cb) => {
-  queuedRequests.push(cb);
-};
+// One refresh at a time; everyone waiting gets the same new access token
+export function refreshAccessToken() {
+  if (refreshing) return refreshing;
 
-// Execute all queued requests after token refresh
-const processQueue = (newToken) => {
-  queuedRequests.forEach((cb) => cb(newToken));
-  queuedRequests = [];
-};
+  const refresh = localStorage.getItem("refresh");
+  if (!refresh) {
+    return Promise.reject(new Error("No refresh token")); // → logout
+  }
+
+  refreshing = axios
+    .post(`${BASE_URL.replace(/\/$/, "")}/token/refresh/`, { refresh })
+    .then((response) => {
+      const newAccess = response.data.access;
+      localStorage.setItem("access", newAccess);
+      return newAccess;
+    })
+    .catch((refreshError) => {
+      // Refresh token expired → logout fully
+      localStorage.removeItem("access");
+      localStorage.removeItem("refresh");
+      throw refreshError;
+    })
+    .finally(() => {
+      refreshing = null;
+    });
+
+  return refreshing;
+}
 
 // ========= RESPONSE INTERCEPTOR ========= //
 client.interceptors.response.use(
@@ -49,53 +67,29 @@ client.interceptors.response.use(
       !original._retry
     ) {
       original._retry = true;
-      const refresh = localStorage.getItem("refresh");
 
-      if (!refresh) {
+      if (!localStorage.getItem("refresh")) {
         return Promise.reject(error); // No refresh token → logout
       }
 
-      // If refresh is already in progress → queue this request
-      if (isRefreshing) {
-        return new Promise((resolve) => {
-          subscribeToRefresh((newToken) => {
-            original.headers.Authorization = `Bearer ${newToken}`;
-            resolve(client(original));
-          });
-        });
-      }
-
-      // Start a refresh
-      isRefreshing = true;
-
-      try {
-        const response = await axios.post(
-          `${BASE_URL.replace(/\/$/, "")}/token/refresh/`,
-          { refresh }
-        );
-
-        const newAccess = response.data.access;
-        localStorage.setItem("access", newAccess);
+      const newAccess = await refreshAccessToken();
 
-        isRefreshing = false;
-        processQueue(newAccess);
-
-        // Retry original request with new token
-        original.headers.Authorization = `Bearer ${newAccess}`;
-        return client(original);
-      } catch (refreshError) {
-        isRefreshing = false;
-
-        // Refresh token expired → logout fully
-        localStorage.removeItem("access");
-        localStorage.removeItem("refresh");
-
-        return Promise.reject(refreshError);
-      }
+      // Retry original request with new token
+      original.headers.Authorization = `Bearer ${newAccess}`;
+      return client(original);
     }
 
     return Promise.reject(error);
   }
 );
 
+// ========= LIVE STREAMS (SERVER-SENT EVENTS) ========= //
+// `path` is relative to the API base, like client.get(); returns close()
+export function liveStream(path, handlers) {
+  return openLiveStream(`${BASE_URL.replace(/\/?$/, "/")}${path}`, handlers, {
+    getToken: () => localStorage.getItem("access"),
+    refreshToken: refreshAccessToken,
+  });
+}
+
 export default client;
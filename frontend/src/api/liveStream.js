@@ -0,0 +1,70 @@
+// src/api/liveStream.js
+// EventSource cannot send headers, so streams authenticate with ?token=.
+// The browser's own reconnect would resend that token after it expires
+// (or is revoked by a role change), so on error we close the source,
+// refresh the token and open a new one, resuming from the last event id.
+
+const MAX_RETRY_MS = 30000;
+
+export function openLiveStream(
+  url,
+  handlers,
+  {
+    getToken,
+    refreshToken,
+    EventSourceImpl = globalThis.EventSource,
+    retryMs = 3000,
+    setTimer = setTimeout,
+    clearTimer = clearTimeout,
+  }
+) {
+  let source = null;
+  let timer = null;
+  let lastEventId = "";
+  let failures = 0;
+  let closed = false;
+
+  const track = (msg) => {
+    if (msg.lastEventId) lastEventId = msg.lastEventId;
+  };
+
+  const connect = (token) => {
+    const params = new URLSearchParams({ token: token || "" });
+    if (lastEventId) params.set("last_event_id", lastEventId);
+    source = new EventSourceImpl(`${url}?${params}`);
+
+    // sent first on every connection: we're back, reset the backoff
+    source.addEventListener("ready", (msg) => {
+      failures = 0;
+      track(msg);
+    });
+
+    Object.entries(handlers).forEach(([event, handle]) => {
+      source.addEventListener(event, (msg) => {
+        track(msg);
+        handle(msg);
+      });
+    });
+
+    source.onerror = () => {
+      source.close();
+      const delay = Math.min(retryMs * 2 ** failures, MAX_RETRY_MS);
+      failures += 1;
+
+      refreshToken().then(
+        (fresh) => {
+          if (!closed) timer = setTimer(() => connect(fresh), delay);
+        },
+        () => {} // refresh token expired → logged out, stay closed
+      );
+    };
+  };
+
+  connect(getToken());
+
+  return () => {
+    closed = true;
+    clearTimer(timer);
+    source.close();
+  };
+}
@@ -0,0 +1,97 @@
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import { openLiveStream } from "./liveStream.js";
+
+class FakeEventSource {
+  static opened = [];
+
+  constructor(url) {
+    this.url = new URL(url);
+    this.listeners = {};
+    this.closed = false;
+    FakeEventSource.opened.push(this);
+  }
+
+  addEventListener(event, handle) {
+    (this.listeners[event] ||= []).push(handle);
+  }
+
+  emit(event, data, lastEventId = "") {
+    (this.listeners[event] || []).forEach((handle) => handle({ data, lastEventId }));
+  }
+
+  close() {
+    this.closed = true;
+  }
+}
+
+function open(refreshToken) {
+  FakeEventSource.opened = [];
+  const timers = [];
+  const received = [];
+  const close = openLiveStream(
+    "http://api.test/events/1/attendance/stream/",
+    { attendance: (msg) => received.push(msg.data) },
+    {
+      getToken: () => "stale",
+      refreshToken,
+      EventSourceImpl: FakeEventSource,
+      setTimer: (fn, delay) => timers.push({ fn, delay }),
+      clearTimer: () => {},
+    }
+  );
+  return { close, timers, received };
+}
+
+const flush = () => new Promise((resolve) => setImmediate(resolve));
+
+test("reconnects with a refreshed token, resuming after the last event", async () => {
+  const { timers, received } = open(async () => "fresh");
+  const [first] = FakeEventSource.opened;
+  assert.equal(first.url.searchParams.get("token"), "stale");
+
+  first.emit("ready", "{}", "4");
+  first.emit("attendance", "delta", "5");
+  first.onerror();
+  await flush();
+
+  assert.ok(first.closed);
+  assert.deepEqual(received, ["delta"]);
+  assert.equal(timers.length, 1);
+
+  timers[0].fn();
+  const second = FakeEventSource.opened[1];
+  assert.equal(second.url.searchParams.get("token"), "fresh");
+  assert.equal(second.url.searchParams.get("last_event_id"), "5");
+});
+
+test("backs off while failing and resets once connected", async () => {
+  const { timers } = open(async () => "fresh");
+
+  for (let i = 0; i < 3; i++) {
+    FakeEventSource.opened.at(-1).onerror();
+    await flush();
+    timers.at(-1).fn();
+  }
+  assert.deepEqual(timers.map((t) => t.delay), [3000, 6000, 12000]);
+
+  FakeEventSource.opened.at(-1).emit("ready", "{}", "1");
+  FakeEventSource.opened.at(-1).onerror();
+  await flush();
+  assert.equal(timers.at(-1).delay, 3000);
+});
+
+test("stays closed when the refresh fails or the caller closed it", async () => {
+  const loggedOut = open(async () => {
+    throw new Error("refresh expired");
+  });
+  FakeEventSource.opened[0].onerror();
+  await flush();
+  assert.equal(loggedOut.timers.length, 0);
+
+  const unmounted = open(async () => "fresh");
+  FakeEventSource.opened[0].onerror();
+  unmounted.close();
+  await flush();
+  assert.equal(unmounted.timers.length, 0);
+});
@@ -1,5 +1,5 @@
 import { useEffect, useState } from "react";
-import client from "../api/client";
+import client, { liveStream } from "../api/client";
 import { useAuth } from "../auth/AuthContext";
 
 export default function Attendance() {
@@ -50,6 +50,31 @@ export default function Attendance() {
       .catch(() => setError("Failed to load attendance."));
   }, [eventId, isLeader, user]);
 
+  // ---------------------------------------------------
+  // LIVE UPDATES FOR LEADERS (SERVER-SENT EVENTS)
+  // ---------------------------------------------------
+  useEffect(() => {
+    if (!eventId || !isLeader) return;
+
+    return liveStream(`events/${eventId}/attendance/stream/`, {
+      // One delta per check-in/out; replaces that user's row
+      attendance: (msg) => {
+        const delta = JSON.parse(msg.data);
+        setRows((prev) => {
+          const rest = prev.filter((r) => r.user?.id !== delta.user.id);
+          return delta.status ? [delta, ...rest] : rest;
+        });
+      },
+
+      // Missed too much while disconnected → reload the full list
+      reset: () => {
+        client
+          .get(`events/${eventId}/attendance/`)
+          .then((res) => setRows(Array.isArray(res.data) ? res.data : []));
+      },
+    });
+  }, [eventId, isLeader]);
+
   // ---------------------------------------------------
   // MEMBER CHECK-IN
   // ---------------------------------------------------
@@ -17,12 +17,32 @@ export default function ChooseChurch() {
   const { fullName, email, password } = state;
 
   const [churches, setChurches] = useState([]);
+  const [next, setNext] = useState(null);
   const [search, setSearch] = useState("");
   const [error, setError] = useState("");
 
+  // Server-side search (indexed + cached); small debounce while typing.
+  // No ?q= → the full directory; with it, pages of 20 ("Load more").
   useEffect(() => {
-    axios.get(`${BASE}/churches/`).then((res) => setChurches(res.data));
-  }, []);
+    const timer = setTimeout(() => {
+      const q = search.trim();
+      axios
+        .get(`${BASE}/churches/`, { params: q ? { q } : {} })
+        .then((res) => {
+          setChurches(res.data.results ?? res.data);
+          setNext(res.data.next ?? null);
+        });
+    }, 250);
+
+    return () => clearTimeout(timer);
+  }, [search]);
+
+  function loadMore() {
+    axios.get(next).then((res) => {
+      setChurches((prev) => [...prev, ...res.data.results]);
+      setNext(res.data.next);
+    });
+  }
 
   async function submitSignup(church_id) {
     try {
@@ -39,10 +59,6 @@ export default function ChooseChurch() {
     }
   }
 
-  const filtered = churches.filter((c) =>
-    c.name.toLowerCase().includes(search.toLowerCase())
-  );
-
   return (
     <div className="min-h-screen flex items-center justify-center bg-gray-100 px-6">
       <div className="bg-white shadow-md rounded-xl p-8 w-full max-w-md">
@@ -58,7 +74,7 @@ export default function ChooseChurch() {
         {error && <p className="text-red-500 mb-3">{error}</p>}
 
         <div className="space-y-3 max-h-64 overflow-y-auto">
-          {filtered.map((c) => (
+          {churches.map((c) => (
             <button
               key={c.id}
               onClick={() => submitSignup(c.id)}
@@ -68,6 +84,15 @@ export default function ChooseChurch() {
               <div className="text-gray-600 text-sm">{c.location}</div>
             </button>
           ))}
+
+          {next && (
+            <button
+              onClick={loadMore}
+              className="w-full border p-3 rounded-lg text-center text-gray-600 text-sm hover:bg-gray-100"
+            >
+              Load more
+            </button>
+          )}
         </div>
       </div>
     </div>
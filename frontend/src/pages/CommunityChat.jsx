@@ -1,48 +1,140 @@
+import { useEffect, useRef, useState } from "react";
+import client, { liveStream } from "../api/client";
+
 export default function CommunityChat() {
+  const [messages, setMessages] = useState([]);
+  const [nextBefore, setNextBefore] = useState(null);
+  const [body, setBody] = useState("");
+  const [error, setError] = useState("");
+  const bottomRef = useRef(null);
+
+  // keeps order by id and drops duplicates (a post echoes back over the stream)
+  const merge = (prev, incoming) => {
+    const byId = new Map(prev.map((m) => [m.id, m]));
+    incoming.forEach((m) => byId.set(m.id, m));
+    return [...byId.values()].sort((a, b) => a.id - b.id);
+  };
+
+  // ---------------------------------------------------
+  // RECENT HISTORY
+  // ---------------------------------------------------
+  useEffect(() => {
+    client
+      .get("chat/messages/")
+      .then((res) => {
+        setMessages((prev) => merge(prev, res.data.results));
+        setNextBefore(res.data.next_before);
+      })
+      .catch(() => setError("Failed to load messages."));
+  }, []);
+
+  // ---------------------------------------------------
+  // LIVE MESSAGES (SERVER-SENT EVENTS)
+  // ---------------------------------------------------
+  useEffect(() => {
+    return liveStream("chat/stream/", {
+      message: (msg) => {
+        const message = JSON.parse(msg.data);
+        setMessages((prev) => merge(prev, [message]));
+      },
+
+      // Missed too much while disconnected → reload the newest page
+      reset: () => {
+        client
+          .get("chat/messages/")
+          .then((res) => setMessages((prev) => merge(prev, res.data.results)));
+      },
+    });
+  }, []);
+
+  useEffect(() => {
+    bottomRef.current?.scrollIntoView({ behavior: "smooth" });
+  }, [messages.length]);
+
+  const loadOlder = () => {
+    client
+      .get("chat/messages/", { params: { before: nextBefore } })
+      .then((res) => {
+        setMessages((prev) => merge(prev, res.data.results));
+        setNextBefore(res.data.next_before);
+      })
+      .catch(() => setError("Failed to load messages."));
+  };
+
+  const send = (e) => {
+    e.preventDefault();
+    if (!body.trim()) return;
+
+    client
+      .post("chat/messages/", { body })
+      .then((res) => {
+        setMessages((prev) => merge(prev, [res.data]));
+        setBody("");
+      })
+      .catch(() => setError("Failed to send message."));
+  };
+
   return (
-    <div className="min-h-screen flex flex-col items-center justify-center 
+    <div className="min-h-screen flex flex-col items-center
       bg-[linear-gradient(180deg,#3b0764,#312e81)] text-white px-6 py-10">
 
-      {/* Icon */}
-      <div className="mb-6 w-20 h-20 bg-white/10 border border-white/20 
-        rounded-2xl backdrop-blur-xl shadow-xl flex items-center justify-center">
-        <svg 
-          xmlns="http://www.w3.org/2000/svg" 
-          fill="none" 
-          viewBox="0 0 24 24" 
-          strokeWidth="1.7" 
-          stroke="white"
-          className="w-10 h-10 opacity-90"
-        >
-          <path 
-            strokeLinecap="round"
-            strokeLinejoin="round"
-            d="M7 8h10M7 12h6M21 12c0 4.418-4.03 8-9 8a9.77 9.77 0 01-4-.83L3 20l1.37-3.66A7.82 7.82 0 013 12c0-4.418 4.03-8 9-8s9 3.582 9 8z"
-          />
-        </svg>
-      </div>
-
       {/* Title */}
       <h1 className="text-4xl font-extrabold mb-3 tracking-wide text-center">
         Community Chat
       </h1>
 
-      {/* Subtitle */}
-      <p className="text-purple-200 text-lg text-center max-w-md">
+      <p className="text-purple-200 text-lg text-center max-w-md mb-6">
         A space for your church members to connect, share, and encourage one another.
       </p>
 
-      {/* Coming Soon Card */}
-      <div className="mt-8 bg-white/10 border border-white/20 
-        backdrop-blur-xl rounded-2xl shadow-xl px-8 py-6 text-center max-w-lg">
+      {error && <p className="text-red-300 mb-4">{error}</p>}
+
+      {/* Messages */}
+      <div className="w-full max-w-2xl flex-1 bg-white/10 border border-white/20
+        backdrop-blur-xl rounded-2xl shadow-xl p-6 overflow-y-auto max-h-[60vh]">
 
-        <p className="text-purple-200 text-lg font-medium mb-1">
-          Coming Soon
-        </p>
-        <p className="text-purple-300">
-          We’re building a real-time chat experience for your community.
-        </p>
+        {nextBefore && (
+          <button
+            onClick={loadOlder}
+            className="block mx-auto mb-4 text-sm text-purple-200 hover:text-white"
+          >
+            Load older messages
+          </button>
+        )}
+
+        {messages.map((m) => (
+          <div key={m.id} className="mb-3">
+            <p className="text-sm text-purple-300">
+              {m.user?.full_name || "Member"} ·{" "}
+              {new Date(m.created_at).toLocaleTimeString()}
+            </p>
+            <p className="whitespace-pre-wrap">{m.body}</p>
+          </div>
+        ))}
+
+        {messages.length === 0 && (
+          <p className="text-purple-300 text-center">No messages yet. Say hello!</p>
+        )}
+        <div ref={bottomRef} />
       </div>
+
+      {/* Composer */}
+      <form onSubmit={send} className="w-full max-w-2xl mt-4 flex gap-3">
+        <input
+          value={body}
+          onChange={(e) => setBody(e.target.value)}
+          maxLength={2000}
+          placeholder="Write a message…"
+          className="flex-1 rounded-xl px-4 py-3 bg-white/10 border border-white/20
+            placeholder-purple-300 focus:outline-none"
+        />
+        <button
+          type="submit"
+          className="rounded-xl px-6 py-3 bg-purple-600 hover:bg-purple-500 font-semibold"
+        >
+          Send
+        </button>
+      </form>
     </div>
   );
 }
@@ -23,15 +23,13 @@ export default function Dashboard() {
 
     async function loadCounts() {
       try {
-        const [aRes, eRes] = await Promise.all([
-          client.get("announcements/"),
-          client.get("events/"),
-        ]);
+        // One round trip: counts + latest items + role/church
+        const res = await client.get("dashboard/");
 
         if (active) {
           setCounts({
-            announcements: aRes.data.length,
-            events: eRes.data.length,
+            announcements: res.data.counts.announcements,
+            events: res.data.counts.events,
           });
         }
       } finally {